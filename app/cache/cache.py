@@ -0,0 +1,145 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Optional
+
+from app.cache.backends import CacheBackend, MemoryBackend, RedisBackend
+from app.compression import ENCODINGS
+from app.settings.config import get_settings
+from app.settings.database import reading_replica
+
+CACHE_BACKEND = get_settings().cache.backend
+CACHE_URL = get_settings().cache.url
+CACHE_TTL = get_settings().cache.ttl
+CACHE_MAX_ENTRIES = get_settings().cache.max_entries
+# How long replicas may lag behind a write, as assumed by read-your-writes.
+READ_YOUR_WRITES_SECONDS = get_settings().database.read_your_writes_seconds
+
+
+def post_key(post_id: int) -> str:
+    return f"post:id:{post_id}"
+
+
+def post_slug_key(slug: str) -> str:
+    return f"post:slug:{slug}"
+
+
+def category_key(category_id: int) -> str:
+    return f"category:id:{category_id}"
+
+
+CATEGORY_LIST_KEY = "category:all"
+CATEGORY_ACTIVE_LIST_KEY = "category:active"
+
+
+def variant_key(key: str, encoding: str) -> str:
+    return f"{key}|{encoding}"
+
+
+def settling_key(key: str) -> str:
+    return f"{key}|settling"
+
+
+class ReadThroughCache:
+    """Serve JSON-serialisable values from a backend, loading them on a miss.
+
+    Concurrent misses on the same key share a single loader call, so a
+    burst of requests for a cold entry costs one database query. For
+    ``settle_seconds`` after a key is invalidated, values loaded from a
+    replica are returned but not stored, since the replica may not have
+    replayed the write yet.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float = CACHE_TTL, settle_seconds: float = READ_YOUR_WRITES_SECONDS):
+        self.backend = backend
+        self.ttl = ttl
+        self.settle_seconds = settle_seconds
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._epoch = 0
+
+    async def peek(self, key: str) -> Any:
+        """Return the cached value for ``key`` without loading it on a miss."""
+        cached = await self.backend.get(key)
+        return None if cached is None else json.loads(cached)
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for ``key`` or store what ``loader`` returns.
+
+        ``None`` results are returned but never cached.
+        """
+        return await self._get_or_load(key, loader, lambda value: json.dumps(value).encode(), json.loads, self.ttl)
+
+    async def get_or_load_bytes(
+        self, key: str, loader: Callable[[], Awaitable[Optional[bytes]]], ttl: Optional[float] = None
+    ) -> Optional[bytes]:
+        """``get_or_load`` for values that already are bytes, such as pre-rendered documents."""
+        return await self._get_or_load(key, loader, bytes, bytes, self.ttl if ttl is None else ttl)
+
+    async def _get_or_load(self, key: str, loader, encode, decode, ttl: float) -> Any:
+        cached = await self.backend.get(key)
+        if cached is not None:
+            return decode(cached)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        epoch = self._epoch
+        try:
+            value = await loader()
+            if value is not None and epoch == self._epoch and not await self._settling(key):
+                await self.backend.set(key, encode(value), ttl)
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def _settling(self, key: str) -> bool:
+        """Whether ``key`` was invalidated too recently to store what the current replica read returned."""
+        return reading_replica.get() and await self.backend.get(settling_key(key)) is not None
+
+    async def get_variant(self, key: str, encoding: str, etag: str) -> Optional[bytes]:
+        """Return the ``encoding`` body stored next to ``key`` if it matches ``etag``."""
+        stored = await self.backend.get(variant_key(key, encoding))
+        if stored is None:
+            return None
+        stored_etag, _, body = stored.partition(b"\n")
+        return body if stored_etag == etag.encode() else None
+
+    async def set_variant(self, key: str, encoding: str, etag: str, body: bytes):
+        """Store a pre-encoded body of ``key``, tagged with the ETag it was built from."""
+        await self.backend.set(variant_key(key, encoding), etag.encode() + b"\n" + body, self.ttl)
+
+    async def invalidate(self, *keys: str):
+        """Drop ``keys`` and their variants, and keep loads already in flight from storing stale data."""
+        self._epoch += 1
+        for key in keys:
+            self._inflight.pop(key, None)
+        variants = [variant_key(key, encoding) for key in keys for encoding in ENCODINGS]
+        await self.backend.delete(*keys, *variants)
+        for key in keys:
+            await self.backend.set(settling_key(key), b"1", self.settle_seconds)
+
+
+def build_cache(ttl: float = CACHE_TTL) -> ReadThroughCache:
+    if CACHE_BACKEND == "redis":
+        return ReadThroughCache(RedisBackend.from_url(CACHE_URL), ttl)
+    return ReadThroughCache(MemoryBackend(max_entries=CACHE_MAX_ENTRIES), ttl)
+
+
+_cache: Optional[ReadThroughCache] = None
+
+
+def get_cache() -> ReadThroughCache:
+    """Return the process-wide cache, building it on first use."""
+    global _cache
+    if _cache is None:
+        _cache = build_cache()
+    return _cache
@@ -0,0 +1,196 @@
+"""Negotiated gzip / brotli compression of responses.
+
+``CompressionMiddleware`` compresses compressible responses above
+``COMPRESSION_MIN_SIZE`` on the fly, including streamed ones. Responses
+that already carry a ``Content-Encoding`` (such as pre-compressed cache
+entries) are passed through untouched. Brotli is used when the optional
+``brotli`` package is installed and the client prefers it.
+
+Each encoding is a distinct representation, so a compressed body gets its
+own strong ETag, the identity one suffixed with the encoding, and every
+response that could have been encoded differently, 304s included, carries
+``Vary: Accept-Encoding``.
+"""
+import zlib
+from http import HTTPStatus
+from functools import lru_cache
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.settings.config import get_settings
+
+COMPRESSION_MIN_SIZE = get_settings().responses.compression_min_size
+COMPRESSION_GZIP_LEVEL = get_settings().responses.compression_gzip_level
+COMPRESSION_BROTLI_QUALITY = get_settings().responses.compression_brotli_quality
+
+# Every encoding a cache variant may be stored under, supported here or not.
+ENCODINGS = ("br", "gzip")
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/xml",
+    "application/rss+xml",
+    "application/atom+xml",
+)
+
+
+@lru_cache
+def brotli_module():
+    """The optional ``brotli`` package, imported on first use, or ``None`` when not installed."""
+    try:
+        import brotli
+    except ImportError:  # pragma: no cover - depends on the environment
+        return None
+    return brotli
+
+
+def supported_encodings() -> tuple:
+    return ENCODINGS if brotli_module() is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding the client accepts, brotli first."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+
+    for encoding in supported_encodings():
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compressor(encoding: str):
+    if encoding == "br":
+        return brotli_module().Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+    return zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli_module().compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    stream = compressor(encoding)
+    return stream.compress(body) + stream.flush()
+
+
+def is_compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "")
+    return "content-encoding" not in headers and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of the ``encoding`` representation of the body tagged ``etag``."""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def add_vary(headers: MutableHeaders):
+    vary = headers.get("vary")
+    if vary is None:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate(request_headers.get("accept-encoding", ""))
+        if_none_match = request_headers.get("if-none-match", "")
+        await _CompressionResponder(self.app, encoding, if_none_match, self.minimum_size)(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app, encoding: Optional[str], if_none_match: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.if_none_match = [tag.strip() for tag in if_none_match.split(",")]
+        self.minimum_size = minimum_size
+        self.start_message = None
+        self.compress = None
+        self.passthrough = False
+        self.send = None
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message):
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            if message["status"] == HTTPStatus.NOT_MODIFIED:
+                self.passthrough = True
+                self.tag_not_modified(MutableHeaders(raw=message["headers"]))
+                await self.send(message)
+                return
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compress is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            small = not more_body and len(body) < self.minimum_size
+            if small or not is_compressible(headers) or self.encoding is None:
+                if not small and is_compressible(headers):
+                    add_vary(headers)
+                self.passthrough = True
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+
+            headers["Content-Encoding"] = self.encoding
+            if "etag" in headers:
+                headers["ETag"] = encoded_etag(headers["etag"], self.encoding)
+            add_vary(headers)
+            if not more_body:
+                compressed = compress(body, self.encoding)
+                headers["Content-Length"] = str(len(compressed))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+
+            del headers["Content-Length"]
+            self.compress = compressor(self.encoding)
+            await self.send(self.start_message)
+
+        if self.encoding == "br":
+            chunk = self.compress.process(body) + (self.compress.flush() if more_body else self.compress.finish())
+        else:
+            chunk = self.compress.compress(body) + self.compress.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def tag_not_modified(self, headers: MutableHeaders):
+        """Vary a 304 on Accept-Encoding and give it the ETag of the representation the client holds."""
+        add_vary(headers)
+        etag = headers.get("etag")
+        if etag is not None and self.encoding is not None:
+            encoded = encoded_etag(etag, self.encoding)
+            if encoded in self.if_none_match or f"W/{encoded}" in self.if_none_match:
+                headers["ETag"] = encoded
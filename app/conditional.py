@@ -0,0 +1,84 @@
+"""HTTP validators (ETag / Last-Modified) and conditional GET handling."""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from http import HTTPStatus
+from typing import Iterable, Optional, Union
+
+from fastapi import Request, Response
+
+from app.compression import ENCODINGS
+
+
+def entity_etag(kind: str, entity_id, version: int) -> str:
+    """Strong ETag of a single versioned row."""
+    return f'"{kind}-{entity_id}-v{version}"'
+
+
+def collection_etag(kind: str, parts: Iterable) -> str:
+    """Strong ETag of a collection, derived from its members' identities and versions."""
+    digest = hashlib.sha1(repr(list(parts)).encode()).hexdigest()[:20]
+    return f'"{kind}-{digest}"'
+
+
+def as_datetime(value: Union[datetime, str, None]) -> Optional[datetime]:
+    """Accept a datetime or its ISO form (as found in cached payloads)."""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def identity_etag(tag: str) -> str:
+    """Strip the weak prefix and any encoding suffix, leaving the ETag of the identity body."""
+    tag = tag.removeprefix("W/")
+    for encoding in ENCODINGS:
+        if tag.endswith(f'-{encoding}"'):
+            return tag[:-len(encoding) - 2] + '"'
+    return tag
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Evaluate If-None-Match, or If-Modified-Since when no ETag was sent (RFC 9110).
+
+    If-None-Match uses the weak comparison and accepts the ETag of any
+    encoded representation of the body tagged ``etag``.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in {identity_etag(tag) for tag in candidates}
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime] = None):
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    response = Response(status_code=HTTPStatus.NOT_MODIFIED)
+    set_validators(response, etag, last_modified)
+    return response
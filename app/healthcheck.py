@@ -1,11 +1,105 @@
+import asyncio
+import time
 from http import HTTPStatus
+from typing import Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+
+from app.instrumentation import LatencyWindow, query_latency
+from app.settings.config import get_settings
+from app.settings.database import DatabaseManager, database_manager
+
+READINESS_TIMEOUT = get_settings().server.readiness_timeout
+READINESS_CACHE_SECONDS = get_settings().server.readiness_cache_seconds
+READINESS_MAX_POOL_SATURATION = get_settings().server.readiness_max_pool_saturation
 
 healthcheck_router = APIRouter()
 
 
+class ReadinessProbe:
+    """Check that the database answers through the shared pool.
+
+    Results are reused for ``cache_seconds`` and concurrent probes share a
+    single check, so a storm of probes costs at most one query per interval.
+    """
+
+    def __init__(
+        self,
+        manager: DatabaseManager,
+        latency: LatencyWindow = query_latency,
+        timeout: float = READINESS_TIMEOUT,
+        cache_seconds: float = READINESS_CACHE_SECONDS,
+        max_saturation: float = READINESS_MAX_POOL_SATURATION,
+        clock=time.monotonic,
+    ):
+        self.manager = manager
+        self.latency = latency
+        self.timeout = timeout
+        self.cache_seconds = cache_seconds
+        self.max_saturation = max_saturation
+        self.clock = clock
+        self._result: Optional[dict] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return self._result is not None and self.clock() - self._checked_at < self.cache_seconds
+
+    async def check(self) -> dict:
+        if self._fresh():
+            return self._result
+        async with self._lock:
+            if not self._fresh():
+                self._result = await self._run()
+                self._checked_at = self.clock()
+        return self._result
+
+    async def _run(self) -> dict:
+        database = {"ok": True}
+        try:
+            database["latency_ms"] = round(await self.manager.ping(self.timeout) * 1000, 2)
+        except asyncio.TimeoutError:
+            database = {"ok": False, "error": f"no answer within {self.timeout}s"}
+        except Exception as e:
+            database = {"ok": False, "error": str(e)}
+
+        saturation = self.manager.pool_saturation()
+        p99 = self.latency.percentile(0.99)
+        ready = database["ok"] and saturation < self.max_saturation
+        return {
+            "status": HTTPStatus.OK if ready else HTTPStatus.SERVICE_UNAVAILABLE,
+            "database": database,
+            "pool": {"saturation": round(saturation, 3), "max_saturation": self.max_saturation},
+            "db_latency_p99_ms": None if p99 is None else round(p99 * 1000, 2),
+        }
+
+
+_probe: Optional[ReadinessProbe] = None
+
+
+def get_readiness_probe() -> ReadinessProbe:
+    """Return the process-wide readiness probe, building it on first use."""
+    global _probe
+    if _probe is None:
+        _probe = ReadinessProbe(database_manager)
+    return _probe
+
+
 @healthcheck_router.get(path="", name="Health check endpoint")
 def healthcheck():
     """Check the API status."""
     return {"status": HTTPStatus.OK}
+
+
+@healthcheck_router.get(path="/live", name="Liveness endpoint")
+def liveness():
+    """Check the process answers, without touching any dependency."""
+    return {"status": HTTPStatus.OK}
+
+
+@healthcheck_router.get(path="/ready", name="Readiness endpoint")
+async def readiness(probe: ReadinessProbe = Depends(get_readiness_probe)):
+    """Check the API can serve traffic: the database answers and the pool has room."""
+    result = await probe.check()
+    return JSONResponse(result, status_code=result["status"])
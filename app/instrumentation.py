@@ -0,0 +1,315 @@
+"""Per-request database and timing instrumentation.
+
+``InstrumentationMiddleware`` opens a ``RequestStats`` for every HTTP
+request. SQLAlchemy cursor events, the timed connection pools and
+``InstrumentedRoute`` add to it while the request runs. When the response
+starts, the stats are sent to the client as a ``Server-Timing`` header and
+recorded in ``request_metrics``, which renders Prometheus text format.
+
+Streamed responses report what happened before their first byte.
+"""
+import functools
+import inspect
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+from app.settings.config import get_settings
+
+DATABASE_LOG_SAMPLE_RATE = get_settings().database.log_sample_rate
+DATABASE_LATENCY_WINDOW = get_settings().database.latency_window
+REQUEST_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "unmatched"
+
+statement_logger = logging.getLogger("app.sql")
+
+
+class RequestStats:
+    """Costs accumulated while serving one request."""
+
+    __slots__ = ("started", "queries", "db_time", "pool_wait", "serialization", "endpoint_returned")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+        self.serialization = 0.0
+        self.endpoint_returned = None
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        return ", ".join([
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"',
+            f"pool;dur={self.pool_wait * 1000:.2f}",
+            f"serialize;dur={self.serialization * 1000:.2f}",
+            f"total;dur={self.elapsed() * 1000:.2f}",
+        ])
+
+
+class LatencyWindow:
+    """The most recent durations, for percentile estimates."""
+
+    def __init__(self, size: int = DATABASE_LATENCY_WINDOW, clock=time.monotonic):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self.clock = clock
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append((self.clock(), seconds))
+
+    def percentile(self, fraction: float, max_age: Optional[float] = None) -> Optional[float]:
+        """Return the ``fraction`` percentile of the window, or ``None`` when empty.
+
+        With ``max_age``, only samples recorded in the last ``max_age`` seconds count.
+        """
+        since = None if max_age is None else self.clock() - max_age
+        with self._lock:
+            samples = sorted(seconds for at, seconds in self._samples if since is None or at >= since)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+
+query_latency = LatencyWindow()
+pool_wait = LatencyWindow()
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current_stats.get()
+
+
+def record_pool_wait(seconds: float):
+    pool_wait.record(seconds)
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.pool_wait += seconds
+
+
+@contextmanager
+def measure_serialization():
+    """Count the enclosed block as serialisation time of the current request."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.serialization += time.perf_counter() - started
+
+
+def instrument_engine(engine, log_sample_rate: float = DATABASE_LOG_SAMPLE_RATE):
+    """Time every statement run by ``engine`` and log a sample of them."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+        if log_sample_rate and random.random() < log_sample_rate:
+            statement_logger.info("%s %r", statement, parameters)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_started"].pop()
+        query_latency.record(duration)
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time += duration
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        started = context.connection.info.get("query_started") if context.connection else None
+        if started:
+            started.pop()
+
+
+def _mark_return(stats: Optional[RequestStats]):
+    if stats is not None:
+        stats.endpoint_returned = time.perf_counter()
+
+
+def _timed_endpoint(endpoint):
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def timed(*args, **kwargs):
+            result = await endpoint(*args, **kwargs)
+            _mark_return(_current_stats.get())
+            return result
+        return timed
+
+    if inspect.isfunction(endpoint) and not inspect.isgeneratorfunction(endpoint) \
+            and not inspect.isasyncgenfunction(endpoint):
+        @functools.wraps(endpoint)
+        def timed(*args, **kwargs):
+            result = endpoint(*args, **kwargs)
+            _mark_return(_current_stats.get())
+            return result
+        return timed
+
+    return endpoint
+
+
+class InstrumentedRoute(APIRoute):
+    """Route that counts the work done after its endpoint returns as serialisation.
+
+    That covers ``response_model`` validation and rendering the body.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            response = await handler(request)
+            stats = _current_stats.get()
+            if stats is not None and stats.endpoint_returned is not None:
+                stats.serialization += time.perf_counter() - stats.endpoint_returned
+                stats.endpoint_returned = None
+            return response
+
+        return timed_handler
+
+
+class RequestMetrics:
+    """Prometheus counters and a duration histogram per method, route and status."""
+
+    def __init__(self, buckets: tuple = REQUEST_DURATION_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, method: str, route: str, status: int, stats: RequestStats, duration: float):
+        labels = (method, route, str(status))
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = {
+                    "requests": 0, "duration": 0.0, "queries": 0, "db_time": 0.0,
+                    "pool_wait": 0.0, "serialization": 0.0, "buckets": [0] * len(self.buckets),
+                }
+            series["requests"] += 1
+            series["duration"] += duration
+            series["queries"] += stats.queries
+            series["db_time"] += stats.db_time
+            series["pool_wait"] += stats.pool_wait
+            series["serialization"] += stats.serialization
+            for index, bound in enumerate(self.buckets):
+                if duration <= bound:
+                    series["buckets"][index] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {labels: {**series, "buckets": list(series["buckets"])} for labels, series in self._series.items()}
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> str:
+        """Return every series in the Prometheus text exposition format."""
+        series = self.snapshot()
+        counters = [
+            ("weblog_http_requests_total", "Requests served.", "requests"),
+            ("weblog_db_queries_total", "SQL statements executed while serving requests.", "queries"),
+            ("weblog_db_time_seconds_total", "Time spent executing SQL statements.", "db_time"),
+            ("weblog_db_pool_wait_seconds_total", "Time spent waiting for a pooled connection.", "pool_wait"),
+            ("weblog_serialization_seconds_total", "Time spent serialising response bodies.", "serialization"),
+        ]
+        lines = []
+        for name, help_text, field in counters:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for labels, values in series.items():
+                lines.append(f"{name}{{{_labels(labels)}}} {values[field]}")
+
+        name = "weblog_http_request_duration_seconds"
+        lines += [f"# HELP {name} Request duration.", f"# TYPE {name} histogram"]
+        for labels, values in series.items():
+            base = _labels(labels)
+            for bound, count in zip(self.buckets, values["buckets"]):
+                lines.append(f'{name}_bucket{{{base},le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{{base},le="+Inf"}} {values["requests"]}')
+            lines.append(f"{name}_sum{{{base}}} {values['duration']}")
+            lines.append(f"{name}_count{{{base}}} {values['requests']}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: tuple) -> str:
+    method, route, status = labels
+    return f'method="{_escape(method)}",route="{_escape(route)}",status="{status}"'
+
+
+request_metrics = RequestMetrics()
+
+
+def route_template(scope) -> str:
+    """Return the path template of the route that served ``scope``.
+
+    Depending on the FastAPI version, routes included with a prefix report
+    either their full template or only their own part; in the latter case
+    the prefix is taken back from the request path.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return UNMATCHED_ROUTE
+    path, root_path = scope["path"], scope.get("root_path", "")
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    regex = getattr(route, "path_regex", None)
+    if regex is None or regex.match(path):
+        return template
+    for index in range(1, len(path)):
+        if path[index] == "/" and regex.match(path[index:]):
+            return path[:index] + template
+    return template
+
+
+class InstrumentationMiddleware:
+    def __init__(self, app, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(raw=message["headers"]).append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            self.metrics.observe(scope["method"], route_template(scope), status, stats, stats.elapsed())
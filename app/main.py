@@ -1,12 +1,45 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from .cache.cache import get_cache
+from .compression import COMPRESSION_MIN_SIZE, CompressionMiddleware
 from .healthcheck import healthcheck_router
-from .posts.routers import post_router, categories_router
+from .instrumentation import InstrumentationMiddleware
+from .metrics import metrics_router
+from .posts.routers import (categories_router, feed_router, post_router,
+                            syndication_router)
+from .ratelimit import AdmissionMiddleware, RateLimitMiddleware
+from .settings.database import database_manager, get_database_manager
 from .users.routers import user_router
+from .warmup import WARMUP_ENABLED, warm_up
+
+
+def resolve(app: FastAPI, dependency):
+    """Call ``dependency`` as a request would, honouring ``app.dependency_overrides``."""
+    return app.dependency_overrides.get(dependency, dependency)()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the shared database engines and warm them up on startup, and release them on shutdown."""
+    await database_manager.startup()
+    if WARMUP_ENABLED:
+        await warm_up(resolve(app, get_database_manager), resolve(app, get_cache))
+    yield
+    await database_manager.dispose()
+
 
-app = FastAPI(title="Weblog - Back-end")
+app = FastAPI(title="Weblog - Back-end", lifespan=lifespan)
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(InstrumentationMiddleware)
 
 app.include_router(router=healthcheck_router,prefix="/healthcheck", include_in_schema=False)
+app.include_router(router=metrics_router, prefix="/metrics", include_in_schema=False)
 app.include_router(router=user_router, prefix="/users", include_in_schema=True)
 app.include_router(router=post_router, prefix="/posts", include_in_schema=True)
-app.include_router(router=categories_router, prefix="/categories", include_in_schema=True)
\ No newline at end of file
+app.include_router(router=categories_router, prefix="/categories", include_in_schema=True)
+app.include_router(router=feed_router, prefix="/feed", include_in_schema=True)
+app.include_router(router=syndication_router, include_in_schema=True)
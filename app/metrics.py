@@ -0,0 +1,64 @@
+import secrets
+from http import HTTPStatus
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.instrumentation import request_metrics
+from app.settings.config import get_settings
+from app.settings.database import database_manager
+
+METRICS_TOKEN = get_settings().server.metrics_token
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# ``pool_status`` field, metric name and type; counters carry the ``_total`` suffix.
+POOL_METRICS = (
+    ("checkouts", "weblog_db_pool_checkouts_total", "counter"),
+    ("connects", "weblog_db_pool_connects_total", "counter"),
+    ("timeouts", "weblog_db_pool_timeouts_total", "counter"),
+    ("wait_total_seconds", "weblog_db_pool_checkout_wait_seconds_total", "counter"),
+    ("size", "weblog_db_pool_size", "gauge"),
+    ("checked_out", "weblog_db_pool_checked_out", "gauge"),
+    ("overflow", "weblog_db_pool_overflow", "gauge"),
+)
+
+
+def require_metrics_token(
+    credentials: Annotated[Optional[HTTPAuthorizationCredentials], Depends(HTTPBearer(auto_error=False))],
+):
+    """Let through scrapers presenting ``METRICS_TOKEN``; without one configured, the endpoint does not exist."""
+    if METRICS_TOKEN is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail="Not Found"
+        )
+    if credentials is None or not secrets.compare_digest(credentials.credentials.encode(), METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+metrics_router = APIRouter(dependencies=[Depends(require_metrics_token)])
+
+
+def render_pool_metrics(status: dict) -> str:
+    """Render ``DatabaseManager.pool_status`` as Prometheus gauges and counters."""
+    lines = []
+    for field, name, kind in POOL_METRICS:
+        lines.append(f"# TYPE {name} {kind}")
+        for engine, values in status.items():
+            if field in values:
+                lines.append(f'{name}{{engine="{engine}"}} {values[field]}')
+    return "\n".join(lines) + "\n"
+
+
+@metrics_router.get(path="", name="Prometheus metrics")
+def metrics():
+    """Expose request and connection pool metrics to Prometheus."""
+    body = request_metrics.render() + render_pool_metrics(database_manager.pool_status())
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
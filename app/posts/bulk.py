@@ -0,0 +1,143 @@
+from collections import Counter
+from typing import AsyncIterator, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.posts.models import (PUBLISHED, Category, Post,
+                              post_category_association)
+from app.posts.schemas import CreatePostSchema
+from app.posts.feed import rebuild_feed_entries
+from app.posts.services import adjust_post_counts
+from app.settings.config import get_settings
+
+POSTS_BULK_CHUNK_SIZE = get_settings().pagination.bulk_chunk_size
+POSTS_BULK_MAX_CHUNK_SIZE = get_settings().pagination.bulk_max_chunk_size
+
+
+async def read_ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """Split a streamed body into ``(line_number, line)`` pairs, skipping blank lines."""
+    buffer = b""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+class BulkImport:
+    """Insert posts from NDJSON lines in chunks, one transaction per chunk."""
+
+    def __init__(self, session: AsyncSession, author_id: int, chunk_size: int = POSTS_BULK_CHUNK_SIZE):
+        self.session = session
+        self.author_id = author_id
+        self.chunk_size = chunk_size
+        self.inserted: List[Post] = []
+        self.errors: List[dict] = []
+
+    def error(self, line_number: int, message: str):
+        self.errors.append({"line": line_number, "error": message})
+
+    async def run(self, lines: AsyncIterator[Tuple[int, bytes]]) -> dict:
+        batch = []
+        async for line_number, line in lines:
+            try:
+                post = CreatePostSchema.model_validate_json(line)
+            except ValidationError as e:
+                self.error(line_number, "; ".join(
+                    f"{'.'.join(str(part) for part in error['loc']) or 'line'}: {error['msg']}"
+                    for error in e.errors()
+                ))
+                continue
+
+            if not all(isinstance(category, int) and not isinstance(category, bool) for category in post.categories):
+                self.error(line_number, "categories: must be a list of category ids")
+                continue
+
+            batch.append((line_number, post))
+            if len(batch) >= self.chunk_size:
+                await self.import_chunk(batch)
+                batch = []
+
+        if batch:
+            await self.import_chunk(batch)
+
+        return {"inserted": len(self.inserted), "failed": len(self.errors), "errors": self.errors}
+
+    async def import_chunk(self, batch: List[Tuple[int, CreatePostSchema]]):
+        slugs = [post.slug for _, post in batch]
+        category_ids = {category for _, post in batch for category in post.categories}
+
+        known_categories = set()
+        if category_ids:
+            get_categories = await self.session.execute(
+                select(Category.id).where(Category.id.in_(category_ids))
+            )
+            known_categories = set(get_categories.scalars())
+
+        get_slugs = await self.session.execute(select(Post.slug).where(Post.slug.in_(slugs)))
+        taken_slugs = set(get_slugs.scalars())
+
+        rows = []
+        for line_number, post in batch:
+            unknown = sorted(set(post.categories) - known_categories)
+            if post.slug in taken_slugs:
+                self.error(line_number, f"slug: '{post.slug}' already exists")
+            elif unknown:
+                self.error(line_number, f"categories: unknown ids {unknown}")
+            else:
+                taken_slugs.add(post.slug)
+                rows.append((line_number, post))
+
+        if not rows:
+            return
+
+        try:
+            await self.session.execute(insert(Post), [
+                {
+                    "title": post.title,
+                    "summary": post.summary,
+                    "content": post.content,
+                    "slug": post.slug,
+                    "author_id": self.author_id,
+                    "status": post.status,
+                }
+                for _, post in rows
+            ])
+            get_ids = await self.session.execute(
+                select(Post.slug, Post.id).where(Post.slug.in_([post.slug for _, post in rows]))
+            )
+            ids = dict(get_ids.all())
+
+            links = [
+                {"post_id": ids[post.slug], "category_id": category}
+                for _, post in rows
+                for category in dict.fromkeys(post.categories)
+            ]
+            if links:
+                await self.session.execute(insert(post_category_association), links)
+                published = {ids[post.slug] for _, post in rows if post.status == PUBLISHED}
+                await adjust_post_counts(self.session, Counter(
+                    link["category_id"] for link in links if link["post_id"] in published
+                ))
+            await rebuild_feed_entries(self.session, ids.values())
+            await self.session.commit()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            for line_number, _ in rows:
+                self.error(line_number, f"database: {e.__class__.__name__}")
+        else:
+            self.inserted.extend(
+                Post(
+                    id=ids[post.slug], title=post.title, summary=post.summary, content=post.content,
+                    slug=post.slug, status=post.status,
+                )
+                for _, post in rows
+            )
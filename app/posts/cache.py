@@ -0,0 +1,160 @@
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.cache import (CATEGORY_ACTIVE_LIST_KEY, CATEGORY_LIST_KEY,
+                             ReadThroughCache,
+                             category_key, post_key, post_slug_key)
+from app.compression import (COMPRESSION_MIN_SIZE, add_vary, compress,
+                             encoded_etag, negotiate)
+from app.conditional import (as_datetime, collection_etag, entity_etag,
+                             is_conditional, is_not_modified,
+                             not_modified_response, set_validators)
+from app.instrumentation import measure_serialization
+from app.posts.loading import category_options
+from app.posts.models import Category, Post, post_category_association
+from app.posts.schemas import (CategoryCountSchema, CategorySchema,
+                               PostSchema)
+from app.responses import dump_json
+
+
+def dump_post(post: Post) -> dict:
+    """Serialise a post loaded with ``post_detail_options`` for the cache."""
+    return PostSchema.model_validate(post, from_attributes=True).model_dump(mode="json")
+
+
+def dump_category(category) -> dict:
+    return CategorySchema.model_validate(category, from_attributes=True).model_dump(mode="json")
+
+
+def dump_category_count(category) -> dict:
+    return CategoryCountSchema.model_validate(category, from_attributes=True).model_dump(mode="json")
+
+
+async def load_category_list(session: AsyncSession, active_only: bool = False) -> list:
+    """Serialise every category, or only the active ones, with its post count for the cache."""
+    query = select(Category).options(*category_options())
+    if active_only:
+        query = query.where(Category.is_active.is_(True))
+    get_categories = await session.execute(query)
+    return [dump_category_count(category) for category in get_categories.scalars()]
+
+
+def category_list_key(active_only: bool = False) -> str:
+    return CATEGORY_ACTIVE_LIST_KEY if active_only else CATEGORY_LIST_KEY
+
+
+def post_cache_keys(post_id: int, *slugs: str) -> list:
+    return [post_key(post_id), *(post_slug_key(slug) for slug in slugs)]
+
+
+async def invalidate_post(cache: ReadThroughCache, post_id: int, *slugs: str):
+    """Drop the cached entries of one post, under its id and every given slug."""
+    await cache.invalidate(*post_cache_keys(post_id, *slugs))
+
+
+async def category_post_keys(session: AsyncSession, category_id: int) -> list:
+    """Return the cache keys of every post embedding ``category_id``."""
+    get_posts = await session.execute(
+        select(Post.id, Post.slug)
+        .join(post_category_association, post_category_association.c.post_id == Post.id)
+        .where(post_category_association.c.category_id == category_id)
+    )
+    keys = []
+    for post_id, slug in get_posts:
+        keys.extend(post_cache_keys(post_id, slug))
+    return keys
+
+
+async def invalidate_category(cache: ReadThroughCache, category_id: int, post_keys: list = ()):
+    """Drop a category, the category listings and the posts that embed it."""
+    await cache.invalidate(category_key(category_id), CATEGORY_LIST_KEY, CATEGORY_ACTIVE_LIST_KEY, *post_keys)
+
+
+async def invalidate_category_lists(cache: ReadThroughCache):
+    """Drop the category listings, whose post counts follow every post write."""
+    await cache.invalidate(CATEGORY_LIST_KEY, CATEGORY_ACTIVE_LIST_KEY)
+
+
+async def read_entity(
+    request: Request,
+    response: Response,
+    cache: ReadThroughCache,
+    key: str,
+    kind: str,
+    load: Callable[[], Awaitable[Any]],
+    load_version: Callable[[], Awaitable[Any]],
+):
+    """Read a versioned entity through the cache, honouring conditional headers.
+
+    On a cache miss a conditional request is first answered from
+    ``load_version``, which only selects ``id``, ``version`` and
+    ``updated_at``, so a 304 never loads relationships. Returns the payload, a 304 response, or
+    ``None`` when the entity does not exist.
+    """
+    payload = await cache.peek(key)
+
+    if payload is None and is_conditional(request):
+        row = await load_version()
+        if row is not None:
+            etag = entity_etag(kind, row.id, row.version)
+            if is_not_modified(request, etag, row.updated_at):
+                return not_modified_response(etag, row.updated_at)
+
+    if payload is None:
+        payload = await cache.get_or_load(key, load)
+        if payload is None:
+            return None
+
+    etag = entity_etag(kind, payload["id"], payload["version"])
+    last_modified = as_datetime(payload["updated_at"])
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+
+    set_validators(response, etag, last_modified)
+    return payload
+
+
+def collection_validators(kind: str, items: list, *extra) -> tuple:
+    """ETag and Last-Modified of a list of versioned entities (dicts or rows)."""
+    def field(item, name):
+        return item[name] if isinstance(item, dict) else getattr(item, name)
+
+    etag = collection_etag(kind, [*((field(item, "id"), field(item, "version")) for item in items), *extra])
+    last_modified = max((as_datetime(field(item, "updated_at")) for item in items), default=None)
+    return etag, last_modified
+
+
+async def precompressed_response(
+    request: Request, response: Response, cache: ReadThroughCache, key: str, payload: dict
+) -> Optional[Response]:
+    """Serve a cached payload as a compressed body built once per version.
+
+    The compressed variant is stored next to the cache entry, tagged with
+    the ETag it was built from, so hot entries are compressed once per
+    update. A body below ``COMPRESSION_MIN_SIZE`` is stored as an empty
+    variant, so it is not serialised again just to be measured. Returns
+    ``None`` when the client accepts no supported encoding or the body is
+    too small.
+    """
+    encoding = negotiate(request.headers.get("accept-encoding", ""))
+    if encoding is None:
+        return None
+
+    etag = response.headers["ETag"]
+    body = await cache.get_variant(key, encoding, etag)
+    if body is None:
+        with measure_serialization():
+            raw = dump_json(payload)
+            body = compress(raw, encoding) if len(raw) >= COMPRESSION_MIN_SIZE else b""
+        await cache.set_variant(key, encoding, etag, body)
+    if not body:
+        return None
+
+    compressed = Response(body, media_type="application/json", headers=dict(response.headers))
+    compressed.headers["Content-Encoding"] = encoding
+    compressed.headers["ETag"] = encoded_etag(etag, encoding)
+    add_vary(compressed.headers)
+    return compressed
@@ -0,0 +1,191 @@
+"""The published-post feed, kept as one denormalised row per published post.
+
+Post writes refresh the rows of the posts they touch, so reading a feed,
+the latest entries or those of one category, is a single range read on
+``feed_entries`` or on the primary key of ``feed_entry_categories``,
+without joining posts, users or categories.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import and_, delete, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.conditional import collection_etag
+from app.posts.models import (DRAFT, PUBLISHED, Category, FeedEntry, Post,
+                              feed_entry_category, post_category_association,
+                              utc_now)
+from app.posts.pagination import InvalidCursor, decode_token, encode_token
+from app.users.models import User
+
+FEED_COLUMNS = (
+    FeedEntry.post_id.label("id"), FeedEntry.title, FeedEntry.summary, FeedEntry.slug,
+    FeedEntry.published_at, FeedEntry.updated_at,
+    FeedEntry.author_id, FeedEntry.author_username, FeedEntry.categories,
+)
+
+
+def set_status(post: Post, status: str):
+    """Move ``post`` to ``status``; publishing stamps ``published_at`` once, unpublishing clears it."""
+    post.status = status
+    if status == PUBLISHED and post.published_at is None:
+        post.published_at = utc_now()
+    elif status == DRAFT:
+        post.published_at = None
+
+
+def feed_row(post, author_username: str, categories: Iterable) -> dict:
+    """Build the ``feed_entries`` row of a published post."""
+    return {
+        "post_id": post.id,
+        "published_at": post.published_at,
+        "title": post.title,
+        "summary": post.summary,
+        "slug": post.slug,
+        "author_id": post.author_id,
+        "author_username": author_username,
+        "categories": [{"id": category.id, "name": category.name} for category in sorted(categories, key=lambda c: c.id)],
+        "updated_at": post.updated_at,
+    }
+
+
+async def insert_feed_rows(session: AsyncSession, rows: List[dict]):
+    """Insert feed entries and their category index rows, one executemany each."""
+    if not rows:
+        return
+    await session.execute(insert(FeedEntry), rows)
+    links = [
+        {"category_id": category["id"], "published_at": row["published_at"], "post_id": row["post_id"]}
+        for row in rows
+        for category in row["categories"]
+    ]
+    if links:
+        await session.execute(insert(feed_entry_category), links)
+
+
+async def remove_feed_entries(session: AsyncSession, post_ids: Iterable[int]):
+    post_ids = list(post_ids)
+    await session.execute(delete(feed_entry_category).where(feed_entry_category.c.post_id.in_(post_ids)))
+    await session.execute(delete(FeedEntry).where(FeedEntry.post_id.in_(post_ids)))
+
+
+async def refresh_feed_entry(session: AsyncSession, post: Post, author_username: str, categories: Iterable, new: bool = False):
+    """Rewrite the feed entry of a post whose author and categories are in hand.
+
+    Drafts lose their entry; ``new`` skips the delete for posts just inserted.
+    """
+    if not new:
+        await remove_feed_entries(session, [post.id])
+    if post.status == PUBLISHED:
+        await insert_feed_rows(session, [feed_row(post, author_username, categories)])
+
+
+async def rebuild_feed_entries(session: AsyncSession, post_ids: Iterable[int]):
+    """Rewrite the feed entries of ``post_ids`` from the posts, users and categories tables.
+
+    Used where the posts are not loaded: bulk imports and category changes.
+    """
+    post_ids = list(post_ids)
+    if not post_ids:
+        return
+    await remove_feed_entries(session, post_ids)
+
+    get_posts = await session.execute(
+        select(
+            Post.id, Post.title, Post.summary, Post.slug, Post.author_id,
+            Post.published_at, Post.updated_at, User.username,
+        )
+        .join(User, User.id == Post.author_id)
+        .where(Post.id.in_(post_ids), Post.status == PUBLISHED)
+    )
+    posts = get_posts.all()
+    if not posts:
+        return
+
+    get_categories = await session.execute(
+        select(post_category_association.c.post_id, Category.id, Category.name)
+        .join(Category, Category.id == post_category_association.c.category_id)
+        .where(post_category_association.c.post_id.in_([post.id for post in posts]))
+    )
+    categories = defaultdict(list)
+    for category in get_categories:
+        categories[category.post_id].append(category)
+
+    await insert_feed_rows(session, [feed_row(post, post.username, categories[post.id]) for post in posts])
+
+
+async def posts_in_category(session: AsyncSession, category_id: int) -> List[int]:
+    get_posts = await session.execute(
+        select(post_category_association.c.post_id).where(post_category_association.c.category_id == category_id)
+    )
+    return list(get_posts.scalars())
+
+
+def encode_feed_cursor(published_at: datetime, post_id: int) -> str:
+    return encode_token({"published_at": published_at.isoformat(), "id": post_id})
+
+
+def decode_feed_cursor(cursor: str) -> tuple:
+    payload = decode_token(cursor)
+    published_at, post_id = payload.get("published_at"), payload.get("id")
+    if not isinstance(published_at, str) or not isinstance(post_id, int):
+        raise InvalidCursor(cursor)
+    try:
+        return datetime.fromisoformat(published_at), post_id
+    except ValueError as e:
+        raise InvalidCursor(cursor) from e
+
+
+async def read_feed(session: AsyncSession, limit: int, cursor: Optional[str] = None, category: Optional[int] = None) -> tuple:
+    """Return one page of feed items, newest first, and the cursor of the next page.
+
+    A category feed walks the ``(category_id, published_at, post_id)``
+    primary key of ``feed_entry_categories`` and joins each entry by key.
+    """
+    published_at, post_id = FeedEntry.published_at, FeedEntry.post_id
+    query = select(*FEED_COLUMNS)
+    if category is not None:
+        index = feed_entry_category.c
+        query = query.join(feed_entry_category, index.post_id == FeedEntry.post_id).where(index.category_id == category)
+        published_at, post_id = index.published_at, index.post_id
+
+    if cursor:
+        last_published_at, last_id = decode_feed_cursor(cursor)
+        query = query.where(or_(
+            published_at < last_published_at,
+            and_(published_at == last_published_at, post_id < last_id),
+        ))
+
+    get_entries = await session.execute(query.order_by(published_at.desc(), post_id.desc()).limit(limit + 1))
+    rows = get_entries.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_feed_cursor(rows[-1].published_at, rows[-1].id)
+    return [feed_item(row) for row in rows], next_cursor
+
+
+def feed_item(row) -> dict:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "summary": row.summary,
+        "slug": row.slug,
+        "published_at": row.published_at,
+        "updated_at": row.updated_at,
+        "author": {"id": row.author_id, "username": row.author_username},
+        "categories": row.categories,
+    }
+
+
+def feed_validators(kind: str, items: List[dict], next_cursor: Optional[str]) -> tuple:
+    """ETag over every field of the page, and Last-Modified of its newest change.
+
+    Entries follow category renames without their post changing, so the
+    tag covers their content rather than ids and versions.
+    """
+    etag = collection_etag(kind, [*(tuple(item.values()) for item in items), next_cursor])
+    last_modified = max((item["updated_at"] for item in items), default=None)
+    return etag, last_modified
@@ -0,0 +1,38 @@
+"""Eager-load options for each response schema.
+
+Every relationship between Post, User and Category is declared with
+``lazy="raise"``, so nothing is loaded unless an endpoint asks for it.
+Endpoints pick the option set matching the schema they return; anything a
+schema does not need stays unloaded and fails loudly if touched.
+
+The option sets are built by functions because building them configures
+the mappers, which must wait until the User model has been imported.
+"""
+from sqlalchemy.orm import joinedload, load_only, selectinload
+
+from app.posts.models import Post
+
+
+def post_list_options():
+    """PostListSchema: post columns without content, author and categories."""
+    return (
+        load_only(
+            Post.id, Post.title, Post.summary, Post.slug, Post.author_id,
+            Post.version, Post.updated_at,
+        ),
+        joinedload(Post.author),
+        selectinload(Post.categories),
+    )
+
+
+def post_detail_options():
+    """PostSchema: every post column, author and categories."""
+    return (
+        joinedload(Post.author),
+        selectinload(Post.categories),
+    )
+
+
+def category_options():
+    """CategorySchema: plain columns only, never the posts collection."""
+    return ()
@@ -1,17 +1,34 @@
-from typing import List
+from datetime import datetime, timezone
+from typing import List, Optional
 
-from sqlalchemy import Column, ForeignKey, Integer, String, Table, Text
+from sqlalchemy import (JSON, Column, DateTime, ForeignKey, Index, Integer,
+                        String, Table, Text)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.settings.database import Base
 
 post_category_association = Table(
     "post_category", Base.metadata,
-    Column("post_id", Integer, ForeignKey("posts.id")),
-    Column("category_id", Integer, ForeignKey("categories.id"))
+    Column("post_id", Integer, ForeignKey("posts.id"), primary_key=True),
+    Column("category_id", Integer, ForeignKey("categories.id"), primary_key=True),
+    Index("ix_post_category_category_id_post_id", "category_id", "post_id"),
 )
 
 
+DRAFT = "draft"
+PUBLISHED = "published"
+
+
+def utc_now() -> datetime:
+    """Naive UTC timestamp, second precision, as stored in DATETIME columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+def default_published_at(context) -> Optional[datetime]:
+    """Stamp posts inserted as published, so ``published_at`` is set exactly when they are."""
+    return utc_now() if context.get_current_parameters().get("status", PUBLISHED) == PUBLISHED else None
+
+
 class Post(Base):
     __tablename__ = 'posts'
 
@@ -20,9 +37,18 @@ class Post(Base):
     summary: Mapped[str] = mapped_column(Text)
     content: Mapped[str] = mapped_column(Text)
     slug: Mapped[str] = mapped_column(String(150), unique=True)
-    author = relationship("User", back_populates="posts", lazy="selectin")
-    author_id: Mapped[int] = mapped_column(ForeignKey("user.id"))
-    categories: Mapped[List["Category"]] = relationship(back_populates="posts", secondary=post_category_association, lazy="selectin")
+    author = relationship("User", back_populates="posts", lazy="raise")
+    author_id: Mapped[int] = mapped_column(ForeignKey("user.id"), index=True)
+    categories: Mapped[List["Category"]] = relationship(back_populates="posts", secondary=post_category_association, lazy="raise")
+    status: Mapped[str] = mapped_column(String(16), default=PUBLISHED, server_default=PUBLISHED)
+    published_at: Mapped[Optional[datetime]] = mapped_column(default=default_published_at, index=True)
+    version: Mapped[int] = mapped_column(default=1, server_default="1")
+    updated_at: Mapped[datetime] = mapped_column(default=utc_now, onupdate=utc_now)
+
+    __mapper_args__ = {"version_id_col": version}
+    __table_args__ = (
+        Index("ix_posts_fulltext", "title", "summary", "content", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
 
 class Category(Base):
@@ -32,4 +58,43 @@ class Category(Base):
     name: Mapped[str] = mapped_column(String(80), unique=True)
     description: Mapped[str] = mapped_column(String(100))
     is_active: Mapped[bool] = mapped_column(default=True)
-    posts: Mapped[List["Post"]] = relationship(back_populates="categories", secondary=post_category_association, lazy="selectin")
+    posts: Mapped[List["Post"]] = relationship(back_populates="categories", secondary=post_category_association, lazy="raise", passive_deletes=True)
+    post_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    version: Mapped[int] = mapped_column(default=1, server_default="1")
+    updated_at: Mapped[datetime] = mapped_column(default=utc_now, onupdate=utc_now)
+
+    __mapper_args__ = {"version_id_col": version}
+
+
+class FeedEntry(Base):
+    """Denormalised summary of a published post, written by the post writes.
+
+    Feeds read these rows alone, newest first along
+    ``ix_feed_entries_published_at_post_id``; ``categories`` holds the
+    ``{"id", "name"}`` pairs of the post.
+    """
+    __tablename__ = "feed_entries"
+
+    post_id: Mapped[int] = mapped_column(ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    published_at: Mapped[datetime]
+    title: Mapped[str] = mapped_column(String(200))
+    summary: Mapped[str] = mapped_column(Text)
+    slug: Mapped[str] = mapped_column(String(150))
+    author_id: Mapped[int]
+    author_username: Mapped[str] = mapped_column(String(50))
+    categories: Mapped[list] = mapped_column(JSON)
+    updated_at: Mapped[datetime]
+
+    __table_args__ = (
+        Index("ix_feed_entries_published_at_post_id", "published_at", "post_id"),
+    )
+
+
+# One row per (category, feed entry), keyed so a category feed is one range of the primary key.
+feed_entry_category = Table(
+    "feed_entry_categories", Base.metadata,
+    Column("category_id", Integer, primary_key=True),
+    Column("published_at", DateTime, primary_key=True),
+    Column("post_id", Integer, ForeignKey("feed_entries.post_id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_feed_entry_categories_post_id", "post_id"),
+)
@@ -0,0 +1,79 @@
+import base64
+import json
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.settings.config import get_settings
+
+POSTS_PAGE_SIZE = get_settings().pagination.page_size
+POSTS_MAX_PAGE_SIZE = get_settings().pagination.max_page_size
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_token(payload: dict) -> str:
+    """Encode a keyset position as an opaque, url-safe string."""
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def decode_token(cursor: str) -> dict:
+    """Decode a string produced by ``encode_token``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+    except ValueError as e:
+        raise InvalidCursor(cursor) from e
+    if not isinstance(payload, dict):
+        raise InvalidCursor(cursor)
+    return payload
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the last seen key as an opaque, url-safe cursor."""
+    return encode_token({"id": last_id})
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a cursor produced by ``encode_cursor``."""
+    last_id = decode_token(cursor).get("id")
+    if not isinstance(last_id, int):
+        raise InvalidCursor(cursor)
+    return last_id
+
+
+def page_limit(limit: Optional[int]) -> int:
+    """Clamp the requested page size to the configured maximum."""
+    if limit is None:
+        return POSTS_PAGE_SIZE
+    return min(limit, POSTS_MAX_PAGE_SIZE)
+
+
+async def paginate(session: AsyncSession, query, key, cursor: Optional[str], limit: int):
+    """Run ``query`` as one keyset page ordered by ``key``.
+
+    Returns the rows of the page and the cursor of the next page, or
+    ``None`` when this is the last one.
+    """
+    if cursor:
+        query = query.where(key > decode_cursor(cursor))
+
+    result = await session.execute(query.order_by(key).limit(limit + 1))
+    rows = result.scalars().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(getattr(rows[-1], key.key))
+    return rows, next_cursor
+
+
+def next_link(request: Request, next_cursor: Optional[str], limit: int) -> Optional[str]:
+    """Build the url of the next page from the current request."""
+    if next_cursor is None:
+        return None
+    return str(request.url.include_query_params(cursor=next_cursor, limit=limit))
@@ -0,0 +1,25 @@
+"""Repair the denormalised ``categories.post_count`` column.
+
+Usage::
+
+    python -m app.posts.recount
+"""
+import asyncio
+
+import app.main  # noqa: F401  (configures every mapper)
+from app.posts.services import recount_post_counts
+from app.settings.database import database_manager
+
+
+async def main():
+    async with database_manager.async_session_maker()() as session:
+        drift = await recount_post_counts(session)
+    await database_manager.dispose()
+
+    for category_id, (stored, counted) in sorted(drift.items()):
+        print(f"category {category_id}: {stored} -> {counted}")
+    print(f"{len(drift)} categories repaired")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,85 +1,281 @@
 from http import HTTPStatus
-from typing import Annotated, List
-
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
-
-from app.posts.models import Category, Post
-from app.posts.schemas import (CategorySchema, CreateCategorySchema,
-                               CreatePostSchema, PostSchema,
-                               UpdateCategorySchema, UpdatePostSchema)
-from app.settings.database import async_session
-from app.users.manager import current_active_user
+from typing import Annotated, List, Optional
+
+from fastapi import (APIRouter, Depends, HTTPException, Path, Query, Request,
+                     Response)
+from fastapi.responses import StreamingResponse
+from sqlmodel import delete, select
+
+from app.cache.cache import (ReadThroughCache, category_key, get_cache,
+                             post_key, post_slug_key)
+from app.conditional import (is_not_modified, not_modified_response,
+                             set_validators)
+from app.instrumentation import InstrumentedRoute
+from app.posts.bulk import (POSTS_BULK_CHUNK_SIZE, POSTS_BULK_MAX_CHUNK_SIZE,
+                            BulkImport, read_ndjson_lines)
+from app.posts.cache import (category_list_key, category_post_keys,
+                             collection_validators, dump_category, dump_post,
+                             invalidate_category, invalidate_category_lists,
+                             invalidate_post, load_category_list,
+                             precompressed_response, read_entity)
+from app.posts.feed import (feed_validators, posts_in_category, read_feed,
+                            rebuild_feed_entries, refresh_feed_entry,
+                            remove_feed_entries, set_status)
+from app.posts.loading import (category_options, post_detail_options,
+                               post_list_options)
+from app.posts.models import (PUBLISHED, Category, Post,
+                              post_category_association)
+from app.posts.pagination import (POSTS_MAX_PAGE_SIZE, InvalidCursor,
+                                   decode_cursor, next_link, page_limit,
+                                   paginate)
+from app.posts.schemas import (BulkImportResultSchema, CategoryCountSchema,
+                               CategorySchema,
+                               CreateCategorySchema,
+                               CreatePostSchema, FeedPageSchema,
+                               PostListSchema,
+                               PostPageSchema, PostSchema,
+                               PostSearchPageSchema, UpdateCategorySchema,
+                               UpdatePostSchema)
+from app.posts.serializers import post_list_item
+from app.posts.services import (create_post_record, filter_posts,
+                                 count_status_change, release_post_counts,
+                                 touch_post,
+                                 touch_posts_in_category, update_categories)
+from app.posts.streaming import (StreamFormat, export_query, export_row,
+                                 load_category_map, post_list_row_encoder,
+                                 post_list_stream_query, stream_partitions,
+                                 streaming_response)
+from app.posts.syndication import (ATOM_KEY, ATOM_MEDIA_TYPE, RSS_KEY,
+                                   RSS_MEDIA_TYPE, SITEMAP_INDEX_KEY,
+                                   SYNDICATION_CACHE_TTL, XML_MEDIA_TYPE,
+                                   Document, invalidate_syndication,
+                                   render_atom, render_rss,
+                                   render_sitemap_index, render_sitemap_page,
+                                   sitemap_page_key)
+from app.replication import ReadSession, WriteSession
+from app.responses import fast_json_enabled, render
+from app.search.backends import SearchBackend
+from app.search.search import get_search_backend, search_posts
+from app.users.auth import current_active_user
 from app.users.models import User
 
-post_router = APIRouter(tags=["posts"])
-categories_router = APIRouter(tags=["routers"])
-SessionAsync = Annotated[AsyncSession, Depends(async_session)]
+post_router = APIRouter(tags=["posts"], route_class=InstrumentedRoute)
+categories_router = APIRouter(tags=["routers"], route_class=InstrumentedRoute)
+feed_router = APIRouter(tags=["feed"], route_class=InstrumentedRoute)
+syndication_router = APIRouter(tags=["feed"], route_class=InstrumentedRoute)
 CurrentUser = Annotated[User, Depends(current_active_user)]
+Cache = Annotated[ReadThroughCache, Depends(get_cache)]
+Search = Annotated[SearchBackend, Depends(get_search_backend)]
+
+
+@post_router.get(path="/", response_model=PostPageSchema)
+async def get_all_posts(
+    request: Request,
+    response: Response,
+    session: ReadSession,
+    cursor: Optional[str] = None,
+    limit: Annotated[Optional[int], Query(ge=1)] = None,
+    category: Optional[int] = None,
+    author: Optional[int] = None,
+    stream: Optional[StreamFormat] = None,
+):
+    try:
+        if stream is not None:
+            stream_posts = filter_posts(post_list_stream_query(), category, author)
+            if cursor:
+                stream_posts = stream_posts.where(Post.id > decode_cursor(cursor))
+            stream_posts = stream_posts.order_by(Post.id).limit(limit)
+            categories = await load_category_map(session)
+            return streaming_response(
+                stream_partitions(session, stream_posts), post_list_row_encoder(categories), stream
+            )
+
+        limit = page_limit(limit)
+        list_posts = filter_posts(select(Post).options(*post_list_options()), category, author)
+        posts, next_cursor = await paginate(session, list_posts, Post.id, cursor, limit)
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Invalid cursor"
+        )
 
+    etag, last_modified = collection_validators("posts", posts, next_cursor)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    set_validators(response, etag, last_modified)
+
+    if fast_json_enabled():
+        posts = [post_list_item(post) for post in posts]
+
+    return render({
+        "items": posts,
+        "next_cursor": next_cursor,
+        "next": next_link(request, next_cursor, limit),
+    }, response)
+
+
+@post_router.get(path="/search", response_model=PostSearchPageSchema)
+async def search(
+    request: Request,
+    session: ReadSession,
+    search_backend: Search,
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    category: Annotated[List[int], Query()] = [],
+    cursor: Optional[str] = None,
+    limit: Annotated[Optional[int], Query(ge=1)] = None,
+):
+    limit = page_limit(limit)
 
-@post_router.get(path="/", response_model=List[PostSchema])
-async def get_all_posts(session: SessionAsync):
+    try:
+        hits, next_cursor = await search_posts(session, search_backend, q, category, cursor, limit)
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Invalid cursor"
+        )
 
-    select_all_posts = await session.execute(
-        select(Post)
-    )
-    return select_all_posts.scalars().all()
+    return {
+        "items": hits,
+        "next_cursor": next_cursor,
+        "next": next_link(request, next_cursor, limit),
+    }
 
 
-@post_router.get(path="/{post_id}", response_model=PostSchema)
-async def get_post(post_id: int, session: SessionAsync):
+@post_router.get(path="/export", response_class=StreamingResponse)
+async def export_posts(user: CurrentUser, session: ReadSession, stream: StreamFormat = "ndjson"):
+    return streaming_response(stream_partitions(session, export_query()), export_row, stream)
 
-    get_post = await session.execute(
-        select(Post).where(Post.id == post_id)
+
+@post_router.get(path="/by-slug", response_model=List[PostListSchema])
+async def get_posts_by_slug(response: Response, session: ReadSession, slug: Annotated[List[str], Query(min_length=1)]):
+
+    slugs = list(dict.fromkeys(slug))
+    if len(slugs) > POSTS_MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"At most {POSTS_MAX_PAGE_SIZE} slugs can be resolved at once"
+        )
+
+    get_posts = await session.execute(
+        select(Post).options(*post_list_options()).where(Post.slug.in_(slugs), Post.status == PUBLISHED)
     )
+    posts = {post.slug: post for post in get_posts.scalars()}
+    posts = [posts[slug] for slug in slugs if slug in posts]
 
-    post = get_post.scalar()
+    if fast_json_enabled():
+        return render([post_list_item(post) for post in posts], response)
+    return posts
 
-    if not post:
+
+@post_router.get(path="/by-slug/{slug}", response_model=PostSchema)
+async def get_post_by_slug(slug: str, request: Request, response: Response, session: ReadSession, cache: Cache):
+
+    async def load_post():
+        get_post = await session.execute(
+            select(Post).options(*post_detail_options()).where(Post.slug == slug, Post.status == PUBLISHED)
+        )
+        post = get_post.scalar()
+        return dump_post(post) if post else None
+
+    async def load_version():
+        get_version = await session.execute(
+            select(Post.id, Post.version, Post.updated_at).where(Post.slug == slug, Post.status == PUBLISHED)
+        )
+        return get_version.first()
+
+    post = await read_entity(
+        request, response, cache, post_slug_key(slug), "post", load_post, load_version
+    )
+
+    if post is None:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail="Post not found"
         )
+    if isinstance(post, Response):
+        return post
 
-    return post
+    compressed = await precompressed_response(request, response, cache, post_slug_key(slug), post)
+    return compressed or render(post, response)
 
 
-@post_router.post(path="/", response_model=PostSchema)
-async def create_post(user: CurrentUser, post: CreatePostSchema, session: SessionAsync):
+@post_router.get(path="/{post_id}", response_model=PostSchema)
+async def get_post(post_id: int, request: Request, response: Response, session: ReadSession, cache: Cache):
+
+    async def load_post():
+        get_post = await session.execute(
+            select(Post).options(*post_detail_options()).where(Post.id == post_id, Post.status == PUBLISHED)
+        )
+        post = get_post.scalar()
+        return dump_post(post) if post else None
 
-    categories = post.categories
-    if categories:
-        get_categories = await session.execute(
-            select(Category).filter(Category.id.in_(categories))
+    async def load_version():
+        get_version = await session.execute(
+            select(Post.id, Post.version, Post.updated_at).where(Post.id == post_id, Post.status == PUBLISHED)
         )
-        categories = get_categories.scalars().all()
-
-    new_post = Post(
-        title=post.title,
-        summary=post.summary,
-        content=post.content,
-        slug=post.slug,
-        author=user,
-        categories=categories,
+        return get_version.first()
+
+    post = await read_entity(
+        request, response, cache, post_key(post_id), "post", load_post, load_version
     )
 
+    if post is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail="Post not found"
+        )
+    if isinstance(post, Response):
+        return post
+
+    compressed = await precompressed_response(request, response, cache, post_key(post_id), post)
+    return compressed or render(post, response)
+
+
+@post_router.post(path="/", response_model=PostSchema)
+async def create_post(user: CurrentUser, post: CreatePostSchema, session: WriteSession, cache: Cache, search_backend: Search):
+
     try:
-        session.add(new_post)
-        await session.commit()
-        await session.refresh(new_post)
+        new_post = await create_post_record(
+            session, post.model_dump(exclude={"categories"}), user, post.categories or []
+        )
     except Exception as e:
         raise HTTPException(
             status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
             detail=f"An unexpected error occurred: {str(e)}"
         )
     else:
+        await invalidate_post(cache, new_post.id, new_post.slug)
+        await invalidate_syndication(cache, new_post.id)
+        if new_post.categories:
+            await invalidate_category_lists(cache)
+        await search_backend.index_post(new_post)
         return new_post
 
 
+@post_router.post(path="/bulk", response_model=BulkImportResultSchema)
+async def bulk_create_posts(
+    user: CurrentUser,
+    request: Request,
+    session: WriteSession,
+    cache: Cache,
+    search_backend: Search,
+    chunk_size: Annotated[int, Query(ge=1)] = POSTS_BULK_CHUNK_SIZE,
+):
+    bulk_import = BulkImport(session, user.id, min(chunk_size, POSTS_BULK_MAX_CHUNK_SIZE))
+    result = await bulk_import.run(read_ndjson_lines(request.stream()))
+
+    if bulk_import.inserted:
+        await invalidate_category_lists(cache)
+        await invalidate_syndication(cache, *(post.id for post in bulk_import.inserted))
+
+    for post in bulk_import.inserted:
+        await search_backend.index_post(post)
+
+    return result
+
+
 @post_router.patch(path="/{post_id}", response_model=PostSchema)
-async def update_post(user: CurrentUser, post_id: int, post_data: UpdatePostSchema, session: SessionAsync):
+async def update_post(user: CurrentUser, post_id: int, post_data: UpdatePostSchema, session: WriteSession, cache: Cache, search_backend: Search):
 
     data_to_update = post_data.model_dump(exclude_unset=True)
     if not data_to_update:
@@ -89,7 +285,7 @@ async def update_post(user: CurrentUser, post_id: int, post_data: UpdatePostSche
         )
 
     get_post = await session.execute(
-        select(Post).where(Post.id == post_id)
+        select(Post).options(*post_detail_options()).where(Post.id == post_id)
     )
     post = get_post.scalar()
 
@@ -99,32 +295,46 @@ async def update_post(user: CurrentUser, post_id: int, post_data: UpdatePostSche
             detail="Post not found"
         )
 
-    post_categories_to_update = post_data.categories
-    if post_categories_to_update:
-        post_categories_to_update += post.categories
-        get_categories = await session.execute(
-            select(Category).filter(Category.id.in_(post_categories_to_update))
-        )
-        data_to_update["categories"] = get_categories.scalars().all()
-
+    previous_slug = post.slug
+    data_to_update.pop("categories", None)
+    status = data_to_update.pop("status", None)
     for key, value in data_to_update.items():
         setattr(post, key, value)
+    was_published = post.status == PUBLISHED
+    if status is not None:
+        set_status(post, status)
+    status_changed = (post.status == PUBLISHED) != was_published
 
+    categories_changed = False
     try:
-        session.add(post)
-        await session.commit()
-        await session.refresh(post)
+        # Counted on the current categories first, so update_categories then counts the membership change.
+        await count_status_change(session, post, was_published)
+        if post_data.categories is not None:
+            categories_changed = await update_categories(session, post, post_data.categories)
+        # A PATCH restating the current values leaves the version, the caches and the feed alone.
+        changed = categories_changed or session.is_modified(post, include_collections=False)
+        if changed:
+            touch_post(post)
+            await refresh_feed_entry(session, post, post.author.username, post.categories)
+            await session.commit()
     except Exception as e:
         raise HTTPException(
             status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
             detail=f"An unexpected error occurred: {str(e)}"
         )
     else:
+        if not changed:
+            return post
+        await invalidate_post(cache, post.id, previous_slug, post.slug)
+        await invalidate_syndication(cache, post.id)
+        if categories_changed or status_changed:
+            await invalidate_category_lists(cache)
+        await search_backend.index_post(post)
         return post
 
 
 @post_router.delete(path="/{post_id}", tags=["posts"], response_model=str)
-async def delete_post(user: CurrentUser, post_id: int, session: SessionAsync):
+async def delete_post(user: CurrentUser, post_id: int, session: WriteSession, cache: Cache, search_backend: Search):
 
     get_post = await session.execute(
         select(Post).where(Post.id == post_id)
@@ -138,6 +348,8 @@ async def delete_post(user: CurrentUser, post_id: int, session: SessionAsync):
         )
 
     try:
+        await release_post_counts(session, post_id)
+        await remove_feed_entries(session, [post_id])
         await session.delete(post)
         await session.commit()
     except Exception as e:
@@ -146,36 +358,71 @@ async def delete_post(user: CurrentUser, post_id: int, session: SessionAsync):
             detail=f"An unexpected error occurred: {str(e)}"
         )
     else:
+        await invalidate_post(cache, post_id, post.slug)
+        await invalidate_syndication(cache, post_id)
+        await invalidate_category_lists(cache)
+        await search_backend.remove_post(post_id)
         return f"Post {post_id} has been deleted"
 
 
-@categories_router.get(path="/", response_model=List[CategorySchema])
-async def get_all_categories(user: CurrentUser, session: SessionAsync):
-    get_categories = await session.execute(
-        select(Category)
+@categories_router.get(path="/", response_model=List[CategoryCountSchema])
+async def get_all_categories(
+    user: CurrentUser,
+    request: Request,
+    response: Response,
+    session: ReadSession,
+    cache: Cache,
+    active_only: bool = False,
+):
+    """List categories with their post counts, read from ``categories`` alone.
+
+    Counts change without moving a category's version, so the listing is
+    validated by an ETag covering the counts and sends no Last-Modified.
+    """
+
+    categories = await cache.get_or_load(
+        category_list_key(active_only), lambda: load_category_list(session, active_only)
     )
-    return get_categories.scalars().all()
+
+    etag, _ = collection_validators("categories", categories, *(category["post_count"] for category in categories))
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_validators(response, etag)
+
+    return render(categories, response)
 
 
 @categories_router.get(path="/{category_id}", response_model=CategorySchema)
-async def get_category(user: CurrentUser, category_id: int, session: SessionAsync):
-    get_category = await session.execute(
-        select(Category).where(Category.id == category_id)
-    )
+async def get_category(user: CurrentUser, category_id: int, request: Request, response: Response, session: ReadSession, cache: Cache):
 
-    category = get_category.scalar()
+    async def load_category():
+        get_category = await session.execute(
+            select(Category).options(*category_options()).where(Category.id == category_id)
+        )
+        category = get_category.scalar()
+        return dump_category(category) if category else None
 
-    if not category:
+    async def load_version():
+        get_version = await session.execute(
+            select(Category.id, Category.version, Category.updated_at).where(Category.id == category_id)
+        )
+        return get_version.first()
+
+    category = await read_entity(
+        request, response, cache, category_key(category_id), "category", load_category, load_version
+    )
+
+    if category is None:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail="Category not found"
         )
 
-    return category
+    return render(category, response)
 
 
 @categories_router.post(path="/", response_model=CategorySchema)
-async def create_category(user: CurrentUser, category: CreateCategorySchema, session: SessionAsync):
+async def create_category(user: CurrentUser, category: CreateCategorySchema, session: WriteSession, cache: Cache):
     category_to_create = Category(
         name=category.name,
         description=category.description,
@@ -185,18 +432,18 @@ async def create_category(user: CurrentUser, category: CreateCategorySchema, ses
     try:
         session.add(category_to_create)
         await session.commit()
-        await session.refresh(category_to_create)
     except Exception as e:
         raise HTTPException(
             status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
             detail=f"An unexpected error occurred: {str(e)}"
         )
     else:
+        await invalidate_category(cache, category_to_create.id)
         return category_to_create
 
 
 @categories_router.patch(path="/{category_id}", response_model=CategorySchema)
-async def update_category(user: CurrentUser, category_id: int, category_data: UpdateCategorySchema, session: SessionAsync):
+async def update_category(user: CurrentUser, category_id: int, category_data: UpdateCategorySchema, session: WriteSession, cache: Cache):
 
     data_to_update = category_data.model_dump(exclude_unset=True)
     if not data_to_update:
@@ -206,7 +453,7 @@ async def update_category(user: CurrentUser, category_id: int, category_data: Up
         )
 
     get_category = await session.execute(
-        select(Category).where(Category.id == category_id)
+        select(Category).options(*category_options()).where(Category.id == category_id)
     )
 
     category = get_category.scalar()
@@ -220,7 +467,12 @@ async def update_category(user: CurrentUser, category_id: int, category_data: Up
     for key, value in data_to_update.items():
         setattr(category, key, value)
 
+    feed_posts = await posts_in_category(session, category_id)
+
     try:
+        await touch_posts_in_category(session, category_id)
+        if "name" in data_to_update:
+            await rebuild_feed_entries(session, feed_posts)
         session.add(category)
         await session.commit()
     except Exception as e:
@@ -229,13 +481,15 @@ async def update_category(user: CurrentUser, category_id: int, category_data: Up
             detail=f"An unexpected error occurred: {str(e)}"
         )
     else:
+        await invalidate_category(cache, category_id, await category_post_keys(session, category_id))
+        await invalidate_syndication(cache, *feed_posts)
         return category
 
 
 @categories_router.delete(path="/{category_id}", response_model=str)
-async def delete_category(user: CurrentUser, category_id: int, session: SessionAsync):
+async def delete_category(user: CurrentUser, category_id: int, session: WriteSession, cache: Cache):
     get_category = await session.execute(
-        select(Category).where(Category.id == category_id)
+        select(Category).options(*category_options()).where(Category.id == category_id)
     )
 
     category = get_category.scalar()
@@ -246,8 +500,16 @@ async def delete_category(user: CurrentUser, category_id: int, session: SessionA
             detail="Category not found"
         )
 
+    post_keys = await category_post_keys(session, category_id)
+    feed_posts = await posts_in_category(session, category_id)
+
     try:
+        await touch_posts_in_category(session, category_id)
+        await session.execute(
+            delete(post_category_association).where(post_category_association.c.category_id == category_id)
+        )
         await session.delete(category)
+        await rebuild_feed_entries(session, feed_posts)
         await session.commit()
     except Exception as e:
         raise HTTPException(
@@ -255,4 +517,99 @@ async def delete_category(user: CurrentUser, category_id: int, session: SessionA
             detail=f"An unexpected error occurred: {str(e)}"
         )
     else:
+        await invalidate_category(cache, category_id, post_keys)
+        await invalidate_syndication(cache, *feed_posts)
         return f"Category {category_id} has been deleted"
+
+
+async def feed_page(
+    request: Request, response: Response, session, cursor: Optional[str], limit: Optional[int], category: Optional[int] = None
+):
+    limit = page_limit(limit)
+    try:
+        items, next_cursor = await read_feed(session, limit, cursor, category)
+    except InvalidCursor:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+    etag, last_modified = feed_validators("feed" if category is None else f"feed-{category}", items, next_cursor)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    set_validators(response, etag, last_modified)
+
+    return render({
+        "items": items,
+        "next_cursor": next_cursor,
+        "next": next_link(request, next_cursor, limit),
+    }, response)
+
+
+@feed_router.get(path="/", response_model=FeedPageSchema)
+async def get_feed(
+    request: Request,
+    response: Response,
+    session: ReadSession,
+    cursor: Optional[str] = None,
+    limit: Annotated[Optional[int], Query(ge=1)] = None,
+):
+    """Latest published posts, newest first, from the precomputed feed entries."""
+    return await feed_page(request, response, session, cursor, limit)
+
+
+@feed_router.get(path="/categories/{category_id}", response_model=FeedPageSchema)
+async def get_category_feed(
+    category_id: int,
+    request: Request,
+    response: Response,
+    session: ReadSession,
+    cursor: Optional[str] = None,
+    limit: Annotated[Optional[int], Query(ge=1)] = None,
+):
+    """Latest published posts of one category, newest first."""
+    return await feed_page(request, response, session, cursor, limit, category_id)
+
+
+async def syndication_response(request: Request, cache: ReadThroughCache, key: str, render, media_type: str) -> Response:
+    """Serve the cached document under ``key``, rendering it with ``render`` on a miss."""
+    stored = await cache.get_or_load_bytes(key, render, SYNDICATION_CACHE_TTL)
+    if stored is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail="Sitemap page not found"
+        )
+
+    document = Document.load(stored)
+    if is_not_modified(request, document.etag, document.last_modified):
+        return not_modified_response(document.etag, document.last_modified)
+    response = Response(content=document.body, media_type=media_type)
+    set_validators(response, document.etag, document.last_modified)
+    return response
+
+
+@syndication_router.get(path="/feed.xml", response_class=Response)
+async def get_rss_feed(request: Request, session: ReadSession, cache: Cache):
+    """RSS 2.0 feed of the latest published posts."""
+    return await syndication_response(request, cache, RSS_KEY, lambda: render_rss(session), RSS_MEDIA_TYPE)
+
+
+@syndication_router.get(path="/atom.xml", response_class=Response)
+async def get_atom_feed(request: Request, session: ReadSession, cache: Cache):
+    """Atom feed of the latest published posts."""
+    return await syndication_response(request, cache, ATOM_KEY, lambda: render_atom(session), ATOM_MEDIA_TYPE)
+
+
+@syndication_router.get(path="/sitemap.xml", response_class=Response)
+async def get_sitemap_index(request: Request, session: ReadSession, cache: Cache):
+    """Sitemap index of the published posts, one sitemap page per ``SITEMAP_PAGE_SIZE`` post ids."""
+    return await syndication_response(
+        request, cache, SITEMAP_INDEX_KEY, lambda: render_sitemap_index(session), XML_MEDIA_TYPE
+    )
+
+
+@syndication_router.get(path="/sitemap-{page}.xml", response_class=Response)
+async def get_sitemap_page(page: Annotated[int, Path(ge=1)], request: Request, session: ReadSession, cache: Cache):
+    return await syndication_response(
+        request, cache, sitemap_page_key(page), lambda: render_sitemap_page(session, page), XML_MEDIA_TYPE
+    )
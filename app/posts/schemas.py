@@ -1,15 +1,24 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator, model_validator
 
 from app.users.schemas import UserRead
 
+PostStatus = Literal["draft", "published"]
+
 
 class CategorySchema(BaseModel):
     id: int
     name: str
     description: str
     is_active: bool
+    version: int
+    updated_at: datetime
+
+
+class CategoryCountSchema(CategorySchema):
+    post_count: int
 
 
 class CreateCategorySchema(BaseModel):
@@ -32,6 +41,36 @@ class PostSchema(BaseModel):
     slug: str
     author: UserRead
     categories: List[CategorySchema]
+    status: PostStatus
+    published_at: Optional[datetime]
+    version: int
+    updated_at: datetime
+
+
+class PostListSchema(BaseModel):
+    id: int
+    title: str
+    summary: str
+    slug: str
+    author: UserRead
+    categories: List[CategorySchema]
+
+
+class PostPageSchema(BaseModel):
+    items: List[PostListSchema]
+    next_cursor: Optional[str] = None
+    next: Optional[str] = None
+
+
+class PostSearchHitSchema(PostListSchema):
+    score: float
+    snippet: str
+
+
+class PostSearchPageSchema(BaseModel):
+    items: List[PostSearchHitSchema]
+    next_cursor: Optional[str] = None
+    next: Optional[str] = None
 
 
 class CreatePostSchema(BaseModel):
@@ -40,6 +79,24 @@ class CreatePostSchema(BaseModel):
     content: str
     slug: str
     categories: List
+    status: PostStatus = "published"
+
+
+class CategoryMembershipUpdate(BaseModel):
+    """Change to the categories of a post.
+
+    ``replace`` sets the exact membership and cannot be combined with
+    ``add`` or ``remove``, which are applied on top of the current one.
+    """
+    add: List[int] = []
+    remove: List[int] = []
+    replace: Optional[List[int]] = None
+
+    @model_validator(mode="after")
+    def check_replace_is_alone(self):
+        if self.replace is not None and (self.add or self.remove):
+            raise ValueError("replace cannot be combined with add or remove")
+        return self
 
 
 class UpdatePostSchema(BaseModel):
@@ -47,4 +104,51 @@ class UpdatePostSchema(BaseModel):
     summary: Optional[str] = None
     content: Optional[str] = None
     slug: Optional[str] = None
-    categories: List
+    categories: Optional[CategoryMembershipUpdate] = None
+    status: Optional[PostStatus] = None
+
+    @field_validator("categories", mode="before")
+    @classmethod
+    def list_adds_categories(cls, value):
+        """A plain list of ids keeps its original meaning: add these categories."""
+        if isinstance(value, list):
+            return {"add": value}
+        return value
+
+
+class FeedAuthorSchema(BaseModel):
+    id: int
+    username: str
+
+
+class FeedCategorySchema(BaseModel):
+    id: int
+    name: str
+
+
+class FeedEntrySchema(BaseModel):
+    id: int
+    title: str
+    summary: str
+    slug: str
+    published_at: datetime
+    updated_at: datetime
+    author: FeedAuthorSchema
+    categories: List[FeedCategorySchema]
+
+
+class FeedPageSchema(BaseModel):
+    items: List[FeedEntrySchema]
+    next_cursor: Optional[str] = None
+    next: Optional[str] = None
+
+
+class BulkImportErrorSchema(BaseModel):
+    line: int
+    error: str
+
+
+class BulkImportResultSchema(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[BulkImportErrorSchema]
@@ -0,0 +1,40 @@
+"""Plain-dict builders mirroring the response schemas field for field.
+
+They are used on the fast response path instead of validating ORM objects
+through ``PostListSchema`` / ``CategorySchema``; the
+encoded JSON must stay identical to what those schemas produce.
+"""
+
+
+def user_item(user) -> dict:
+    return {
+        "id": user.id,
+        "email": user.email,
+        "is_active": user.is_active,
+        "is_superuser": user.is_superuser,
+        "is_verified": user.is_verified,
+        "username": user.username,
+    }
+
+
+def category_item(category) -> dict:
+    return {
+        "id": category.id,
+        "name": category.name,
+        "description": category.description,
+        "is_active": category.is_active,
+        "version": category.version,
+        "updated_at": category.updated_at,
+    }
+
+
+def post_list_item(post) -> dict:
+    return {
+        "id": post.id,
+        "title": post.title,
+        "summary": post.summary,
+        "slug": post.slug,
+        "author": user_item(post.author),
+        "categories": [category_item(category) for category in post.categories],
+    }
+
@@ -0,0 +1,216 @@
+from collections import Counter
+from typing import Iterable, List, Mapping, Optional
+
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import flag_modified, set_committed_value
+
+from app.posts.feed import refresh_feed_entry
+from app.posts.models import (PUBLISHED, Category, Post,
+                              post_category_association, utc_now)
+from app.posts.schemas import CategoryMembershipUpdate
+
+
+async def load_categories(session: AsyncSession, category_ids: Iterable[int]) -> List[Category]:
+    """Load the categories of ``category_ids`` in one query; unknown ids are skipped."""
+    category_ids = list(category_ids)
+    if not category_ids:
+        return []
+    get_categories = await session.execute(select(Category).where(Category.id.in_(category_ids)))
+    return list(get_categories.scalars().all())
+
+
+async def link_categories(session: AsyncSession, post_id: int, categories: Iterable[Category]):
+    """Insert the association rows of a post in a single executemany."""
+    rows = [{"post_id": post_id, "category_id": category.id} for category in categories]
+    if rows:
+        await session.execute(insert(post_category_association), rows)
+
+
+async def adjust_post_counts(session: AsyncSession, deltas: Mapping[int, int]):
+    """Add ``deltas[category_id]`` to the post count of each category in one executemany.
+
+    Goes through the table so neither the version nor ``updated_at`` of the
+    categories move: the count is not part of their versioned representation.
+    """
+    rows = [{"category_id": category_id, "delta": delta} for category_id, delta in deltas.items() if delta]
+    if rows:
+        categories = Category.__table__
+        await session.execute(
+            update(categories)
+            .where(categories.c.id == bindparam("category_id"))
+            .values(post_count=categories.c.post_count + bindparam("delta"), updated_at=categories.c.updated_at),
+            rows,
+        )
+
+
+async def release_post_counts(session: AsyncSession, post_id: int):
+    """Decrement the count of every category a published ``post_id`` belongs to, before its links are deleted."""
+    categories = Category.__table__
+    await session.execute(
+        update(categories)
+        .where(categories.c.id.in_(
+            select(post_category_association.c.category_id)
+            .join(Post, Post.id == post_category_association.c.post_id)
+            .where(post_category_association.c.post_id == post_id, Post.status == PUBLISHED)
+        ))
+        .values(post_count=categories.c.post_count - 1, updated_at=categories.c.updated_at)
+    )
+
+
+async def count_status_change(session: AsyncSession, post: Post, was_published: bool):
+    """Add or remove a post loaded with its categories from their counts when it is published or unpublished."""
+    is_published = post.status == PUBLISHED
+    if is_published != was_published:
+        await adjust_post_counts(session, {category.id: 1 if is_published else -1 for category in post.categories})
+
+
+async def recount_post_counts(session: AsyncSession) -> dict:
+    """Repair every category whose stored count drifted from its published posts.
+
+    Returns ``{category_id: (stored, actual)}`` for the categories fixed.
+    """
+    actual = (
+        select(func.count())
+        .select_from(post_category_association)
+        .join(Post, Post.id == post_category_association.c.post_id)
+        .where(post_category_association.c.category_id == Category.id, Post.status == PUBLISHED)
+        .scalar_subquery()
+    )
+    get_drift = await session.execute(
+        select(Category.id, Category.post_count, actual).where(Category.post_count != actual)
+    )
+    drift = {category_id: (stored, counted) for category_id, stored, counted in get_drift}
+    if drift:
+        categories = Category.__table__
+        await session.execute(
+            update(categories)
+            .where(categories.c.id == bindparam("category_id"))
+            .values(post_count=bindparam("counted"), updated_at=categories.c.updated_at),
+            [{"category_id": category_id, "counted": counted} for category_id, (_, counted) in drift.items()],
+        )
+    await session.commit()
+    return drift
+
+
+def attach_loaded(post: Post, author, categories: List[Category]):
+    """Fill the relationships of a written post with objects already in hand.
+
+    The values are set as loaded state, so they are neither written back
+    nor re-selected, and the response is built without a refresh.
+    """
+    set_committed_value(post, "author", author)
+    set_committed_value(post, "categories", list(categories))
+
+
+async def create_post_record(session: AsyncSession, data: dict, author, category_ids: Iterable[int]) -> Post:
+    """Insert a post and its category links, and return it ready to serialise.
+
+    Costs one category SELECT, one INSERT whose key comes back through
+    ``RETURNING`` or ``lastrowid``, one association INSERT and, once
+    published, one executemany UPDATE of the category counts and the two
+    INSERTs of its feed entry.
+    """
+    categories = await load_categories(session, category_ids)
+    post = Post(**data, author_id=author.id)
+    session.add(post)
+    await session.flush()
+    await link_categories(session, post.id, categories)
+    if post.status == PUBLISHED:
+        await adjust_post_counts(session, Counter(category.id for category in categories))
+    await refresh_feed_entry(session, post, author.username, categories, new=True)
+    await session.commit()
+    attach_loaded(post, author, categories)
+    return post
+
+
+async def update_categories(session: AsyncSession, post: Post, change: CategoryMembershipUpdate) -> bool:
+    """Apply ``change`` to a post loaded with its categories.
+
+    The target membership is diffed against the current one, so only the
+    association rows that change are written: one DELETE for the removed
+    categories, one executemany INSERT for the added ones and, for a
+    published post, one executemany UPDATE of their counts. Returns whether
+    the membership changed.
+    """
+    current = {category.id for category in post.categories}
+    if change.replace is not None:
+        target = set(change.replace)
+    else:
+        target = (current | set(change.add)) - set(change.remove)
+
+    removed = current - target
+    added = await load_categories(session, target - current)
+    if removed:
+        await session.execute(
+            delete(post_category_association).where(
+                post_category_association.c.post_id == post.id,
+                post_category_association.c.category_id.in_(removed),
+            )
+        )
+    await link_categories(session, post.id, added)
+    if post.status == PUBLISHED:
+        await adjust_post_counts(session, {
+            **{category_id: -1 for category_id in removed},
+            **{category.id: 1 for category in added},
+        })
+
+    kept = [category for category in post.categories if category.id not in removed]
+    set_committed_value(post, "categories", kept + sorted(added, key=lambda category: category.id))
+    return bool(removed or added)
+
+
+def touch_post(post: Post):
+    """Force an UPDATE of ``post`` so its version and updated_at move on.
+
+    Changing only the categories writes to the association table, which
+    would otherwise leave the post row, and therefore its ETag, untouched.
+    """
+    post.updated_at = utc_now()
+    flag_modified(post, "updated_at")
+
+
+async def touch_posts_in_category(session: AsyncSession, category_id: int):
+    """Bump the version of every post embedding ``category_id``.
+
+    Post responses embed their categories, so a category change alters the
+    representation of those posts and must change their validators too.
+    """
+    posts_in_category = select(post_category_association.c.post_id).where(
+        post_category_association.c.category_id == category_id
+    )
+    await session.execute(
+        update(Post)
+        .where(Post.id.in_(posts_in_category))
+        .values(version=Post.version + 1, updated_at=utc_now())
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def touch_posts_by_author(session: AsyncSession, author_id: int) -> list:
+    """Bump the version of every post of ``author_id`` and return their ``(id, slug)`` rows.
+
+    Post responses embed their author, so a profile change alters the
+    representation of those posts and must change their validators too.
+    """
+    get_posts = await session.execute(select(Post.id, Post.slug).where(Post.author_id == author_id))
+    posts = get_posts.all()
+    await session.execute(
+        update(Post)
+        .where(Post.author_id == author_id)
+        .values(version=Post.version + 1, updated_at=utc_now())
+        .execution_options(synchronize_session=False)
+    )
+    return posts
+
+
+def filter_posts(query, category: Optional[int] = None, author: Optional[int] = None):
+    """Restrict a posts query to published posts, of one category and/or author on indexed keys."""
+    query = query.where(Post.status == PUBLISHED)
+    if category is not None:
+        query = query.join(
+            post_category_association, post_category_association.c.post_id == Post.id
+        ).where(post_category_association.c.category_id == category)
+    if author is not None:
+        query = query.where(Post.author_id == author)
+    return query
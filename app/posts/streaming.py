@@ -0,0 +1,140 @@
+"""Incremental JSON / NDJSON encoding of large post result sets.
+
+Rows come from ``session.stream()`` in ``yield_per`` batches and are
+encoded one batch at a time, so neither the database driver nor the
+response holds more than a batch in memory. Streamed queries select flat
+rows: a server-side cursor keeps its connection busy, so nothing may be
+lazily or eagerly loaded while it is being read.
+"""
+import json
+from typing import AsyncIterator, Callable, Literal
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.posts.models import Category, Post, post_category_association
+from app.posts.schemas import CategorySchema
+from app.settings.config import get_settings
+from app.users.models import User
+
+POSTS_STREAM_BATCH_SIZE = get_settings().pagination.stream_batch_size
+
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+StreamFormat = Literal["json", "ndjson"]
+
+
+def category_ids_column():
+    """Comma separated category ids of the post in the current row.
+
+    MySQL connections lift ``group_concat_max_len`` when they open (see
+    ``MYSQL_SESSION_SETUP``), so long lists are not silently truncated.
+    """
+    return (
+        select(func.group_concat(post_category_association.c.category_id))
+        .where(post_category_association.c.post_id == Post.id)
+        .correlate(Post)
+        .scalar_subquery()
+        .label("category_ids")
+    )
+
+
+def parse_category_ids(value) -> list:
+    return sorted(int(category) for category in str(value or "").split(",") if category)
+
+
+async def stream_partitions(session: AsyncSession, query, batch_size: int = POSTS_STREAM_BATCH_SIZE):
+    """Yield the rows of ``query`` in batches from a server-side cursor."""
+    result = await session.stream(query.execution_options(yield_per=batch_size))
+    async for partition in result.partitions():
+        yield partition
+
+
+async def encode_json_array(partitions: AsyncIterator, to_dict: Callable) -> AsyncIterator[bytes]:
+    yield b"["
+    separator = ""
+    async for partition in partitions:
+        if partition:
+            yield (separator + ",".join(json.dumps(to_dict(row)) for row in partition)).encode()
+            separator = ","
+    yield b"]"
+
+
+async def encode_ndjson(partitions: AsyncIterator, to_dict: Callable) -> AsyncIterator[bytes]:
+    async for partition in partitions:
+        if partition:
+            yield "".join(json.dumps(to_dict(row)) + "\n" for row in partition).encode()
+
+
+def streaming_response(partitions: AsyncIterator, to_dict: Callable, stream_format: StreamFormat) -> StreamingResponse:
+    if stream_format == "json":
+        return StreamingResponse(encode_json_array(partitions, to_dict), media_type=JSON_MEDIA_TYPE)
+    return StreamingResponse(encode_ndjson(partitions, to_dict), media_type=NDJSON_MEDIA_TYPE)
+
+
+def post_list_stream_query():
+    """Flat rows carrying every PostListSchema field, author included."""
+    return (
+        select(
+            Post.id, Post.title, Post.summary, Post.slug,
+            User.id.label("author_id"), User.email, User.is_active, User.is_superuser,
+            User.is_verified, User.username,
+            category_ids_column(),
+        )
+        .join(User, User.id == Post.author_id)
+    )
+
+
+async def load_category_map(session: AsyncSession) -> dict:
+    """Serialised categories by id; the table is small and read once per stream."""
+    get_categories = await session.execute(select(Category))
+    return {
+        category.id: CategorySchema.model_validate(category, from_attributes=True).model_dump(mode="json")
+        for category in get_categories.scalars()
+    }
+
+
+def post_list_row_encoder(categories: dict) -> Callable:
+    """Build a PostListSchema-shaped dict from a ``post_list_stream_query`` row."""
+    def to_dict(row) -> dict:
+        return {
+            "id": row.id,
+            "title": row.title,
+            "summary": row.summary,
+            "slug": row.slug,
+            "author": {
+                "id": row.author_id,
+                "email": row.email,
+                "is_active": row.is_active,
+                "is_superuser": row.is_superuser,
+                "is_verified": row.is_verified,
+                "username": row.username,
+            },
+            "categories": [
+                categories[category] for category in parse_category_ids(row.category_ids) if category in categories
+            ],
+        }
+    return to_dict
+
+
+def export_query():
+    """Every post with its category ids, as accepted by the bulk import."""
+    return select(
+        Post.id, Post.title, Post.summary, Post.content, Post.slug, Post.author_id, Post.status,
+        category_ids_column(),
+    ).order_by(Post.id)
+
+
+def export_row(row) -> dict:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "summary": row.summary,
+        "content": row.content,
+        "slug": row.slug,
+        "author_id": row.author_id,
+        "categories": parse_category_ids(row.category_ids),
+        "status": row.status,
+    }
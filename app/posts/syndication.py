@@ -0,0 +1,216 @@
+"""RSS, Atom and sitemap documents rendered from the published-post feed.
+
+Each document is rendered once into bytes and cached, with its ETag and
+Last-Modified, until a post write invalidates it; ``SYNDICATION_CACHE_TTL``
+only bounds how long a missed invalidation can be served. The sitemap is
+split into pages of ``SITEMAP_PAGE_SIZE`` consecutive post ids listed by a
+sitemap index, so a post write re-renders the index and one page, and a
+page is read from ``feed_entries`` in streamed batches.
+"""
+import hashlib
+import re
+from datetime import datetime, timezone
+from typing import List, NamedTuple, Optional
+from urllib.parse import quote
+from xml.sax.saxutils import escape, quoteattr
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.cache import ReadThroughCache
+from app.conditional import http_date
+from app.posts.models import FeedEntry
+from app.posts.streaming import stream_partitions
+from app.settings.config import get_settings
+
+SITE_URL = get_settings().site.url.rstrip("/")
+SITE_TITLE = get_settings().site.title
+SITE_DESCRIPTION = get_settings().site.description
+SITE_POST_PATH = get_settings().site.post_path
+FEED_XML_ENTRIES = get_settings().site.feed_entries
+SITEMAP_PAGE_SIZE = get_settings().site.sitemap_page_size
+SYNDICATION_CACHE_TTL = get_settings().site.cache_ttl
+
+RSS_MEDIA_TYPE = "application/rss+xml"
+ATOM_MEDIA_TYPE = "application/atom+xml"
+XML_MEDIA_TYPE = "application/xml"
+
+RSS_KEY = "xml:rss"
+ATOM_KEY = "xml:atom"
+SITEMAP_INDEX_KEY = "xml:sitemap"
+
+XML_DECLARATION = b'<?xml version="1.0" encoding="UTF-8"?>\n'
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+ATOM_NAMESPACE = "http://www.w3.org/2005/Atom"
+# Characters XML 1.0 does not allow, even escaped.
+INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+def sitemap_page(post_id: int) -> int:
+    """Number of the sitemap page listing ``post_id``, starting at 1."""
+    return (post_id - 1) // SITEMAP_PAGE_SIZE + 1
+
+
+def sitemap_page_key(page: int) -> str:
+    return f"xml:sitemap:{page}"
+
+
+async def invalidate_syndication(cache: ReadThroughCache, *post_ids: int):
+    """Drop the feeds, the sitemap index and the sitemap pages listing ``post_ids``."""
+    pages = sorted({sitemap_page(post_id) for post_id in post_ids})
+    await cache.invalidate(RSS_KEY, ATOM_KEY, SITEMAP_INDEX_KEY, *(sitemap_page_key(page) for page in pages))
+
+
+class Document(NamedTuple):
+    """A rendered document and its validators, as stored in the cache."""
+
+    body: bytes
+    etag: str
+    last_modified: Optional[datetime]
+
+    def dump(self) -> bytes:
+        last_modified = self.last_modified.isoformat() if self.last_modified else ""
+        return f"{self.etag}\n{last_modified}\n".encode() + self.body
+
+    @classmethod
+    def load(cls, stored: bytes) -> "Document":
+        etag, last_modified, body = stored.split(b"\n", 2)
+        return cls(body, etag.decode(), datetime.fromisoformat(last_modified.decode()) if last_modified else None)
+
+
+def build_document(chunks: List[bytes], last_modified: Optional[datetime]) -> bytes:
+    body = b"".join(chunks)
+    return Document(body, f'"xml-{hashlib.sha1(body).hexdigest()[:20]}"', last_modified).dump()
+
+
+def post_url(slug: str) -> str:
+    return SITE_URL + SITE_POST_PATH.format(slug=quote(slug, safe=""))
+
+
+def w3c_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+def element(name: str, text: str, attributes: str = "") -> bytes:
+    return f"<{name}{attributes}>{escape(INVALID_XML_CHARS.sub('', text))}</{name}>".encode()
+
+
+async def latest_entries(session: AsyncSession) -> list:
+    get_entries = await session.execute(
+        select(
+            FeedEntry.post_id, FeedEntry.title, FeedEntry.summary, FeedEntry.slug,
+            FeedEntry.author_username, FeedEntry.published_at, FeedEntry.updated_at,
+        )
+        .order_by(FeedEntry.published_at.desc(), FeedEntry.post_id.desc())
+        .limit(FEED_XML_ENTRIES)
+    )
+    return get_entries.all()
+
+
+async def render_rss(session: AsyncSession) -> bytes:
+    """RSS 2.0 channel of the latest ``FEED_XML_ENTRIES`` published posts."""
+    entries = await latest_entries(session)
+    last_modified = max((entry.updated_at for entry in entries), default=None)
+
+    chunks = [
+        XML_DECLARATION,
+        f'<rss version="2.0" xmlns:atom="{ATOM_NAMESPACE}"><channel>'.encode(),
+        element("title", SITE_TITLE),
+        element("link", SITE_URL + "/"),
+        element("description", SITE_DESCRIPTION),
+        f'<atom:link href={quoteattr(SITE_URL + "/feed.xml")} rel="self" type="{RSS_MEDIA_TYPE}"/>'.encode(),
+    ]
+    if last_modified is not None:
+        chunks.append(element("lastBuildDate", http_date(last_modified)))
+    for entry in entries:
+        link = post_url(entry.slug)
+        chunks += [
+            b"<item>",
+            element("title", entry.title),
+            element("link", link),
+            element("guid", link, ' isPermaLink="true"'),
+            element("description", entry.summary),
+            element("pubDate", http_date(entry.published_at)),
+            b"</item>",
+        ]
+    chunks.append(b"</channel></rss>")
+    return build_document(chunks, last_modified)
+
+
+async def render_atom(session: AsyncSession) -> bytes:
+    """Atom feed of the latest ``FEED_XML_ENTRIES`` published posts."""
+    entries = await latest_entries(session)
+    last_modified = max((entry.updated_at for entry in entries), default=None)
+
+    chunks = [
+        XML_DECLARATION,
+        f'<feed xmlns="{ATOM_NAMESPACE}">'.encode(),
+        element("title", SITE_TITLE),
+        element("subtitle", SITE_DESCRIPTION),
+        element("id", SITE_URL + "/"),
+        f'<link href={quoteattr(SITE_URL + "/atom.xml")} rel="self" type="{ATOM_MEDIA_TYPE}"/>'.encode(),
+        f'<link href={quoteattr(SITE_URL + "/")}/>'.encode(),
+        # An empty feed still needs <updated>; the epoch marks it as never changed.
+        element("updated", w3c_date(last_modified or datetime.fromtimestamp(0, timezone.utc))),
+    ]
+    for entry in entries:
+        link = post_url(entry.slug)
+        chunks += [
+            b"<entry>",
+            element("title", entry.title),
+            element("id", link),
+            f"<link href={quoteattr(link)}/>".encode(),
+            element("published", w3c_date(entry.published_at)),
+            element("updated", w3c_date(entry.updated_at)),
+            element("summary", entry.summary),
+            b"<author>", element("name", entry.author_username), b"</author>",
+            b"</entry>",
+        ]
+    chunks.append(b"</feed>")
+    return build_document(chunks, last_modified)
+
+
+async def render_sitemap_index(session: AsyncSession) -> bytes:
+    """Sitemap index listing every non-empty page with the newest change on it."""
+    page = ((FeedEntry.post_id - 1) // SITEMAP_PAGE_SIZE).label("page")
+    get_pages = await session.execute(
+        select(page, func.max(FeedEntry.updated_at).label("updated_at")).group_by(page).order_by(page)
+    )
+    pages = get_pages.all()
+    last_modified = max((row.updated_at for row in pages), default=None)
+
+    chunks = [XML_DECLARATION, f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">'.encode()]
+    for row in pages:
+        chunks += [
+            b"<sitemap>",
+            element("loc", f"{SITE_URL}/sitemap-{int(row.page) + 1}.xml"),
+            element("lastmod", w3c_date(row.updated_at)),
+            b"</sitemap>",
+        ]
+    chunks.append(b"</sitemapindex>")
+    return build_document(chunks, last_modified)
+
+
+async def render_sitemap_page(session: AsyncSession, page: int) -> Optional[bytes]:
+    """One sitemap page, or ``None`` when no published post falls on it."""
+    query = (
+        select(FeedEntry.slug, FeedEntry.updated_at)
+        .where(FeedEntry.post_id > (page - 1) * SITEMAP_PAGE_SIZE, FeedEntry.post_id <= page * SITEMAP_PAGE_SIZE)
+        .order_by(FeedEntry.post_id)
+    )
+    chunks, last_modified = [XML_DECLARATION, f'<urlset xmlns="{SITEMAP_NAMESPACE}">'.encode()], None
+    async for partition in stream_partitions(session, query):
+        chunks.append(b"".join(sitemap_url(row) for row in partition))
+        newest = max(row.updated_at for row in partition)
+        last_modified = newest if last_modified is None else max(last_modified, newest)
+
+    if last_modified is None:
+        return None
+    chunks.append(b"</urlset>")
+    return build_document(chunks, last_modified)
+
+
+def sitemap_url(row) -> bytes:
+    return b"<url>" + element("loc", post_url(row.slug)) + element("lastmod", w3c_date(row.updated_at)) + b"</url>"
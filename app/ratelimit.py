@@ -0,0 +1,299 @@
+"""Per-route rate limiting and admission control.
+
+``RateLimitMiddleware`` applies token buckets to the routes listed in
+``RATE_LIMITS``, keyed per user (from the bearer token, without a database
+lookup) or per client IP, and answers 429 with ``Retry-After`` once a
+bucket is empty. Buckets live in memory or, to be shared between workers,
+in Redis.
+
+``AdmissionMiddleware`` bounds the requests in flight. Requests queue for a
+free slot up to ``ADMISSION_QUEUE_TIMEOUT`` and are shed with 503 when the
+queue does not move, or right away while the connection pool waits of the
+last ``ADMISSION_POOL_WAIT_WINDOW`` seconds are above ``ADMISSION_MAX_POOL_WAIT``.
+"""
+import asyncio
+import json
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import List, Optional, Pattern
+
+from starlette.datastructures import Headers
+from starlette.routing import compile_path
+
+from app.instrumentation import LatencyWindow, pool_wait
+from app.settings.config import get_settings
+from app.users.auth import read_user_id
+
+RATE_LIMIT_BACKEND = get_settings().rate_limit.backend
+RATE_LIMIT_URL = get_settings().rate_limit.url or get_settings().cache.url
+RATE_LIMIT_MAX_KEYS = get_settings().rate_limit.max_keys
+RATE_LIMIT_TRUST_FORWARDED = get_settings().rate_limit.trust_forwarded
+RATE_LIMITS = get_settings().rate_limit.rules
+
+ADMISSION_MAX_CONCURRENCY = get_settings().admission.max_concurrency
+ADMISSION_QUEUE_TIMEOUT = get_settings().admission.queue_timeout
+ADMISSION_MAX_POOL_WAIT = get_settings().admission.max_pool_wait
+ADMISSION_POOL_WAIT_WINDOW = get_settings().admission.pool_wait_window
+ADMISSION_CHECK_INTERVAL = get_settings().admission.check_interval
+ADMISSION_EXEMPT_PATHS = ("/healthcheck", "/metrics")
+
+
+@dataclass
+class RateLimitRule:
+    method: str
+    path: str
+    count: int
+    seconds: float
+    per: str = "user"
+
+    def __post_init__(self):
+        self.regex: Pattern = compile_path(self.path)[0]
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.path}"
+
+    @property
+    def rate(self) -> float:
+        return self.count / self.seconds
+
+    def matches(self, method: str, path: str) -> bool:
+        return method == self.method and self.regex.match(path) is not None
+
+
+def parse_rules(spec: str) -> List[RateLimitRule]:
+    """Parse ``METHOD /path/{param}=COUNT/SECONDS[:user|ip]`` rules separated by ``;``."""
+    rules = []
+    for entry in filter(None, (part.strip() for part in spec.split(";"))):
+        route, _, limit = entry.rpartition("=")
+        method, _, path = route.strip().partition(" ")
+        limit, _, per = limit.partition(":")
+        count, _, seconds = limit.partition("/")
+        if not (method and path and count and seconds) or per not in ("", "user", "ip"):
+            raise ValueError(f"invalid rate limit rule: {entry!r}")
+        rules.append(RateLimitRule(method.upper(), path.strip(), int(count), float(seconds), per or "user"))
+    return rules
+
+
+class MemoryBucketStore:
+    """Token buckets in process memory, evicting the least recently used keys."""
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: OrderedDict = OrderedDict()
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """Take a token; return 0 when granted, else the seconds until one is available."""
+        now = self.clock()
+        tokens, updated = self._buckets.pop(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+class RedisBucketStore:
+    """Token buckets shared by every worker, updated atomically by a Lua script."""
+
+    SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(retry_after)
+"""
+
+    def __init__(self, client, prefix: str = "weblog:ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisBucketStore":
+        from redis import asyncio as redis
+
+        return cls(redis.from_url(url), **kwargs)
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        retry_after = await self.client.eval(self.SCRIPT, 1, self.prefix + key, rate, burst)
+        return float(retry_after)
+
+
+def build_bucket_store():
+    if RATE_LIMIT_BACKEND == "redis":
+        return RedisBucketStore.from_url(RATE_LIMIT_URL)
+    return MemoryBucketStore()
+
+
+class RateLimiter:
+    def __init__(self, rules: List[RateLimitRule], store):
+        self.rules = rules
+        self.store = store
+
+    def match(self, method: str, path: str) -> Optional[RateLimitRule]:
+        return next((rule for rule in self.rules if rule.matches(method, path)), None)
+
+    async def check(self, scope) -> float:
+        """Return 0 when ``scope`` may proceed, else the seconds it should wait."""
+        rule = self.match(scope["method"], scope["path"])
+        if rule is None:
+            return 0.0
+        identity = request_identity(scope, rule.per)
+        return await self.store.take(f"{rule.name}:{identity}", rule.rate, rule.count)
+
+
+def client_ip(scope) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = Headers(scope=scope).get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def request_identity(scope, per: str) -> str:
+    """``user:<id>`` for requests carrying a valid bearer token when limiting per user, else ``ip:<address>``."""
+    if per == "user":
+        scheme, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+        user_id = read_user_id(token) if scheme.lower() == "bearer" and token else None
+        if user_id is not None:
+            return f"user:{user_id}"
+    return f"ip:{client_ip(scope)}"
+
+
+async def send_error(send, status: HTTPStatus, detail: str, retry_after: float):
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+rate_limiter = RateLimiter(parse_rules(RATE_LIMITS), build_bucket_store())
+
+
+class RateLimitMiddleware:
+    def __init__(self, app, limiter: RateLimiter = rate_limiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            retry_after = await self.limiter.check(scope)
+            if retry_after > 0:
+                await send_error(send, HTTPStatus.TOO_MANY_REQUESTS, "Too many requests", retry_after)
+                return
+        await self.app(scope, receive, send)
+
+
+class AdmissionController:
+    """Bound concurrent requests and shed load while the connection pool is congested."""
+
+    def __init__(
+        self,
+        max_concurrency: int = ADMISSION_MAX_CONCURRENCY,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT,
+        max_pool_wait: float = ADMISSION_MAX_POOL_WAIT,
+        window: float = ADMISSION_POOL_WAIT_WINDOW,
+        waits: LatencyWindow = pool_wait,
+        check_interval: float = ADMISSION_CHECK_INTERVAL,
+    ):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.max_pool_wait = max_pool_wait
+        self.window = window
+        self.waits = waits
+        self.check_interval = check_interval
+        self.in_flight = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._congested = False
+        self._checked_at = -math.inf
+
+    def congested(self) -> bool:
+        """Whether pooled connections took too long to come over the last ``window`` seconds.
+
+        Only recent waits count, so shedding stops once the pool has drained
+        and admitted requests find connections again. The percentile sorts
+        the window, so it is computed at most once per ``check_interval``
+        seconds and reused by the requests in between.
+        """
+        now = self.waits.clock()
+        if now - self._checked_at >= self.check_interval:
+            recent = self.waits.percentile(0.95, max_age=self.window)
+            self._congested = recent is not None and recent > self.max_pool_wait
+            self._checked_at = now
+        return self._congested
+
+    def reset(self):
+        """Forget the last congestion check."""
+        self._congested = False
+        self._checked_at = -math.inf
+
+    async def acquire(self) -> bool:
+        """Wait for a slot; return ``False`` when the request should be shed."""
+        if self.congested():
+            return False
+        if self.max_concurrency <= 0:
+            return True
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self):
+        if self.max_concurrency > 0:
+            self.in_flight -= 1
+            self._slots.release()
+
+
+admission_controller = AdmissionController()
+
+
+class AdmissionMiddleware:
+    def __init__(self, app, controller: AdmissionController = admission_controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(ADMISSION_EXEMPT_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.controller.acquire():
+            await send_error(send, HTTPStatus.SERVICE_UNAVAILABLE, "Server busy", self.controller.queue_timeout)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
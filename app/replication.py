@@ -0,0 +1,58 @@
+"""Routing of reads to replicas, with read-your-writes for recent writers.
+
+Write endpoints take a ``WriteSession``: a primary session that first
+records the current user as a recent writer in the shared cache backend.
+Read endpoints take a ``ReadSession``: requests whose bearer token belongs
+to a recent writer read from the primary, every other read goes to the
+next healthy replica. The token is only decoded here, never looked up.
+"""
+from typing import Annotated, AsyncGenerator, Optional
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.cache import ReadThroughCache, get_cache
+from app.settings.config import get_settings
+from app.settings.database import (DatabaseManager, async_session,
+                                   get_database_manager)
+from app.users.auth import current_active_user, read_user_id
+from app.users.manager import BEARER_TRANSPORT
+from app.users.models import User
+
+READ_YOUR_WRITES_SECONDS = get_settings().database.read_your_writes_seconds
+
+
+def writer_key(user_id: int) -> str:
+    return f"writer:user:{user_id}"
+
+
+async def remember_write(cache: ReadThroughCache, user_id: int):
+    """Send the reads of ``user_id`` to the primary for the next few seconds."""
+    await cache.backend.set(writer_key(user_id), b"1", READ_YOUR_WRITES_SECONDS)
+
+
+async def wrote_recently(cache: ReadThroughCache, token: Optional[str]) -> bool:
+    user_id = None if token is None else read_user_id(token)
+    return user_id is not None and await cache.backend.get(writer_key(user_id)) is not None
+
+
+async def read_session(
+    token: Annotated[Optional[str], Depends(BEARER_TRANSPORT.scheme)],
+    cache: Annotated[ReadThroughCache, Depends(get_cache)],
+    manager: Annotated[DatabaseManager, Depends(get_database_manager)],
+) -> AsyncGenerator[AsyncSession, None]:
+    async with manager.read_session(use_primary=await wrote_recently(cache, token)) as session:
+        yield session
+
+
+async def write_session(
+    user: Annotated[User, Depends(current_active_user)],
+    session: Annotated[AsyncSession, Depends(async_session)],
+    cache: Annotated[ReadThroughCache, Depends(get_cache)],
+) -> AsyncSession:
+    await remember_write(cache, user.id)
+    return session
+
+
+ReadSession = Annotated[AsyncSession, Depends(read_session)]
+WriteSession = Annotated[AsyncSession, Depends(write_session)]
@@ -0,0 +1,57 @@
+"""Fast JSON rendering for responses built without Pydantic re-validation.
+
+When ``FAST_JSON_RESPONSES`` is enabled, endpoints build plain dicts from
+ORM rows and return them in ``FastJSONResponse``, skipping FastAPI's
+``response_model`` validation. ``orjson`` is used when installed; the
+bytes are the same as Starlette's ``JSONResponse`` would produce.
+"""
+import json
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+from app.instrumentation import measure_serialization
+from app.settings.config import get_settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+FAST_JSON_RESPONSES = get_settings().responses.fast_json
+
+
+def _default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dump_json(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
+
+
+def fast_json_enabled() -> bool:
+    return FAST_JSON_RESPONSES
+
+
+def render(content: Any, response: Response):
+    """Return ``content`` through the fast path when enabled.
+
+    Headers already set on the injected ``response`` (validators, etc.) are
+    carried over, since FastAPI ignores them once a Response is returned.
+    """
+    if isinstance(content, Response) or not fast_json_enabled():
+        return content
+    with measure_serialization():
+        return FastJSONResponse(content, headers=dict(response.headers))
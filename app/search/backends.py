@@ -0,0 +1,150 @@
+import asyncio
+import math
+from collections import Counter, defaultdict
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.posts.models import PUBLISHED, Post, post_category_association
+from app.search.text import tokenize
+
+# Relative weight of a term occurrence in each indexed field.
+FIELD_WEIGHTS = {"title": 3.0, "summary": 2.0, "content": 1.0}
+
+Position = Tuple[float, int]
+
+
+def in_categories(categories: Iterable[int]):
+    return Post.id.in_(
+        select(post_category_association.c.post_id).where(
+            post_category_association.c.category_id.in_(categories)
+        )
+    )
+
+
+class SearchBackend:
+    """Rank published posts for a query; each backend keeps its own index up to date."""
+
+    async def rank(
+        self,
+        session: AsyncSession,
+        query: str,
+        categories: List[int],
+        after: Optional[Position],
+        limit: int,
+    ) -> List[Position]:
+        """Return up to ``limit`` ``(score, post_id)`` pairs after ``after``.
+
+        Results are ordered by descending score, then descending id.
+        """
+        raise NotImplementedError
+
+    async def index_post(self, post: Post):
+        pass
+
+    async def remove_post(self, post_id: int):
+        pass
+
+
+class MySQLFullTextBackend(SearchBackend):
+    """Rank with ``MATCH ... AGAINST`` on the ``ix_posts_fulltext`` index.
+
+    MySQL maintains the FULLTEXT index itself, so write hooks are no-ops.
+    """
+
+    async def rank(self, session, query, categories, after, limit):
+        score = match(Post.title, Post.summary, Post.content, against=query).in_natural_language_mode()
+        ranked = select(score.label("score"), Post.id).where(score > 0, Post.status == PUBLISHED)
+
+        if categories:
+            ranked = ranked.where(in_categories(categories))
+        if after is not None:
+            last_score, last_id = after
+            ranked = ranked.where(or_(score < last_score, and_(score == last_score, Post.id < last_id)))
+
+        result = await session.execute(ranked.order_by(score.desc(), Post.id.desc()).limit(limit))
+        return [(float(row.score), row.id) for row in result]
+
+
+class InvertedIndexBackend(SearchBackend):
+    """In-process inverted index used where FULLTEXT is not available (SQLite).
+
+    The index is built from the posts table on the first search and then
+    kept current by the post write endpoints. Scores are field-weighted
+    TF-IDF sums. Only the writes of this process reach the index, so it
+    suits tests and single-worker deployments; ``app.server`` refuses to
+    start several workers on it.
+    """
+
+    def __init__(self):
+        self._postings: dict[str, dict[int, float]] = defaultdict(dict)
+        self._documents: dict[int, Counter] = {}
+        self._built = False
+        self._lock = asyncio.Lock()
+
+    def _add(self, post_id: int, title: str, summary: str, content: str):
+        self._discard(post_id)
+        weights = Counter()
+        for field, text in (("title", title), ("summary", summary), ("content", content)):
+            for token in tokenize(text or ""):
+                weights[token] += FIELD_WEIGHTS[field]
+        for token, weight in weights.items():
+            self._postings[token][post_id] = weight
+        self._documents[post_id] = weights
+
+    def _discard(self, post_id: int):
+        for token in self._documents.pop(post_id, ()):
+            postings = self._postings[token]
+            postings.pop(post_id, None)
+            if not postings:
+                del self._postings[token]
+
+    async def _build(self, session: AsyncSession):
+        async with self._lock:
+            if self._built:
+                return
+            rows = await session.stream(
+                select(Post.id, Post.title, Post.summary, Post.content).where(Post.status == PUBLISHED)
+            )
+            async for row in rows:
+                if row.id not in self._documents:
+                    self._add(row.id, row.title, row.summary, row.content)
+            self._built = True
+
+    async def rank(self, session, query, categories, after, limit):
+        if not self._built:
+            await self._build(session)
+
+        scores = Counter()
+        total = max(len(self._documents), 1)
+        for token in set(tokenize(query)):
+            postings = self._postings.get(token, {})
+            if not postings:
+                continue
+            idf = math.log(1 + total / len(postings))
+            for post_id, weight in postings.items():
+                scores[post_id] += weight * idf
+
+        if categories and scores:
+            allowed = await session.execute(
+                select(Post.id).where(Post.id.in_(list(scores)), in_categories(categories))
+            )
+            allowed = set(allowed.scalars())
+            scores = Counter({post_id: score for post_id, score in scores.items() if post_id in allowed})
+
+        ranked = sorted(((round(score, 6), post_id) for post_id, score in scores.items()), reverse=True)
+        if after is not None:
+            ranked = [position for position in ranked if position < tuple(after)]
+        return ranked[:limit]
+
+    async def index_post(self, post: Post):
+        """Index a published post; drafts, including posts just unpublished, leave the index."""
+        if post.status != PUBLISHED:
+            self._discard(post.id)
+        elif self._built or self._lock.locked():
+            self._add(post.id, post.title, post.summary, post.content)
+
+    async def remove_post(self, post_id: int):
+        self._discard(post_id)
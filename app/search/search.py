@@ -0,0 +1,89 @@
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.posts.loading import post_detail_options
+from app.posts.models import PUBLISHED, Post
+from app.posts.pagination import InvalidCursor, decode_token, encode_token
+from app.posts.schemas import PostListSchema
+from app.search.backends import (InvertedIndexBackend, MySQLFullTextBackend,
+                                 SearchBackend)
+from app.search.text import highlight, tokenize
+from app.settings.database import database_manager
+
+
+def encode_search_cursor(score: float, post_id: int) -> str:
+    return encode_token({"score": score, "id": post_id})
+
+
+def decode_search_cursor(cursor: str) -> tuple:
+    payload = decode_token(cursor)
+    score, post_id = payload.get("score"), payload.get("id")
+    if not isinstance(score, (int, float)) or not isinstance(post_id, int):
+        raise InvalidCursor(cursor)
+    return float(score), post_id
+
+
+def snippet(post: Post, terms: List[str]) -> str:
+    """Highlight the summary when it matches, the content otherwise."""
+    terms = set(terms)
+    if any(token in terms for token in tokenize(post.summary)):
+        return highlight(post.summary, terms)
+    return highlight(post.content, terms)
+
+
+async def search_posts(
+    session: AsyncSession,
+    backend: SearchBackend,
+    query: str,
+    categories: List[int],
+    cursor: Optional[str],
+    limit: int,
+):
+    """Return one ranked page of hits and the cursor of the next page."""
+    after = decode_search_cursor(cursor) if cursor else None
+    ranked = await backend.rank(session, query, categories, after, limit + 1)
+
+    next_cursor = None
+    if len(ranked) > limit:
+        ranked = ranked[:limit]
+        next_cursor = encode_search_cursor(*ranked[-1])
+
+    if not ranked:
+        return [], next_cursor
+
+    get_posts = await session.execute(
+        select(Post).options(*post_detail_options())
+        .where(Post.id.in_([post_id for _, post_id in ranked]), Post.status == PUBLISHED)
+    )
+    posts = {post.id: post for post in get_posts.scalars()}
+
+    terms = tokenize(query)
+    hits = []
+    for score, post_id in ranked:
+        post = posts.get(post_id)
+        if post is None:
+            continue
+        hit = PostListSchema.model_validate(post, from_attributes=True).model_dump()
+        hit.update(score=score, snippet=snippet(post, terms))
+        hits.append(hit)
+    return hits, next_cursor
+
+
+def build_search_backend() -> SearchBackend:
+    if make_url(database_manager.urls["async"]).get_backend_name() == "mysql":
+        return MySQLFullTextBackend()
+    return InvertedIndexBackend()
+
+
+_search_backend: Optional[SearchBackend] = None
+
+
+def get_search_backend() -> SearchBackend:
+    """Return the process-wide search backend matching the database dialect."""
+    global _search_backend
+    if _search_backend is None:
+        _search_backend = build_search_backend()
+    return _search_backend
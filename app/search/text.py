@@ -0,0 +1,48 @@
+import html
+import re
+from typing import Iterable, List
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "that", "the", "this", "to", "was", "with",
+})
+SNIPPET_LENGTH = 160
+
+
+def tokenize(text: str) -> List[str]:
+    """Split ``text`` into lowercase search terms, dropping stopwords."""
+    return [
+        token for token in TOKEN_PATTERN.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def highlight(text: str, terms: Iterable[str], length: int = SNIPPET_LENGTH) -> str:
+    """Return an HTML-escaped excerpt of ``text`` around the first matching term.
+
+    Matching terms are wrapped in ``<mark>`` elements.
+    """
+    terms = set(terms)
+    matches = [match for match in TOKEN_PATTERN.finditer(text) if match.group().lower() in terms]
+
+    start = 0
+    if matches:
+        start = max(0, matches[0].start() - length // 4)
+        space = text.rfind(" ", 0, start)
+        start = space + 1 if start and space != -1 else start
+    end = min(len(text), start + length)
+
+    parts = ["…" if start else ""]
+    position = start
+    for match in matches:
+        if match.start() < start:
+            continue
+        if match.end() > end:
+            break
+        parts.append(html.escape(text[position:match.start()]))
+        parts.append(f"<mark>{html.escape(match.group())}</mark>")
+        position = match.end()
+    parts.append(html.escape(text[position:end]))
+    parts.append("…" if end < len(text) else "")
+    return "".join(parts)
@@ -0,0 +1,80 @@
+"""Serve the API under uvicorn with the options read from the environment.
+
+    python -m app.server
+
+Workers are separate processes importing ``app.main:app``, so each builds
+its own engines and pools in its lifespan and warms them up before
+accepting connections. ``SERVER_LOOP`` and ``SERVER_HTTP`` name uvloop and
+httptools by default and fall back to asyncio and h11 when they are not
+installed.
+
+Several workers need MySQL: elsewhere search runs on an in-process index
+that each worker would keep apart, seeing only its own writes, so the
+launcher refuses to start them.
+"""
+import importlib.util
+
+from app.settings.config import get_settings
+
+SERVER_APP = get_settings().server.app
+SERVER_HOST = get_settings().server.host
+SERVER_PORT = get_settings().server.port
+SERVER_WORKERS = get_settings().server.workers
+SERVER_LOOP = get_settings().server.loop
+SERVER_HTTP = get_settings().server.http
+SERVER_KEEP_ALIVE = get_settings().server.keep_alive
+SERVER_BACKLOG = get_settings().server.backlog
+SERVER_PROXY_HEADERS = get_settings().server.proxy_headers
+
+# Optional accelerators and what uvicorn uses without them.
+FALLBACKS = {"uvloop": "asyncio", "httptools": "h11"}
+
+
+def installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def implementation(name: str) -> str:
+    """Return ``name``, or its pure-Python fallback when the module is not installed."""
+    if name in FALLBACKS and not installed(name):
+        return FALLBACKS[name]
+    return name
+
+
+def database_backend() -> str:
+    return get_settings().database.backend_name()
+
+
+def check_workers():
+    """Refuse several workers unless search runs on the database's shared full-text index."""
+    if SERVER_WORKERS > 1 and database_backend() != "mysql":
+        raise SystemExit(
+            f"SERVER_WORKERS={SERVER_WORKERS} requires MySQL: on {database_backend()} every worker "
+            "keeps its own search index, which only reflects that worker's writes"
+        )
+
+
+def server_options() -> dict:
+    """Keyword arguments of ``uvicorn.run``."""
+    return {
+        "host": SERVER_HOST,
+        "port": SERVER_PORT,
+        "workers": SERVER_WORKERS,
+        "loop": implementation(SERVER_LOOP),
+        "http": implementation(SERVER_HTTP),
+        "timeout_keep_alive": SERVER_KEEP_ALIVE,
+        "backlog": SERVER_BACKLOG,
+        "proxy_headers": SERVER_PROXY_HEADERS,
+        "lifespan": "on",
+    }
+
+
+def main():
+    import uvicorn
+
+    check_workers()
+    uvicorn.run(SERVER_APP, **server_options())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Typed application settings, read from the environment once.
+
+Every setting is a field of one of the groups below, named after its
+environment variable by its alias. ``get_settings()`` loads ``.env`` and
+validates the environment on its first call and returns the same object
+afterwards, so a malformed value fails once, at startup, with the name of
+the variable at fault.
+"""
+import os
+from functools import lru_cache
+from typing import Annotated, List, Literal, Mapping, Optional
+
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field
+
+
+def split_commas(value):
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return value
+
+
+CommaList = Annotated[List[str], BeforeValidator(split_commas)]
+
+# Synchronous drivers used by migrations and scripts, by async driver.
+SYNC_DRIVERS = {"aiomysql": "pymysql", "asyncmy": "pymysql", "aiosqlite": "pysqlite", "asyncpg": "psycopg2"}
+
+
+class SettingsGroup(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore", populate_by_name=True)
+
+
+class DatabaseSettings(SettingsGroup):
+    url: Optional[str] = Field(None, alias="DATABASE_URL")
+    sync_url: Optional[str] = Field(None, alias="DATABASE_SYNC_URL")
+    username: Optional[str] = Field(None, alias="DATABASE_USERNAME")
+    password: Optional[str] = Field(None, alias="DATABASE_PASSWORD")
+    name: Optional[str] = Field(None, alias="DATABASE_NAME")
+    host: Optional[str] = Field(None, alias="DATABASE_HOST")
+    # Older deployments name the database host ENVIRONMENT.
+    environment: Optional[str] = Field(None, alias="ENVIRONMENT")
+    port: int = Field(3306, alias="DATABASE_PORT")
+    replica_urls: CommaList = Field([], alias="DATABASE_REPLICA_URLS")
+    replica_hosts: CommaList = Field([], alias="DATABASE_REPLICA_HOSTS")
+    replica_retry_seconds: float = Field(30, alias="DATABASE_REPLICA_RETRY_SECONDS")
+    pool_size: int = Field(5, alias="DATABASE_POOL_SIZE")
+    pool_max_overflow: int = Field(10, alias="DATABASE_POOL_MAX_OVERFLOW")
+    pool_recycle: int = Field(1800, alias="DATABASE_POOL_RECYCLE")
+    pool_pre_ping: bool = Field(True, alias="DATABASE_POOL_PRE_PING")
+    pool_timeout: float = Field(30, alias="DATABASE_POOL_TIMEOUT")
+    log_sample_rate: float = Field(0, alias="DATABASE_LOG_SAMPLE_RATE")
+    latency_window: int = Field(1024, alias="DATABASE_LATENCY_WINDOW")
+    read_your_writes_seconds: float = Field(5, alias="READ_YOUR_WRITES_SECONDS")
+
+    def _mysql_url(self, driver: str, host: str) -> str:
+        from sqlalchemy.engine import URL
+
+        host, _, port = host.partition(":")
+        return URL.create(
+            f"mysql+{driver}", username=self.username, password=self.password,
+            host=host, port=int(port) if port else self.port, database=self.name,
+        ).render_as_string(hide_password=False)
+
+    def urls(self) -> dict:
+        """Sync and async URLs of the primary.
+
+        ``DATABASE_URL`` takes precedence over the MySQL URL assembled from
+        the username, password, host, port and name.
+        """
+        if self.url is None:
+            host = self.host or self.environment or "localhost"
+            return {"sync": self._mysql_url("pymysql", host), "async": self._mysql_url("aiomysql", host)}
+        return {"sync": self.sync_url or sync_url(self.url), "async": self.url}
+
+    def backend_name(self) -> str:
+        """Backend of the primary, such as ``mysql`` or ``sqlite``."""
+        from sqlalchemy.engine import make_url
+
+        return make_url(self.urls()["async"]).get_backend_name()
+
+    def replica_async_urls(self) -> List[str]:
+        """Async URLs of the replicas, given whole or as ``host[:port]`` sharing the primary's credentials."""
+        if self.replica_urls:
+            return list(self.replica_urls)
+        return [self._mysql_url("aiomysql", host) for host in self.replica_hosts]
+
+    def pool(self) -> dict:
+        """Keyword arguments of the engine pools."""
+        return {
+            "pool_size": self.pool_size,
+            "max_overflow": self.pool_max_overflow,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+            "pool_timeout": self.pool_timeout,
+        }
+
+
+def sync_url(url: str) -> str:
+    """Swap the async driver of ``url`` for its synchronous counterpart."""
+    from sqlalchemy.engine import make_url
+
+    url = make_url(url)
+    backend, _, driver = url.drivername.partition("+")
+    if driver not in SYNC_DRIVERS:
+        raise ValueError(f"Set DATABASE_SYNC_URL: no known synchronous driver for {url.drivername}")
+    return url.set(drivername=f"{backend}+{SYNC_DRIVERS[driver]}").render_as_string(hide_password=False)
+
+
+class CacheSettings(SettingsGroup):
+    backend: Literal["memory", "redis"] = Field("memory", alias="CACHE_BACKEND")
+    url: str = Field("redis://localhost:6379/0", alias="CACHE_URL")
+    ttl: float = Field(300, alias="CACHE_TTL")
+    max_entries: int = Field(4096, alias="CACHE_MAX_ENTRIES")
+
+
+class AuthSettings(SettingsGroup):
+    jwt_secret_key: Optional[str] = Field(None, alias="JWT_SECRET_KEY")
+    jwt_lifetime_seconds: int = Field(3600, alias="JWT_LIFETIME_SECONDS")
+    cache_ttl: float = Field(30, alias="AUTH_CACHE_TTL")
+
+
+class PaginationSettings(SettingsGroup):
+    page_size: int = Field(20, alias="POSTS_PAGE_SIZE")
+    max_page_size: int = Field(100, alias="POSTS_MAX_PAGE_SIZE")
+    stream_batch_size: int = Field(500, alias="POSTS_STREAM_BATCH_SIZE")
+    bulk_chunk_size: int = Field(500, alias="POSTS_BULK_CHUNK_SIZE")
+    bulk_max_chunk_size: int = Field(5000, alias="POSTS_BULK_MAX_CHUNK_SIZE")
+
+
+DEFAULT_RATE_LIMITS = ";".join([
+    "POST /users/auth/jwt/login=10/60:ip",
+    "POST /users/auth/register=5/60:ip",
+    "POST /posts/=60/60:user",
+    "POST /posts/bulk=5/60:user",
+    "PATCH /posts/{post_id}=120/60:user",
+])
+
+
+class RateLimitSettings(SettingsGroup):
+    backend: Literal["memory", "redis"] = Field("memory", alias="RATE_LIMIT_BACKEND")
+    # Defaults to CACHE_URL.
+    url: Optional[str] = Field(None, alias="RATE_LIMIT_URL")
+    max_keys: int = Field(100000, alias="RATE_LIMIT_MAX_KEYS")
+    trust_forwarded: bool = Field(False, alias="RATE_LIMIT_TRUST_FORWARDED")
+    rules: str = Field(DEFAULT_RATE_LIMITS, alias="RATE_LIMITS")
+
+
+class AdmissionSettings(SettingsGroup):
+    max_concurrency: int = Field(64, alias="ADMISSION_MAX_CONCURRENCY")
+    queue_timeout: float = Field(1, alias="ADMISSION_QUEUE_TIMEOUT")
+    max_pool_wait: float = Field(0.5, alias="ADMISSION_MAX_POOL_WAIT")
+    pool_wait_window: float = Field(5, alias="ADMISSION_POOL_WAIT_WINDOW")
+    check_interval: float = Field(0.25, alias="ADMISSION_CHECK_INTERVAL")
+
+
+class ResponseSettings(SettingsGroup):
+    compression_min_size: int = Field(1024, alias="COMPRESSION_MIN_SIZE")
+    compression_gzip_level: int = Field(6, ge=1, le=9, alias="COMPRESSION_GZIP_LEVEL")
+    compression_brotli_quality: int = Field(5, ge=0, le=11, alias="COMPRESSION_BROTLI_QUALITY")
+    fast_json: bool = Field(False, alias="FAST_JSON_RESPONSES")
+
+
+class SiteSettings(SettingsGroup):
+    url: str = Field("http://localhost:8000", alias="SITE_URL")
+    title: str = Field("Weblog", alias="SITE_TITLE")
+    description: str = Field("Latest posts", alias="SITE_DESCRIPTION")
+    post_path: str = Field("/posts/by-slug/{slug}", alias="SITE_POST_PATH")
+    feed_entries: int = Field(50, alias="FEED_XML_ENTRIES")
+    sitemap_page_size: int = Field(10000, ge=1, le=50000, alias="SITEMAP_PAGE_SIZE")
+    cache_ttl: float = Field(86400, alias="SYNDICATION_CACHE_TTL")
+
+
+class ServerSettings(SettingsGroup):
+    app: str = Field("app.main:app", alias="SERVER_APP")
+    host: str = Field("0.0.0.0", alias="SERVER_HOST")
+    port: int = Field(8000, alias="SERVER_PORT")
+    workers: int = Field(1, ge=1, alias="SERVER_WORKERS")
+    loop: str = Field("uvloop", alias="SERVER_LOOP")
+    http: str = Field("httptools", alias="SERVER_HTTP")
+    keep_alive: int = Field(5, alias="SERVER_KEEP_ALIVE")
+    backlog: int = Field(2048, alias="SERVER_BACKLOG")
+    proxy_headers: bool = Field(False, alias="SERVER_PROXY_HEADERS")
+    warmup_enabled: bool = Field(True, alias="WARMUP_ENABLED")
+    warmup_timeout: float = Field(10, alias="WARMUP_TIMEOUT")
+    readiness_timeout: float = Field(1, alias="READINESS_TIMEOUT")
+    readiness_cache_seconds: float = Field(2, alias="READINESS_CACHE_SECONDS")
+    readiness_max_pool_saturation: float = Field(0.9, alias="READINESS_MAX_POOL_SATURATION")
+    # Bearer token required by /metrics, which is disabled while unset.
+    metrics_token: Optional[str] = Field(None, alias="METRICS_TOKEN")
+
+
+class Settings(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    database: DatabaseSettings
+    cache: CacheSettings
+    auth: AuthSettings
+    pagination: PaginationSettings
+    rate_limit: RateLimitSettings
+    admission: AdmissionSettings
+    responses: ResponseSettings
+    site: SiteSettings
+    server: ServerSettings
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str]) -> "Settings":
+        env = dict(env)
+        return cls(**{name: field.annotation.model_validate(env) for name, field in cls.model_fields.items()})
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Return the process-wide settings, reading ``.env`` and the environment on first use."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return Settings.from_env(os.environ)
@@ -1,39 +1,431 @@
+import asyncio
 import os
+import threading
+import time
 from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Optional
 
-from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
                                     create_async_engine)
 from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
-load_dotenv()
-DATABASE_USERNAME = os.getenv("DATABASE_USERNAME")
-DATABASE_PASSWORD = os.getenv("DATABASE_PASSWORD")
-DATABASE_NAME = os.getenv("DATABASE_NAME")
-ENVIRONMENT = os.getenv("ENVIRONMENT")
-BASE_URL = (
-    f"://{DATABASE_USERNAME}:{DATABASE_PASSWORD}@{ENVIRONMENT}:3306/{DATABASE_NAME}"
-)
-DATABASE_URL = {
-    "sync": "mysql+pymysql" + BASE_URL,
-    "async": "mysql+aiomysql" + BASE_URL,
-}
+from app.instrumentation import (DATABASE_LOG_SAMPLE_RATE, instrument_engine,
+                                 record_pool_wait)
+from app.settings.config import get_settings
+
+DATABASE_URL = get_settings().database.urls()
+DATABASE_REPLICA_URLS = get_settings().database.replica_async_urls()
+DATABASE_REPLICA_RETRY_SECONDS = get_settings().database.replica_retry_seconds
+DATABASE_POOL = get_settings().database.pool()
+
+# Run on every new MySQL connection. GROUP_CONCAT silently cuts its output at
+# group_concat_max_len, 1024 bytes by default, which long category id lists
+# of streamed posts would exceed; this raises it to the largest value.
+MYSQL_SESSION_SETUP = "SET SESSION group_concat_max_len = 4294967295"
+
+# Seconds the current checkout spent opening a new connection, which is not waiting on the pool.
+_connecting: ContextVar[float] = ContextVar("pool_connecting", default=0.0)
+
+# Set while the current task reads from a replica, which may lag behind the primary.
+reading_replica: ContextVar[bool] = ContextVar("reading_replica", default=False)
 
 
 class Base(DeclarativeBase):
     pass
 
 
+class PoolMetrics:
+    """Checkout counters and time spent waiting for a pooled connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "timeouts": self.timeouts,
+                "wait_count": self.wait_count,
+                "wait_total_seconds": self.wait_total,
+                "wait_max_seconds": self.wait_max,
+            }
+
+
+class _TimedPoolMixin:
+    """Measure how long each checkout waits on the pool queue.
+
+    A checkout that opens a new connection spends that time connecting,
+    not queueing, so it is left out of the wait.
+    """
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        token = _connecting.set(0.0)
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.increment("timeouts")
+            raise
+        finally:
+            waited = max(time.perf_counter() - started - _connecting.get(), 0.0)
+            _connecting.reset(token)
+            self.metrics.record_wait(waited)
+            record_pool_wait(waited)
+
+    def _create_connection(self):
+        started = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            _connecting.set(_connecting.get() + time.perf_counter() - started)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _is_memory_database(url: str) -> bool:
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+class ReplicaSet:
+    """Round-robin over replicas, skipping those that recently failed.
+
+    A replica marked down is retried after ``retry_after`` seconds.
+    """
+
+    def __init__(self, size: int, retry_after: float = DATABASE_REPLICA_RETRY_SECONDS, clock=time.monotonic):
+        self.size = size
+        self.retry_after = retry_after
+        self.clock = clock
+        self._next = 0
+        self._down_until = [0.0] * size
+        self._lock = threading.Lock()
+
+    def is_up(self, index: int) -> bool:
+        return self._down_until[index] <= self.clock()
+
+    def choose(self) -> Optional[int]:
+        """Return the next healthy replica index, or ``None`` when none is."""
+        with self._lock:
+            for offset in range(self.size):
+                index = (self._next + offset) % self.size
+                if self.is_up(index):
+                    self._next = (index + 1) % self.size
+                    return index
+        return None
+
+    def mark_down(self, index: int):
+        with self._lock:
+            self._down_until[index] = self.clock() + self.retry_after
+
+    def mark_up(self, index: int):
+        with self._lock:
+            self._down_until[index] = 0.0
+
+    def status(self) -> list:
+        return [{"index": index, "up": self.is_up(index)} for index in range(self.size)]
+
+
+def replica_kind(index: int) -> str:
+    return f"replica-{index}"
+
+
+def setup_mysql_session(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(MYSQL_SESSION_SETUP)
+    cursor.close()
+
+
+def configure_sessions(engine):
+    """Prepare every new connection of ``engine`` with the session settings of its dialect."""
+    if engine.dialect.name == "mysql":
+        event.listen(engine, "connect", setup_mysql_session)
+
+
 class DatabaseManager:
+    """Own one sync and one async engine for the primary, and one async engine per replica.
+
+    Engines are created lazily on first use (or explicitly on application
+    startup) and reused by every session until ``dispose`` is called.
+    """
+
+    def __init__(
+        self,
+        urls: dict = DATABASE_URL,
+        pool: dict = DATABASE_POOL,
+        echo: bool = False,
+        log_sample_rate: float = DATABASE_LOG_SAMPLE_RATE,
+        replica_urls: list = DATABASE_REPLICA_URLS,
+    ):
+        self.urls = urls
+        self.pool = pool
+        self.echo = echo
+        self.log_sample_rate = log_sample_rate
+        self.replica_urls = list(replica_urls)
+        self.replicas = ReplicaSet(len(self.replica_urls))
+        self.metrics = {"sync": PoolMetrics(), "async": PoolMetrics()}
+        self.metrics.update({replica_kind(index): PoolMetrics() for index in range(len(self.replica_urls))})
+        self._sync_engine = None
+        self._async_engine = None
+        self._async_session_maker = None
+        self._replica_engines = {}
+        self._replica_session_makers = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _engine_options(self, kind: str, url: str) -> dict:
+        options = {"echo": self.echo}
+        if not _is_memory_database(url):
+            options.update(self.pool)
+            options["poolclass"] = TimedQueuePool if kind == "sync" else TimedAsyncAdaptedQueuePool
+        return options
+
+    def _instrument(self, kind: str, engine):
+        configure_sessions(engine)
+        instrument_engine(engine, self.log_sample_rate)
+        pool = engine.pool
+        metrics = self.metrics[kind]
+        pool.metrics = metrics
+        event.listen(pool, "checkout", lambda *args: metrics.increment("checkouts"))
+        event.listen(pool, "checkin", lambda *args: metrics.increment("checkins"))
+        event.listen(pool, "connect", lambda *args: metrics.increment("connects"))
+
     def get_sync_engine(self):
-        return create_engine(DATABASE_URL["sync"], echo=True)
+        if self._sync_engine is None:
+            with self._lock:
+                if self._sync_engine is None:
+                    engine = create_engine(self.urls["sync"], **self._engine_options("sync", self.urls["sync"]))
+                    self._instrument("sync", engine)
+                    self._sync_engine = engine
+        return self._sync_engine
 
     def get_async_engine(self):
-        return create_async_engine(DATABASE_URL["async"], echo=True)
+        if self._async_engine is None:
+            with self._lock:
+                if self._async_engine is None:
+                    engine = create_async_engine(self.urls["async"], **self._engine_options("async", self.urls["async"]))
+                    self._instrument("async", engine.sync_engine)
+                    self._async_engine = engine
+        return self._async_engine
 
     def async_session_maker(self):
-        return async_sessionmaker(self.get_async_engine(), expire_on_commit=False)
+        if self._async_session_maker is None:
+            self._async_session_maker = async_sessionmaker(self.get_async_engine(), expire_on_commit=False)
+        return self._async_session_maker
+
+    def get_replica_engine(self, index: int):
+        if index not in self._replica_engines:
+            with self._lock:
+                if index not in self._replica_engines:
+                    kind, url = replica_kind(index), self.replica_urls[index]
+                    engine = create_async_engine(url, **self._engine_options(kind, url))
+                    self._instrument(kind, engine.sync_engine)
+                    self._replica_engines[index] = engine
+        return self._replica_engines[index]
+
+    def replica_session_maker(self, index: int):
+        if index not in self._replica_session_makers:
+            self._replica_session_makers[index] = async_sessionmaker(
+                self.get_replica_engine(index), expire_on_commit=False
+            )
+        return self._replica_session_makers[index]
+
+    @asynccontextmanager
+    async def read_session(self, use_primary: bool = False) -> AsyncGenerator[AsyncSession, None]:
+        """Open a session on the next healthy replica, or on the primary.
+
+        The primary serves the read when ``use_primary`` is set or no
+        replica is healthy. A replica that cannot be connected to is marked
+        down and the read moves on to the next replica, then to the
+        primary, so the request does not fail; a replica failing later in
+        the read is marked down and the error raised.
+        """
+        session, index = await self._connect_read_session(use_primary)
+        token = reading_replica.set(index is not None)
+        try:
+            async with session:
+                try:
+                    yield session
+                except (OperationalError, PoolTimeoutError):
+                    if index is not None:
+                        self.replicas.mark_down(index)
+                    raise
+        finally:
+            reading_replica.reset(token)
+
+    async def _connect_read_session(self, use_primary: bool) -> tuple:
+        """Return a session connected to the first replica that accepts a connection, and its index."""
+        for _ in range(0 if use_primary else len(self.replica_urls)):
+            index = self.replicas.choose()
+            if index is None:
+                break
+            session = self.replica_session_maker(index)()
+            try:
+                await session.connection()
+            except (OperationalError, PoolTimeoutError):
+                await session.close()
+                self.replicas.mark_down(index)
+            else:
+                return session, index
+        return self.async_session_maker()(), None
+
+    async def startup(self):
+        """Create the engines up front so the first request does not pay for it.
+
+        A worker forked after the engines were built must not share their
+        connections with its parent, so it drops them without closing and
+        builds its own.
+        """
+        if self._pid != os.getpid():
+            await self._discard_inherited_engines()
+        self.get_sync_engine()
+        self.get_async_engine()
+        for index in range(len(self.replica_urls)):
+            self.get_replica_engine(index)
+
+    async def _discard_inherited_engines(self):
+        async_engine, self._async_engine = self._async_engine, None
+        sync_engine, self._sync_engine = self._sync_engine, None
+        replica_engines, self._replica_engines = self._replica_engines, {}
+        self._async_session_maker = None
+        self._replica_session_makers = {}
+        for engine in [async_engine, *replica_engines.values()]:
+            if engine is not None:
+                await engine.dispose(close=False)
+        if sync_engine is not None:
+            sync_engine.dispose(close=False)
+        self._pid = os.getpid()
+
+    async def warm_up(self):
+        """Open ``pool_size`` connections on the primary and on every replica, and return them to their pools.
+
+        A replica that cannot be reached is marked down; a failure on the
+        primary is raised.
+        """
+        replica_indexes = range(len(self.replica_urls))
+        results = await asyncio.gather(
+            self._fill_pool(self.get_async_engine()),
+            *(self._fill_pool(self.get_replica_engine(index)) for index in replica_indexes),
+            return_exceptions=True,
+        )
+        primary, replicas = results[0], results[1:]
+        for index, result in zip(replica_indexes, replicas):
+            if isinstance(result, Exception):
+                self.replicas.mark_down(index)
+        if isinstance(primary, Exception):
+            raise primary
+
+    async def _fill_pool(self, engine):
+        size = engine.sync_engine.pool.size() if isinstance(engine.sync_engine.pool, QueuePool) else 1
+        opened = await asyncio.gather(*(engine.connect().start() for _ in range(size)), return_exceptions=True)
+        connections = [connection for connection in opened if not isinstance(connection, BaseException)]
+        try:
+            await asyncio.gather(*(connection.execute(text("SELECT 1")) for connection in connections))
+        finally:
+            await asyncio.gather(*(connection.close() for connection in connections))
+        for connection in opened:
+            if isinstance(connection, BaseException):
+                raise connection
+
+    async def dispose(self):
+        """Close every pooled connection and drop the engines."""
+        async_engine, self._async_engine = self._async_engine, None
+        sync_engine, self._sync_engine = self._sync_engine, None
+        replica_engines, self._replica_engines = self._replica_engines, {}
+        self._async_session_maker = None
+        self._replica_session_makers = {}
+        for replica_engine in replica_engines.values():
+            await replica_engine.dispose()
+        if async_engine is not None:
+            await async_engine.dispose()
+        if sync_engine is not None:
+            sync_engine.dispose()
+
+    async def ping(self, timeout: float) -> float:
+        """Run ``SELECT 1`` through the shared async pool and return its duration.
+
+        The checkout and the query together must finish within ``timeout``
+        seconds, otherwise ``asyncio.TimeoutError`` is raised.
+        """
+        async def select_one():
+            async with self.get_async_engine().connect() as connection:
+                await connection.execute(text("SELECT 1"))
+
+        started = time.perf_counter()
+        await asyncio.wait_for(select_one(), timeout)
+        return time.perf_counter() - started
+
+    def pool_saturation(self) -> float:
+        """Fraction of the async pool's capacity currently checked out."""
+        engine = self._async_engine
+        pool = engine.sync_engine.pool if engine is not None else None
+        if not isinstance(pool, QueuePool):
+            return 0.0
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        return pool.checkedout() / capacity if capacity else 0.0
+
+    def pool_status(self) -> dict:
+        """Return pool occupancy and checkout/wait counters for every engine."""
+        engines = {
+            "sync": self._sync_engine,
+            "async": self._async_engine.sync_engine if self._async_engine else None,
+        }
+        for index in range(len(self.replica_urls)):
+            replica_engine = self._replica_engines.get(index)
+            engines[replica_kind(index)] = replica_engine.sync_engine if replica_engine else None
+        status = {}
+        for kind, engine in engines.items():
+            status[kind] = self.metrics[kind].snapshot()
+            pool = engine.pool if engine is not None else None
+            if isinstance(pool, QueuePool):
+                status[kind].update(
+                    size=pool.size(),
+                    checked_in=pool.checkedin(),
+                    checked_out=pool.checkedout(),
+                    overflow=pool.overflow(),
+                )
+        for index in range(len(self.replica_urls)):
+            status[replica_kind(index)]["up"] = self.replicas.is_up(index)
+        return status
 
 
 database_manager = DatabaseManager()
@@ -49,3 +441,7 @@ async def async_session() -> AsyncGenerator[AsyncSession, None]:
     async_session_maker = database_manager.async_session_maker()
     async with async_session_maker() as session:
         yield session
+
+
+def get_database_manager() -> DatabaseManager:
+    return database_manager
@@ -0,0 +1,40 @@
+from http import HTTPStatus
+from typing import Annotated, Optional
+
+import jwt
+from fastapi import Depends, HTTPException
+from fastapi_users.jwt import decode_jwt
+
+from app.cache.cache import ReadThroughCache
+from app.settings.database import DatabaseManager, get_database_manager
+from app.users.cache import get_auth_cache, resolve_user
+from app.users.manager import BEARER_TRANSPORT, get_jwt_strategy
+from app.users.models import User
+
+
+def read_user_id(token: str) -> Optional[int]:
+    """Return the user id a token was issued for, or ``None`` if it is not valid."""
+    strategy = get_jwt_strategy()
+    try:
+        data = decode_jwt(token, strategy.decode_key, strategy.token_audience, algorithms=[strategy.algorithm])
+        return int(data["sub"])
+    except (jwt.PyJWTError, KeyError, TypeError, ValueError):
+        return None
+
+
+async def current_active_user(
+    token: Annotated[Optional[str], Depends(BEARER_TRANSPORT.scheme)],
+    manager: Annotated[DatabaseManager, Depends(get_database_manager)],
+    auth_cache: Annotated[ReadThroughCache, Depends(get_auth_cache)],
+) -> User:
+    """Authenticate the request from its bearer token.
+
+    The token is verified locally; the user behind it is read from the
+    authentication cache and only hits the database on a miss. The user
+    returned is not attached to any session, so reference it by id in writes.
+    """
+    user_id = None if token is None else read_user_id(token)
+    user = None if user_id is None else await resolve_user(auth_cache, manager, user_id, token)
+    if user is None or not user.is_active:
+        raise HTTPException(status_code=HTTPStatus.UNAUTHORIZED, detail="Unauthorized")
+    return user
@@ -0,0 +1,73 @@
+import hashlib
+import uuid
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.cache import ReadThroughCache, build_cache
+from app.settings.config import get_settings
+from app.settings.database import DatabaseManager
+from app.users.models import User
+
+AUTH_CACHE_TTL = get_settings().auth.cache_ttl
+
+# Columns the authentication dependency needs; everything else stays in the database.
+AUTH_COLUMNS = (
+    User.id, User.email, User.username,
+    User.is_active, User.is_superuser, User.is_verified,
+)
+
+
+def auth_generation_key(user_id: int) -> str:
+    return f"auth:user:{user_id}:generation"
+
+
+def auth_user_key(user_id: int, generation: str, token: str) -> str:
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    return f"auth:user:{user_id}:{generation}:{digest}"
+
+
+async def load_auth_user(session: AsyncSession, user_id: int) -> Optional[dict]:
+    """Select the authentication columns of one user."""
+    get_user = await session.execute(select(*AUTH_COLUMNS).where(User.id == user_id))
+    row = get_user.mappings().first()
+    return None if row is None else dict(row)
+
+
+async def resolve_user(cache: ReadThroughCache, manager: DatabaseManager, user_id: int, token: str) -> Optional[User]:
+    """Return the user a valid token belongs to, from the cache when possible.
+
+    Entries are keyed by the user's current generation, so invalidating a
+    user drops every token cached for them at once. A miss reads the
+    primary through a session of its own, released before the endpoint
+    runs, so authenticated requests never hold two pooled connections. The
+    returned user is transient: it carries the authentication columns and
+    nothing else.
+    """
+    async def new_generation():
+        return uuid.uuid4().hex
+
+    async def load_user():
+        async with manager.read_session(use_primary=True) as session:
+            return await load_auth_user(session, user_id)
+
+    generation = await cache.get_or_load(auth_generation_key(user_id), new_generation)
+    columns = await cache.get_or_load(auth_user_key(user_id, generation, token), load_user)
+    return None if columns is None else User(**columns)
+
+
+async def invalidate_user(cache: ReadThroughCache, user_id: int):
+    """Forget every cached token of ``user_id``."""
+    await cache.invalidate(auth_generation_key(user_id))
+
+
+_auth_cache: Optional[ReadThroughCache] = None
+
+
+def get_auth_cache() -> ReadThroughCache:
+    """Return the process-wide authentication cache, building it on first use."""
+    global _auth_cache
+    if _auth_cache is None:
+        _auth_cache = build_cache(AUTH_CACHE_TTL)
+    return _auth_cache
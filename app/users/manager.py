@@ -1,28 +1,68 @@
-import os
+from typing import Optional
 
-from fastapi import Depends
+from fastapi import Depends, Request
 from fastapi_users import BaseUserManager, FastAPIUsers, IntegerIDMixin
 from fastapi_users.authentication import (AuthenticationBackend,
                                           BearerTransport, JWTStrategy)
 from fastapi_users.db import SQLAlchemyUserDatabase
 
+from app.cache.cache import ReadThroughCache, get_cache
+from app.posts.cache import post_cache_keys
+from app.posts.feed import rebuild_feed_entries
+from app.posts.services import touch_posts_by_author
+from app.posts.syndication import invalidate_syndication
+from app.settings.config import get_settings
+from app.users.cache import get_auth_cache, invalidate_user
 from app.users.models import User, get_user_db
+from app.users.schemas import UserRead
 
-JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY")
+JWT_SECRET_KEY = get_settings().auth.jwt_secret_key
+JWT_LIFETIME_SECONDS = get_settings().auth.jwt_lifetime_seconds
 BEARER_TRANSPORT = BearerTransport(tokenUrl="auth/jwt/login")
+# User fields embedded as the author of every post.
+AUTHOR_FIELDS = frozenset(UserRead.model_fields) - {"id"}
 
 
 class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
     reset_password_token_secret = JWT_SECRET_KEY
     verification_token_secret = JWT_SECRET_KEY
 
+    def __init__(self, user_db: SQLAlchemyUserDatabase, auth_cache: ReadThroughCache, cache: ReadThroughCache):
+        super().__init__(user_db)
+        self.auth_cache = auth_cache
+        self.cache = cache
 
-async def get_user_manager(user_db: SQLAlchemyUserDatabase = Depends(get_user_db)):
-    yield UserManager(user_db)
+    async def on_after_update(self, user: User, update_dict: dict, request: Optional[Request] = None):
+        await invalidate_user(self.auth_cache, user.id)
+        if AUTHOR_FIELDS.intersection(update_dict):
+            await self.refresh_authored_posts(user)
+
+    async def refresh_authored_posts(self, user: User):
+        """Move the versions, cached entries, feed entries and feeds of the user's posts on with their profile."""
+        session = self.user_db.session
+        posts = await touch_posts_by_author(session, user.id)
+        await rebuild_feed_entries(session, [post.id for post in posts])
+        await session.commit()
+        await self.cache.invalidate(*(key for post in posts for key in post_cache_keys(post.id, post.slug)))
+        await invalidate_syndication(self.cache, *(post.id for post in posts))
+
+    async def on_after_reset_password(self, user: User, request: Optional[Request] = None):
+        await invalidate_user(self.auth_cache, user.id)
+
+    async def on_after_delete(self, user: User, request: Optional[Request] = None):
+        await invalidate_user(self.auth_cache, user.id)
+
+
+async def get_user_manager(
+    user_db: SQLAlchemyUserDatabase = Depends(get_user_db),
+    auth_cache: ReadThroughCache = Depends(get_auth_cache),
+    cache: ReadThroughCache = Depends(get_cache),
+):
+    yield UserManager(user_db, auth_cache, cache)
 
 
 def get_jwt_strategy() -> JWTStrategy:
-    return JWTStrategy(secret=JWT_SECRET_KEY, lifetime_seconds=3600)
+    return JWTStrategy(secret=JWT_SECRET_KEY, lifetime_seconds=JWT_LIFETIME_SECONDS)
 
 
 auth_backend = AuthenticationBackend(
@@ -32,4 +72,3 @@ auth_backend = AuthenticationBackend(
 )
 
 fastapi_users = FastAPIUsers[User, int](get_user_manager, [auth_backend])
-current_active_user = fastapi_users.current_user()
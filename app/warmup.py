@@ -0,0 +1,51 @@
+"""Startup warmup: fill the connection pools and prime the hot caches.
+
+Runs in the application lifespan, before the server accepts connections, so
+a worker only reports ready once its first requests find pooled connections
+and cached category listings and feeds. Warmup is best effort: a database
+that cannot be reached within ``WARMUP_TIMEOUT`` seconds is logged and the
+worker starts cold, leaving the readiness probe to report it.
+"""
+import asyncio
+import logging
+import time
+from functools import partial
+
+from app.cache.cache import ReadThroughCache
+from app.posts.cache import category_list_key, load_category_list
+from app.posts.syndication import (ATOM_KEY, RSS_KEY, SITEMAP_INDEX_KEY,
+                                   SYNDICATION_CACHE_TTL, render_atom,
+                                   render_rss, render_sitemap_index)
+from app.settings.config import get_settings
+from app.settings.database import DatabaseManager
+
+WARMUP_ENABLED = get_settings().server.warmup_enabled
+WARMUP_TIMEOUT = get_settings().server.warmup_timeout
+
+logger = logging.getLogger("app.warmup")
+
+
+async def prime_caches(manager: DatabaseManager, cache: ReadThroughCache):
+    """Load the category listings and the syndication documents unless already cached."""
+    async with manager.read_session() as session:
+        for active_only in (False, True):
+            await cache.get_or_load(category_list_key(active_only), partial(load_category_list, session, active_only))
+        for key, render in ((RSS_KEY, render_rss), (ATOM_KEY, render_atom), (SITEMAP_INDEX_KEY, render_sitemap_index)):
+            await cache.get_or_load_bytes(key, partial(render, session), SYNDICATION_CACHE_TTL)
+
+
+async def warm_up(manager: DatabaseManager, cache: ReadThroughCache, timeout: float = WARMUP_TIMEOUT) -> bool:
+    """Open the minimum pool connections and prime the caches; return whether it succeeded."""
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(_warm_up(manager, cache), timeout)
+    except Exception:
+        logger.exception("Warmup failed, starting cold")
+        return False
+    logger.info("Warmed up in %.3fs", time.perf_counter() - started)
+    return True
+
+
+async def _warm_up(manager: DatabaseManager, cache: ReadThroughCache):
+    await manager.warm_up()
+    await prime_caches(manager, cache)
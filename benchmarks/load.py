@@ -0,0 +1,254 @@
+"""Load test the posts, categories and auth endpoints through the ASGI app.
+
+Seeds a temporary SQLite database with ``--users`` users, ``--posts`` posts
+and ``--categories`` categories, each post linked to between one and
+``--fan-out`` categories, then drives ``app.main.app`` in process through
+``httpx.ASGITransport`` with ``--concurrency`` concurrent clients. The
+database runs in WAL mode so readers do not wait on writers. Every
+scenario reports throughput, p50/p95/p99 latency, errors and the queries
+per request read from the ``Server-Timing`` header.
+
+Rate limits are switched off and the pool waits behind admission control
+are cleared between scenarios, so each scenario measures its endpoint.
+Results are written as JSON; with ``--baseline``, each scenario is compared
+to a previous results file and the run exits with status 1 when latency or
+throughput regress beyond ``--tolerance`` or queries per request grow by
+more than ``--query-tolerance``. Cache hits make the query counts of
+random reads vary slightly from run to run.
+
+Usage::
+
+    python -m benchmarks.load [--users 50] [--posts 2000] [--categories 20]
+        [--concurrency 16] [--requests 500] [--only "GET /posts/" ...]
+        [--output load.json] [--baseline baseline.json] [--tolerance 0.25]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+from fastapi_users.password import PasswordHelper
+
+import app.main  # noqa: F401  (configures every mapper)
+import app.users.manager
+from app.cache.cache import build_cache, get_cache
+from app.instrumentation import pool_wait
+from app.main import app as asgi_app
+from app.posts.models import Category, Post, post_category_association
+from app.ratelimit import admission_controller, rate_limiter
+from app.search.backends import InvertedIndexBackend
+from app.search.search import get_search_backend
+from app.settings.database import (Base, DatabaseManager, async_session,
+                                   get_database_manager)
+from app.users.cache import AUTH_CACHE_TTL, get_auth_cache
+from app.users.manager import get_jwt_strategy
+from app.users.models import User
+
+PASSWORD = "benchmark-password"
+QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def seed(manager: DatabaseManager, args, rng: random.Random) -> dict:
+    """Insert the dataset with Core executemany and return the ids the scenarios need."""
+    engine = manager.get_sync_engine()
+    Base.metadata.create_all(engine)
+    hashed_password = PasswordHelper().hash(PASSWORD)
+    users = [
+        {"id": number, "email": f"user{number}@example.com", "username": f"user{number}",
+         "hashed_password": hashed_password, "is_active": True, "is_superuser": False, "is_verified": True}
+        for number in range(1, args.users + 1)
+    ]
+    categories = [
+        {"id": number, "name": f"Category {number}", "description": "Description", "is_active": True, "post_count": 0}
+        for number in range(1, args.categories + 1)
+    ]
+    posts, links = [], []
+    for number in range(1, args.posts + 1):
+        posts.append({
+            "id": number, "title": f"Post number {number}", "slug": f"seed-{number}",
+            "summary": "A reasonably sized summary of the article. " * 3,
+            "content": "Paragraph of content for the article body. " * 40,
+            "author_id": rng.randint(1, args.users),
+        })
+        for category in rng.sample(categories, rng.randint(1, min(args.fan_out, len(categories)))):
+            links.append({"post_id": number, "category_id": category["id"]})
+            category["post_count"] += 1
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql("PRAGMA journal_mode=WAL")
+        connection.execute(User.__table__.insert(), users)
+        connection.execute(Category.__table__.insert(), categories)
+        connection.execute(Post.__table__.insert(), posts)
+        connection.execute(post_category_association.insert(), links)
+    return {"users": [user["id"] for user in users], "categories": [category["id"] for category in categories],
+            "posts": [post["id"] for post in posts]}
+
+
+def scenarios(ids: dict, tokens: dict, rng: random.Random) -> dict:
+    """Map each scenario name to a function building the arguments of its next request."""
+    counter = iter(range(sys.maxsize))
+
+    def bearer():
+        return {"Authorization": f"Bearer {tokens[rng.choice(ids['users'])]}"}
+
+    return {
+        "GET /posts/": lambda: ("GET", "/posts/", {"params": {"limit": 20}}),
+        "GET /posts/?category": lambda: ("GET", "/posts/", {"params": {"limit": 20, "category": rng.choice(ids["categories"])}}),
+        "GET /posts/{post_id}": lambda: ("GET", f"/posts/{rng.choice(ids['posts'])}", {}),
+        "GET /categories/": lambda: ("GET", "/categories/", {"headers": bearer()}),
+        "GET /categories/{category_id}": lambda: ("GET", f"/categories/{rng.choice(ids['categories'])}", {"headers": bearer()}),
+        "POST /posts/": lambda: ("POST", "/posts/", {"headers": bearer(), "json": {
+            "title": "Load test post", "summary": "Summary", "content": "Content " * 100,
+            "slug": f"load-{next(counter)}", "categories": rng.sample(ids["categories"], min(3, len(ids["categories"]))),
+        }}),
+        "POST /users/auth/jwt/login": lambda: ("POST", "/users/auth/jwt/login", {"data": {
+            "username": f"user{rng.choice(ids['users'])}@example.com", "password": PASSWORD,
+        }}),
+    }
+
+
+def percentile(samples: list, fraction: float) -> float:
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+async def run_scenario(client: httpx.AsyncClient, build, requests: int, concurrency: int) -> dict:
+    latencies, queries, statuses = [], [], Counter()
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            method, url, kwargs = build()
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+            match = QUERIES.search(response.headers.get("Server-Timing", ""))
+            if match:
+                queries.append(int(match.group(1)))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": sum(count for status, count in statuses.items() if status >= 400),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "queries_per_request": round(statistics.fmean(queries), 2) if queries else None,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float, query_tolerance: float) -> list:
+    """Print each scenario against the baseline and return the names that regressed."""
+    regressions = []
+    print(f"\n{'scenario':<32} {'rps':>16} {'p95 ms':>16} {'queries':>12}")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        slower = current["p95_ms"] > previous["p95_ms"] * (1 + tolerance)
+        fewer = current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance)
+        more_queries = (current["queries_per_request"] or 0) > (previous["queries_per_request"] or 0) + query_tolerance
+        if slower or fewer or more_queries:
+            regressions.append(name)
+        print(
+            f"{name:<32} {previous['throughput_rps']:>7} -> {current['throughput_rps']:<7}"
+            f"{previous['p95_ms']:>7} -> {current['p95_ms']:<7}"
+            f"{previous['queries_per_request']!s:>5} -> {current['queries_per_request']!s:<5}"
+            f"{'  REGRESSION' if name in regressions else ''}"
+        )
+    return regressions
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--fan-out", type=int, default=3, help="most categories per seeded post")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--login-requests", type=int, default=50, help="login requests, which hash a password each")
+    parser.add_argument("--only", nargs="*", help="run only these scenarios")
+    parser.add_argument("--admission", action="store_true", help="keep shedding load on slow pool waits")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, default=Path("load.json"))
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative change of p95 and throughput")
+    parser.add_argument("--query-tolerance", type=float, default=0.1, help="allowed extra queries per request")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    if not app.users.manager.JWT_SECRET_KEY:
+        app.users.manager.JWT_SECRET_KEY = "benchmark-secret-with-at-least-32-bytes"
+    rate_limiter.rules = []
+    if not args.admission:
+        admission_controller.max_pool_wait = float("inf")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "load.db"
+        manager = DatabaseManager(urls={"sync": f"sqlite:///{path}", "async": f"sqlite+aiosqlite:///{path}"})
+        ids = seed(manager, args, rng)
+        strategy = get_jwt_strategy()
+        tokens = {user_id: await strategy.write_token(User(id=user_id)) for user_id in ids["users"]}
+
+        async def override_async_session():
+            async with manager.async_session_maker()() as session:
+                yield session
+
+        cache, auth_cache, search_backend = build_cache(), build_cache(AUTH_CACHE_TTL), InvertedIndexBackend()
+        asgi_app.dependency_overrides.update({
+            async_session: override_async_session,
+            get_database_manager: lambda: manager,
+            get_cache: lambda: cache,
+            get_auth_cache: lambda: auth_cache,
+            get_search_backend: lambda: search_backend,
+        })
+
+        results = {}
+        transport = httpx.ASGITransport(app=asgi_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            print(f"{'scenario':<32} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'errors':>7}")
+            for name, build in scenarios(ids, tokens, rng).items():
+                if args.only and name not in args.only:
+                    continue
+                pool_wait.clear()
+                requests = args.login_requests if name.startswith("POST /users/auth") else args.requests
+                result = results[name] = await run_scenario(client, build, requests, args.concurrency)
+                print(
+                    f"{name:<32} {result['throughput_rps']:>8} {result['p50_ms']:>8} {result['p95_ms']:>8}"
+                    f" {result['p99_ms']:>8} {result['queries_per_request']!s:>8} {result['errors']:>7}"
+                )
+
+        asgi_app.dependency_overrides.clear()
+        await manager.dispose()
+
+    args.output.write_text(json.dumps({
+        "config": {key: getattr(args, key) for key in ("users", "posts", "categories", "fan_out", "concurrency", "requests", "login_requests", "seed")},
+        "python": platform.python_version(),
+        "results": results,
+    }, indent=2) + "\n")
+    print(f"\nwrote {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        if compare(results, baseline, args.tolerance, args.query_tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
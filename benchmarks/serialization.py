@@ -0,0 +1,93 @@
+"""Compare the standard and fast response paths of the post list.
+
+The standard path mirrors what FastAPI does with ``response_model``:
+validate ORM objects into ``List[PostListSchema]`` from attributes, dump
+them in JSON mode and encode with ``JSONResponse``. The fast path builds
+dicts with ``app.posts.serializers`` and encodes with ``FastJSONResponse``.
+
+Usage::
+
+    python -m benchmarks.serialization [--sizes 1000 10000] [--repeat 5]
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime
+from typing import List
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+import app.main  # noqa: F401  (configures every mapper)
+from app.posts.models import Category, Post
+from app.posts.schemas import PostListSchema
+from app.posts.serializers import post_list_item
+from app.responses import FastJSONResponse
+from app.users.models import User
+
+
+def build_posts(count: int) -> list:
+    updated_at = datetime(2026, 10, 18, 9, 30)
+    authors = [
+        User(id=number, email=f"author{number}@example.com", username=f"author{number}",
+             hashed_password="x", is_active=True, is_superuser=False, is_verified=True)
+        for number in range(1, 21)
+    ]
+    categories = [
+        Category(id=number, name=f"Category {number}", description="Description",
+                 is_active=True, version=1, updated_at=updated_at)
+        for number in range(1, 31)
+    ]
+    return [
+        Post(
+            id=number,
+            title=f"Post number {number} about things",
+            summary="A reasonably sized summary of the article. " * 3,
+            slug=f"post-{number}",
+            author_id=authors[number % len(authors)].id,
+            author=authors[number % len(authors)],
+            categories=[categories[(number + offset) % len(categories)] for offset in range(3)],
+            version=1,
+            updated_at=updated_at,
+        )
+        for number in range(1, count + 1)
+    ]
+
+
+def standard_path(posts: list, adapter: TypeAdapter) -> bytes:
+    items = adapter.validate_python(posts, from_attributes=True)
+    return JSONResponse(adapter.dump_python(items, mode="json")).body
+
+
+def fast_path(posts: list) -> bytes:
+    return FastJSONResponse([post_list_item(post) for post in posts]).body
+
+
+def measure(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    adapter = TypeAdapter(List[PostListSchema])
+    print(f"{'posts':>8} {'standard ms':>12} {'fast ms':>10} {'speed-up':>9}")
+    for size in args.sizes:
+        posts = build_posts(size)
+        assert standard_path(posts, adapter) == fast_path(posts), "fast path output differs"
+
+        standard = measure(lambda: standard_path(posts, adapter), args.repeat)
+        fast = measure(lambda: fast_path(posts), args.repeat)
+        print(f"{size:>8} {standard * 1000:>12.1f} {fast * 1000:>10.1f} {standard / fast:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Compare queries and time per post write with and without the refresh.
+
+The refresh path is the one ``create_post`` used before: load the
+categories, insert the post through its relationships, commit, then
+``session.refresh`` the author and categories. The deferred path is
+``app.posts.services.create_post_record``, which builds the response from
+the objects already loaded and links categories in one executemany. Both
+keep the category counts and the feed entry up to date the same way, so
+only the insert and the reload differ.
+
+Runs against a temporary SQLite file; statements are counted with a
+``before_cursor_execute`` listener.
+
+Usage::
+
+    python -m benchmarks.writes [--writes 200] [--categories 3]
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import event, select
+
+import app.main  # noqa: F401  (configures every mapper)
+from app.posts.feed import refresh_feed_entry
+from app.posts.models import PUBLISHED, Category, Post
+from app.posts.services import adjust_post_counts, create_post_record
+from app.settings.database import Base, DatabaseManager
+from app.users.models import User
+
+
+async def create_with_refresh(session, data: dict, author, category_ids: list) -> Post:
+    get_categories = await session.execute(select(Category).filter(Category.id.in_(category_ids)))
+    categories = get_categories.scalars().all()
+    post = Post(**data, author_id=author.id, categories=categories)
+    session.add(post)
+    await session.flush()
+    if post.status == PUBLISHED:
+        await adjust_post_counts(session, {category.id: 1 for category in categories})
+    await refresh_feed_entry(session, post, author.username, categories, new=True)
+    await session.commit()
+    await session.refresh(post, ["author", "categories"])
+    return post
+
+
+def seed(manager: DatabaseManager, category_count: int) -> tuple:
+    engine = manager.get_sync_engine()
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        author_id = connection.execute(User.__table__.insert().values(
+            email="author@example.com", username="author", hashed_password="x",
+            is_active=True, is_superuser=False, is_verified=True,
+        )).inserted_primary_key[0]
+        category_ids = [
+            connection.execute(Category.__table__.insert().values(
+                name=f"Category {number}", description="Description", is_active=True,
+            )).inserted_primary_key[0]
+            for number in range(category_count)
+        ]
+    return author_id, category_ids
+
+
+async def run(manager: DatabaseManager, write, prefix: str, writes: int, author_id: int, category_ids: list) -> tuple:
+    """Return the seconds spent and the statements issued by ``writes`` writes."""
+    statements = []
+    engine = manager.get_async_engine().sync_engine
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    elapsed = 0.0
+    for number in range(writes):
+        async with manager.async_session_maker()() as session:
+            author = await session.get(User, author_id)
+            data = {"title": f"{prefix} {number}", "summary": "Summary", "content": "Content", "slug": f"{prefix}-{number}"}
+            event.listen(engine, "before_cursor_execute", count)
+            started = time.perf_counter()
+            post = await write(session, data, author, category_ids)
+            elapsed += time.perf_counter() - started
+            event.remove(engine, "before_cursor_execute", count)
+            assert len(post.categories) == len(category_ids) and post.author.id == author_id
+    return elapsed, statements
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--categories", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "writes.db"
+        manager = DatabaseManager(urls={"sync": f"sqlite:///{path}", "async": f"sqlite+aiosqlite:///{path}"})
+        author_id, category_ids = seed(manager, args.categories)
+
+        print(f"{'path':>10} {'queries/write':>14} {'ms/write':>9}")
+        for name, write in (("refresh", create_with_refresh), ("deferred", create_post_record)):
+            elapsed, statements = await run(manager, write, name, args.writes, author_id, category_ids)
+            print(f"{name:>10} {len(statements) / args.writes:>14.1f} {elapsed / args.writes * 1000:>9.2f}")
+        await manager.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,20 +1,17 @@
-import os
 from logging.config import fileConfig
 
 from alembic import context
-from dotenv import load_dotenv
 from sqlalchemy import engine_from_config, pool
 
-from app.settings.database import DATABASE_URL, Base
-
-# Load environments variables
-load_dotenv()
+from app.settings.config import get_settings
+from app.settings.database import Base
 
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
-config.set_main_option("sqlalchemy.url", DATABASE_URL["sync"])
+# Percent signs of escaped passwords would read as interpolation in the .ini config.
+config.set_main_option("sqlalchemy.url", get_settings().database.urls()["sync"].replace("%", "%%"))
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -0,0 +1,32 @@
+"""add version and updated_at to posts and categories
+
+Revision ID: 3b9e4f1c7a20
+Revises: 5fc18dfcc76a
+Create Date: 2026-10-18 09:12:41.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e4f1c7a20'
+down_revision: Union[str, None] = '5fc18dfcc76a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('posts', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('posts', sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+    op.add_column('categories', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('categories', sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('categories', 'updated_at')
+    op.drop_column('categories', 'version')
+    op.drop_column('posts', 'updated_at')
+    op.drop_column('posts', 'version')
@@ -0,0 +1,28 @@
+"""add fulltext index to posts
+
+Revision ID: 8d2a61c4e9b7
+Revises: 3b9e4f1c7a20
+Create Date: 2026-10-18 11:03:27.142915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2a61c4e9b7'
+down_revision: Union[str, None] = '3b9e4f1c7a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == 'mysql':
+        op.create_index('ix_posts_fulltext', 'posts', ['title', 'summary', 'content'], mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == 'mysql':
+        op.drop_index('ix_posts_fulltext', table_name='posts')
@@ -0,0 +1,34 @@
+"""add post_category keys and author index
+
+Revision ID: a41f0d7b93ce
+Revises: 8d2a61c4e9b7
+Create Date: 2026-10-18 12:26:09.771342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41f0d7b93ce'
+down_revision: Union[str, None] = '8d2a61c4e9b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column('post_category', 'post_id', existing_type=sa.Integer(), nullable=False)
+    op.alter_column('post_category', 'category_id', existing_type=sa.Integer(), nullable=False)
+    op.create_primary_key('pk_post_category', 'post_category', ['post_id', 'category_id'])
+    op.create_index('ix_post_category_category_id_post_id', 'post_category', ['category_id', 'post_id'], unique=False)
+    op.create_index(op.f('ix_posts_author_id'), 'posts', ['author_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_posts_author_id'), table_name='posts')
+    op.drop_index('ix_post_category_category_id_post_id', table_name='post_category')
+    op.drop_constraint('pk_post_category', 'post_category', type_='primary')
+    op.alter_column('post_category', 'category_id', existing_type=sa.Integer(), nullable=True)
+    op.alter_column('post_category', 'post_id', existing_type=sa.Integer(), nullable=True)
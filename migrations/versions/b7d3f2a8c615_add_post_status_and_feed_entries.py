@@ -0,0 +1,95 @@
+"""add post status, published_at and feed entries
+
+Revision ID: b7d3f2a8c615
+Revises: e5c2a9d14f60
+Create Date: 2026-10-18 16:21:09.304117
+
+"""
+from collections import defaultdict
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3f2a8c615'
+down_revision: Union[str, None] = 'e5c2a9d14f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('posts', sa.Column('status', sa.String(length=16), server_default='published', nullable=False))
+    op.add_column('posts', sa.Column('published_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_posts_published_at', 'posts', ['published_at'], unique=False)
+    # Every existing post was public: publish it as of its last change.
+    op.execute("UPDATE posts SET published_at = updated_at")
+    # Category counts only cover published posts from here on.
+    op.execute(
+        "UPDATE categories SET post_count = "
+        "(SELECT COUNT(*) FROM post_category JOIN posts ON posts.id = post_category.post_id "
+        "WHERE post_category.category_id = categories.id AND posts.status = 'published')"
+    )
+
+    feed_entries = op.create_table(
+        'feed_entries',
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('published_at', sa.DateTime(), nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('summary', sa.Text(), nullable=False),
+        sa.Column('slug', sa.String(length=150), nullable=False),
+        sa.Column('author_id', sa.Integer(), nullable=False),
+        sa.Column('author_username', sa.String(length=50), nullable=False),
+        sa.Column('categories', sa.JSON(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('post_id'),
+    )
+    op.create_index('ix_feed_entries_published_at_post_id', 'feed_entries', ['published_at', 'post_id'], unique=False)
+    feed_entry_categories = op.create_table(
+        'feed_entry_categories',
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('published_at', sa.DateTime(), nullable=False),
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['post_id'], ['feed_entries.post_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('category_id', 'published_at', 'post_id'),
+    )
+    op.create_index('ix_feed_entry_categories_post_id', 'feed_entry_categories', ['post_id'], unique=False)
+
+    connection = op.get_bind()
+    categories = defaultdict(list)
+    for post_id, category_id, name in connection.execute(sa.text(
+        "SELECT post_category.post_id, categories.id, categories.name FROM post_category "
+        "JOIN categories ON categories.id = post_category.category_id ORDER BY categories.id"
+    )):
+        categories[post_id].append({"id": category_id, "name": name})
+
+    entries = [
+        {
+            "post_id": row.id, "published_at": row.published_at, "title": row.title, "summary": row.summary,
+            "slug": row.slug, "author_id": row.author_id, "author_username": row.username,
+            "categories": categories[row.id], "updated_at": row.updated_at,
+        }
+        for row in connection.execute(sa.text(
+            "SELECT posts.id, posts.published_at, posts.title, posts.summary, posts.slug, posts.author_id, "
+            "posts.updated_at, user.username FROM posts JOIN user ON user.id = posts.author_id"
+        ).columns(published_at=sa.DateTime(), updated_at=sa.DateTime()))
+    ]
+    if entries:
+        op.bulk_insert(feed_entries, entries)
+        op.bulk_insert(feed_entry_categories, [
+            {"category_id": category["id"], "published_at": entry["published_at"], "post_id": entry["post_id"]}
+            for entry in entries
+            for category in entry["categories"]
+        ])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_feed_entry_categories_post_id', table_name='feed_entry_categories')
+    op.drop_table('feed_entry_categories')
+    op.drop_index('ix_feed_entries_published_at_post_id', table_name='feed_entries')
+    op.drop_table('feed_entries')
+    op.drop_index('ix_posts_published_at', table_name='posts')
+    op.drop_column('posts', 'published_at')
+    op.drop_column('posts', 'status')
@@ -0,0 +1,30 @@
+"""add post_count to categories
+
+Revision ID: e5c2a9d14f60
+Revises: a41f0d7b93ce
+Create Date: 2026-10-18 14:02:41.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c2a9d14f60'
+down_revision: Union[str, None] = 'a41f0d7b93ce'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('categories', sa.Column('post_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        "UPDATE categories SET post_count = "
+        "(SELECT COUNT(*) FROM post_category WHERE post_category.category_id = categories.id)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('categories', 'post_count')
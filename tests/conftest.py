@@ -1,11 +1,27 @@
+import asyncio
+from http import HTTPStatus
+
 import pytest
+from fastapi import Depends
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.cache.backends import MemoryBackend
+from app.cache.cache import ReadThroughCache, get_cache
+from app.instrumentation import pool_wait
 from app.main import app
+from app.search.backends import InvertedIndexBackend
+from app.search.search import get_search_backend
 from app.posts.models import Category, Post
-from app.settings.database import Base
+from app.ratelimit import (MemoryBucketStore, admission_controller,
+                           rate_limiter)
+from app.settings.database import (Base, DatabaseManager, async_session,
+                                   get_database_manager)
+from app.users.auth import current_active_user
+from app.users.cache import get_auth_cache
+from app.users.manager import get_jwt_strategy
 from app.users.models import User
 
 
@@ -26,6 +42,201 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture
+def database(tmp_path):
+    """Returns a database manager backed by a temporary SQLite file."""
+    path = tmp_path / "weblog.db"
+    manager = DatabaseManager(
+        urls={"sync": f"sqlite:///{path}", "async": f"sqlite+aiosqlite:///{path}"},
+        echo=False,
+    )
+    Base.metadata.create_all(manager.get_sync_engine())
+    yield manager
+    asyncio.run(manager.dispose())
+
+
+@pytest.fixture
+def db_session(database):
+    """Returns a sync session on the same database the API uses."""
+    with Session(database.get_sync_engine(), expire_on_commit=False) as session:
+        yield session
+
+
+@pytest.fixture
+def author(db_session):
+    author = User(
+        username="author@gmail.com",
+        email="author@gmail.com",
+        hashed_password="hashed_password",
+        is_active=True,
+    )
+    db_session.add(author)
+    db_session.commit()
+    return author
+
+
+@pytest.fixture
+def seeded_post(db_session, author):
+    """Returns a post by ``author`` in a single category."""
+    category = Category(name="Technologie", description="Everything about tech world", is_active=True)
+    post = Post(
+        title="Seeded post",
+        summary="Summary",
+        content="Content",
+        slug="seeded-post",
+        author=author,
+        categories=[category],
+    )
+    db_session.add(post)
+    db_session.commit()
+    return post
+
+
+@pytest.fixture
+def categories(db_session):
+    """Returns two active categories followed by an inactive one."""
+    categories = [
+        Category(name="Python", description="Python", is_active=True),
+        Category(name="Databases", description="Databases", is_active=True),
+        Category(name="Archive", description="Archive", is_active=False),
+    ]
+    db_session.add_all(categories)
+    db_session.commit()
+    return categories
+
+
+class FakeRedis:
+    """Minimal stand-in for a ``redis.asyncio`` client."""
+
+    def __init__(self):
+        self.data = {}
+        self.expirations = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.expirations[key] = ex
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+            self.expirations.pop(key, None)
+
+
+class FakeClock:
+    """Monotonic clock the test moves by assigning ``now``."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def rate_limit_buckets(monkeypatch):
+    """Gives every test empty rate limit buckets, no recorded pool waits and no cached congestion check."""
+    store = MemoryBucketStore()
+    monkeypatch.setattr(rate_limiter, "store", store)
+    pool_wait.clear()
+    admission_controller.reset()
+    yield store
+    pool_wait.clear()
+    admission_controller.reset()
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache():
+    """Returns an empty in-process cache for a single test."""
+    return ReadThroughCache(MemoryBackend(max_entries=128), ttl=60)
+
+
+@pytest.fixture
+def auth_cache():
+    """Returns an empty authentication cache for a single test."""
+    return ReadThroughCache(MemoryBackend(max_entries=128), ttl=30)
+
+
+@pytest.fixture
+def search_backend():
+    """Returns an empty inverted index for a single test."""
+    return InvertedIndexBackend()
+
+
+@pytest.fixture
+def api_client(database, author, cache, auth_cache, search_backend):
+    """Returns a test client wired to the temporary database as ``author``."""
+    async def override_async_session():
+        async with database.async_session_maker()() as session:
+            yield session
+
+    async def override_current_user(session: AsyncSession = Depends(async_session)):
+        return await session.get(User, author.id)
+
+    app.dependency_overrides[async_session] = override_async_session
+    app.dependency_overrides[get_database_manager] = lambda: database
+    app.dependency_overrides[current_active_user] = override_current_user
+    app.dependency_overrides[get_cache] = lambda: cache
+    app.dependency_overrides[get_auth_cache] = lambda: auth_cache
+    app.dependency_overrides[get_search_backend] = lambda: search_backend
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def create_post(api_client):
+    """Returns a function creating a post in the given categories through the API."""
+    def create(slug, categories=(), status="published", title=None):
+        response = api_client.post("/posts/", json={
+            "title": title or f"Title {slug}", "summary": f"Summary of {slug}", "content": "Content",
+            "slug": slug, "categories": [category.id for category in categories], "status": status,
+        })
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+    return create
+
+
+@pytest.fixture
+def jwt_secret(monkeypatch):
+    """Configures a signing key long enough for the JWT strategy."""
+    monkeypatch.setattr("app.users.manager.JWT_SECRET_KEY", "test-secret-with-at-least-32-bytes")
+
+
+@pytest.fixture
+def issue_token(jwt_secret):
+    """Returns a function writing a bearer token for a user."""
+    def issue(user):
+        return asyncio.run(get_jwt_strategy().write_token(user))
+    return issue
+
+
+@pytest.fixture
+def query_counter(database):
+    """Returns a list collecting every SQL statement the API executes."""
+    statements = []
+
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = database.get_async_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", collect)
+    yield statements
+    event.remove(engine, "before_cursor_execute", collect)
+
+
 @pytest.fixture
 def user():
     return User(
@@ -1,8 +1,76 @@
+import asyncio
 from http import HTTPStatus
 
+import pytest
+
+from app.healthcheck import ReadinessProbe, get_readiness_probe
+from app.instrumentation import LatencyWindow
+from app.main import app
+from app.settings.database import DatabaseManager
+
 
 def test_api_healthceck(client):
     """Ensure that app is available."""
     response = client.get("/healthcheck")
     assert response.status_code == HTTPStatus.OK
     assert response.json() == {"status": HTTPStatus.OK}
+
+
+def test_api_liveness(client):
+    """Ensure liveness answers without touching the database."""
+    response = client.get("/healthcheck/live")
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {"status": HTTPStatus.OK}
+
+
+@pytest.fixture
+def probe(database, clock):
+    return ReadinessProbe(database, latency=LatencyWindow(), timeout=0.5, cache_seconds=2, clock=clock)
+
+
+def test_api_readiness(api_client, probe):
+    """Ensure readiness reports the database, pool saturation and latency."""
+    app.dependency_overrides[get_readiness_probe] = lambda: probe
+
+    response = api_client.get("/healthcheck/ready")
+
+    assert response.status_code == HTTPStatus.OK
+    body = response.json()
+    assert body["database"]["ok"] is True
+    assert body["pool"]["saturation"] < 1
+    assert "db_latency_p99_ms" in body
+
+
+def test_readiness_result_is_cached(probe, clock, query_counter):
+    """Ensure a burst of probes runs a single query per cache interval."""
+    async def probe_many():
+        return await asyncio.gather(*(probe.check() for _ in range(10)))
+
+    asyncio.run(probe_many())
+    asyncio.run(probe_many())
+    assert query_counter.count("SELECT 1") == 1
+
+    clock.now = 3
+    asyncio.run(probe.check())
+    assert query_counter.count("SELECT 1") == 2
+
+
+def test_readiness_fails_when_pool_is_exhausted(tmp_path):
+    """Ensure the probe gives up after its timeout when no connection is free."""
+    path = tmp_path / "weblog.db"
+    manager = DatabaseManager(
+        urls={"sync": f"sqlite:///{path}", "async": f"sqlite+aiosqlite:///{path}"},
+        pool={"pool_size": 1, "max_overflow": 0, "pool_recycle": 60, "pool_pre_ping": False, "pool_timeout": 30},
+    )
+    probe = ReadinessProbe(manager, latency=LatencyWindow(), timeout=0.1)
+
+    async def check_while_busy():
+        async with manager.get_async_engine().connect():
+            return await probe.check()
+
+    result = asyncio.run(check_while_busy())
+    asyncio.run(manager.dispose())
+
+    assert result["status"] == HTTPStatus.SERVICE_UNAVAILABLE
+    assert result["database"]["ok"] is False
+    assert result["pool"]["saturation"] == 1
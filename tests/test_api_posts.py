@@ -0,0 +1,248 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from app.posts.models import Category, Post
+from app.users.models import User
+
+
+@pytest.fixture
+def posts(db_session, author):
+    category = Category(name="Technologie", description="Everything about tech world", is_active=True)
+    posts = [
+        Post(
+            title=f"Post {number}",
+            summary=f"Summary {number}",
+            content=f"Content {number}",
+            slug=f"post-{number}",
+            author=author,
+            categories=[category],
+        )
+        for number in range(1, 6)
+    ]
+    db_session.add_all(posts)
+    db_session.commit()
+    return posts
+
+
+def test_list_posts_paginates_with_cursor(api_client, posts):
+    """Ensure posts are listed in keyset pages linked by cursors."""
+    first_page = api_client.get("/posts/", params={"limit": 2})
+    assert first_page.status_code == HTTPStatus.OK
+    body = first_page.json()
+    assert [item["id"] for item in body["items"]] == [posts[0].id, posts[1].id]
+    assert body["next_cursor"]
+    assert "cursor=" in body["next"]
+
+    second_page = api_client.get(body["next"]).json()
+    assert [item["id"] for item in second_page["items"]] == [posts[2].id, posts[3].id]
+
+    last_page = api_client.get(second_page["next"]).json()
+    assert [item["id"] for item in last_page["items"]] == [posts[4].id]
+    assert last_page["next_cursor"] is None
+    assert last_page["next"] is None
+
+
+def test_list_posts_leaves_out_content(api_client, posts):
+    """Ensure the list page does not return article bodies."""
+    item = api_client.get("/posts/").json()["items"][0]
+
+    assert "content" not in item
+    assert item["author"]["username"] == "author@gmail.com"
+    assert item["categories"][0]["name"] == "Technologie"
+
+
+def test_list_posts_caps_limit(api_client, posts, monkeypatch):
+    """Ensure the page size never exceeds the configured maximum."""
+    monkeypatch.setattr("app.posts.pagination.POSTS_MAX_PAGE_SIZE", 3)
+
+    body = api_client.get("/posts/", params={"limit": 50}).json()
+
+    assert len(body["items"]) == 3
+    assert "limit=3" in body["next"]
+
+
+def test_list_posts_rejects_invalid_cursor(api_client, posts):
+    """Ensure a tampered cursor is reported as a bad request."""
+    response = api_client.get("/posts/", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_get_post_by_slug(api_client, posts):
+    """Ensure a post can be fetched by its slug with validators."""
+    response = api_client.get("/posts/by-slug/post-3")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["id"] == posts[2].id
+    assert response.json()["content"] == "Content 3"
+    assert response.headers["ETag"] == f'"post-{posts[2].id}-v1"'
+
+
+def test_get_post_by_slug_honours_if_none_match(api_client, posts):
+    """Ensure slug lookups answer conditional requests like id lookups."""
+    etag = api_client.get(f"/posts/{posts[2].id}").headers["ETag"]
+
+    response = api_client.get("/posts/by-slug/post-3", headers={"If-None-Match": etag})
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_get_post_by_unknown_slug(api_client, posts):
+    """Ensure an unknown slug is reported as not found."""
+    assert api_client.get("/posts/by-slug/unknown").status_code == HTTPStatus.NOT_FOUND
+
+
+def test_get_posts_by_slugs_resolves_in_one_query(api_client, posts, query_counter):
+    """Ensure many slugs are resolved in request order with one post query."""
+    response = api_client.get("/posts/by-slug", params={"slug": ["post-4", "missing", "post-1"]})
+
+    assert response.status_code == HTTPStatus.OK
+    assert [item["slug"] for item in response.json()] == ["post-4", "post-1"]
+    assert "content" not in response.json()[0]
+    assert len([statement for statement in query_counter if "posts.slug IN" in statement]) == 1
+
+
+@pytest.fixture
+def other_author(db_session):
+    other_author = User(
+        username="other@gmail.com",
+        email="other@gmail.com",
+        hashed_password="hashed_password",
+        is_active=True,
+    )
+    db_session.add(other_author)
+    db_session.commit()
+    return other_author
+
+
+def test_list_posts_filters_by_category_and_author(api_client, db_session, posts, other_author):
+    """Ensure posts can be filtered by category and author together."""
+    science = Category(name="Science", description="Science", is_active=True)
+    posts[1].categories.append(science)
+    foreign_post = Post(title="Other", summary="Other", content="Other", slug="other",
+                        author=other_author, categories=[science])
+    db_session.add_all([science, foreign_post])
+    db_session.commit()
+
+    by_category = api_client.get("/posts/", params={"category": science.id}).json()["items"]
+    by_both = api_client.get("/posts/", params={"category": science.id, "author": other_author.id}).json()["items"]
+
+    assert [item["slug"] for item in by_category] == ["post-2", "other"]
+    assert [item["slug"] for item in by_both] == ["other"]
+    assert [category["name"] for category in by_category[0]["categories"]] == ["Technologie", "Science"]
+
+
+def test_list_posts_filter_keeps_cursor_links(api_client, posts):
+    """Ensure next links carry the filters to the following pages."""
+    category_id = posts[0].categories[0].id
+
+    body = api_client.get("/posts/", params={"category": category_id, "limit": 2}).json()
+
+    assert f"category={category_id}" in body["next"]
+    assert len(api_client.get(body["next"]).json()["items"]) == 2
+
+
+@pytest.mark.parametrize("stream", ["json", "ndjson"])
+def test_list_posts_streams_every_match(api_client, posts, stream):
+    """Ensure the streaming mode returns the same items as the paginated mode."""
+    paginated = api_client.get("/posts/", params={"limit": 100}).json()["items"]
+
+    response = api_client.get("/posts/", params={"stream": stream})
+
+    assert response.status_code == HTTPStatus.OK
+    if stream == "json":
+        assert response.headers["content-type"] == "application/json"
+        streamed = response.json()
+    else:
+        assert response.headers["content-type"] == "application/x-ndjson"
+        streamed = [json.loads(line) for line in response.text.splitlines()]
+    assert streamed == paginated
+
+
+def test_list_posts_stream_honours_filters_and_cursor(api_client, posts, other_author):
+    """Ensure filters, cursor and an explicit limit apply to the stream."""
+    cursor = api_client.get("/posts/", params={"limit": 1}).json()["next_cursor"]
+
+    streamed = api_client.get("/posts/", params={
+        "stream": "json", "cursor": cursor, "limit": 2, "author": posts[0].author_id,
+    }).json()
+    foreign = api_client.get("/posts/", params={"stream": "json", "author": other_author.id}).json()
+
+    assert [item["slug"] for item in streamed] == ["post-2", "post-3"]
+    assert foreign == []
+
+
+def test_list_posts_stream_of_nothing_is_valid_json(api_client):
+    """Ensure an empty stream still encodes an empty JSON array."""
+    assert api_client.get("/posts/", params={"stream": "json"}).json() == []
+
+
+@pytest.fixture
+def science(db_session):
+    science = Category(name="Science", description="Science", is_active=True)
+    db_session.add(science)
+    db_session.commit()
+    return science
+
+
+def category_names(response) -> list:
+    return [category["name"] for category in response.json()["categories"]]
+
+
+def test_update_post_with_list_adds_categories(api_client, posts, science):
+    """Ensure a plain list of ids is added to the categories the post already has."""
+    response = api_client.patch(f"/posts/{posts[0].id}", json={"categories": [science.id]})
+
+    assert response.status_code == HTTPStatus.OK
+    assert category_names(response) == ["Technologie", "Science"]
+    assert category_names(api_client.get(f"/posts/{posts[0].id}")) == ["Technologie", "Science"]
+
+
+def test_update_post_removes_and_replaces_categories(api_client, posts, science):
+    """Ensure categories can be removed or replaced explicitly."""
+    technologie = posts[0].categories[0].id
+
+    removed = api_client.patch(f"/posts/{posts[0].id}", json={"categories": {"remove": [technologie]}})
+    replaced = api_client.patch(f"/posts/{posts[1].id}", json={"categories": {"replace": [science.id]}})
+
+    assert category_names(removed) == []
+    assert category_names(replaced) == ["Science"]
+    assert category_names(api_client.get(f"/posts/{posts[1].id}")) == ["Science"]
+
+
+def test_update_post_rejects_replace_with_add(api_client, posts, science):
+    """Ensure replace cannot be mixed with add or remove."""
+    response = api_client.patch(f"/posts/{posts[0].id}", json={
+        "categories": {"add": [science.id], "replace": [science.id]},
+    })
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_update_post_writes_only_changed_memberships(api_client, posts, science, query_counter):
+    """Ensure unchanged association rows are neither deleted nor re-inserted."""
+    technologie = posts[0].categories[0].id
+
+    api_client.patch(f"/posts/{posts[0].id}", json={"categories": {"add": [science.id, technologie]}})
+
+    association = [statement for statement in query_counter if "post_category" in statement and "SELECT" not in statement]
+    assert association == ["INSERT INTO post_category (post_id, category_id) VALUES (?, ?)"]
+
+
+def test_update_post_without_changes_keeps_version(api_client, posts, query_counter):
+    """Ensure a PATCH restating the current values leaves the version and validators as they were."""
+    before = api_client.get(f"/posts/{posts[1].id}")
+    title = before.json()["title"]
+    query_counter.clear()
+
+    response = api_client.patch(f"/posts/{posts[1].id}", json={"title": title, "categories": []})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["version"] == before.json()["version"]
+    assert not [statement for statement in query_counter if statement.startswith(("UPDATE", "INSERT", "DELETE"))]
+    assert api_client.get(f"/posts/{posts[1].id}", headers={"If-None-Match": before.headers["ETag"]}).status_code == HTTPStatus.NOT_MODIFIED
+
+    response = api_client.patch(f"/posts/{posts[1].id}", json={"title": "Renamed"})
+    assert response.json()["version"] == before.json()["version"] + 1
@@ -0,0 +1,128 @@
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import event
+
+from app.main import app
+from app.users.auth import current_active_user
+from app.users.models import User
+
+
+@pytest.fixture
+def token_client(api_client):
+    """Returns the API client authenticating with real bearer tokens."""
+    app.dependency_overrides.pop(current_active_user)
+    return api_client
+
+
+@pytest.fixture
+def admin(db_session):
+    admin = User(
+        username="admin@gmail.com",
+        email="admin@gmail.com",
+        hashed_password="hashed_password",
+        is_active=True,
+        is_superuser=True,
+    )
+    db_session.add(admin)
+    db_session.commit()
+    return admin
+
+
+def user_queries(statements):
+    return [statement for statement in statements if 'FROM user' in statement]
+
+
+def test_token_resolves_user_once(token_client, author, query_counter, issue_token):
+    """Ensure a token is checked against the database once, then served from the cache."""
+    headers = {"Authorization": f"Bearer {issue_token(author)}"}
+
+    assert token_client.get("/categories/", headers=headers).status_code == HTTPStatus.OK
+    assert token_client.get("/categories/", headers=headers).status_code == HTTPStatus.OK
+
+    queries = user_queries(query_counter)
+    assert len(queries) == 1
+    assert "hashed_password" not in queries[0]
+
+
+@pytest.mark.parametrize("token", [None, "not-a-token"])
+def test_invalid_token_is_unauthorized(token_client, jwt_secret, token):
+    """Ensure requests without a valid token are rejected."""
+    headers = {} if token is None else {"Authorization": f"Bearer {token}"}
+
+    assert token_client.get("/categories/", headers=headers).status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_created_post_belongs_to_token_user(token_client, author, issue_token):
+    """Ensure writes reference the cached user without inserting it again."""
+    headers = {"Authorization": f"Bearer {issue_token(author)}"}
+    post = {"title": "Title", "summary": "Summary", "content": "Content", "slug": "title", "categories": []}
+
+    response = token_client.post("/posts/", json=post, headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["author"]["id"] == author.id
+
+
+def test_deactivated_user_is_rejected_immediately(token_client, author, admin, issue_token):
+    """Ensure deactivating a user through the users router drops their cached tokens."""
+    headers = {"Authorization": f"Bearer {issue_token(author)}"}
+    admin_headers = {"Authorization": f"Bearer {issue_token(admin)}"}
+    assert token_client.get("/categories/", headers=headers).status_code == HTTPStatus.OK
+
+    deactivate = token_client.patch(f"/users/{author.id}", json={"is_active": False}, headers=admin_headers)
+
+    assert deactivate.status_code == HTTPStatus.OK
+    assert token_client.get("/categories/", headers=headers).status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_profile_change_refreshes_authored_posts(token_client, author, admin, issue_token):
+    """Ensure a post embedding its author gets a new ETag and payload when the author's profile changes."""
+    headers = {"Authorization": f"Bearer {issue_token(author)}"}
+    post = token_client.post("/posts/", json={
+        "title": "Title", "summary": "Summary", "content": "Content", "slug": "post", "categories": [],
+    }, headers=headers).json()
+    etag = token_client.get(f"/posts/{post['id']}").headers["ETag"]
+
+    admin_headers = {"Authorization": f"Bearer {issue_token(admin)}"}
+    token_client.patch(f"/users/{author.id}", json={"email": "writer@gmail.com"}, headers=admin_headers)
+    response = token_client.get(f"/posts/{post['id']}", headers={"If-None-Match": etag})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["author"]["email"] == "writer@gmail.com"
+
+
+def test_password_change_drops_cached_user(token_client, author, query_counter, issue_token):
+    """Ensure changing a password forces the next request back to the database."""
+    headers = {"Authorization": f"Bearer {issue_token(author)}"}
+    token_client.get("/categories/", headers=headers)
+
+    changed = token_client.patch("/users/me", json={"password": "new-password"}, headers=headers)
+    query_counter.clear()
+    token_client.get("/categories/", headers=headers)
+
+    assert changed.status_code == HTTPStatus.OK
+    assert len(user_queries(query_counter)) == 1
+
+
+def test_authenticated_read_holds_one_connection(token_client, author, database, issue_token):
+    """Ensure the user is loaded and released before the endpoint opens its own session."""
+    headers = {"Authorization": f"Bearer {issue_token(author)}"}
+    pool = database.get_async_engine().sync_engine.pool
+    connections = {"open": 0, "peak": 0}
+
+    def checkout(*args):
+        connections["open"] += 1
+        connections["peak"] = max(connections["peak"], connections["open"])
+
+    def checkin(*args):
+        connections["open"] -= 1
+
+    event.listen(pool, "checkout", checkout)
+    event.listen(pool, "checkin", checkin)
+    response = token_client.get("/categories/", headers=headers)
+    event.remove(pool, "checkout", checkout)
+    event.remove(pool, "checkin", checkin)
+
+    assert response.status_code == HTTPStatus.OK
+    assert connections["peak"] == 1
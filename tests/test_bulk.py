@@ -0,0 +1,108 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+
+from app.posts.bulk import read_ndjson_lines
+from app.posts.models import Post
+
+
+def ndjson(*rows):
+    return "\n".join(row if isinstance(row, str) else json.dumps(row) for row in rows) + "\n"
+
+
+def post_row(number, categories=()):
+    return {
+        "title": f"Imported {number}",
+        "summary": "Summary",
+        "content": "Content",
+        "slug": f"imported-{number}",
+        "categories": list(categories),
+    }
+
+
+def test_read_ndjson_lines_handles_split_chunks():
+    """Ensure lines split across body chunks are reassembled."""
+    async def chunks():
+        for chunk in (b'{"a": 1}\n{"b"', b': 2}\n\n{"c": 3}'):
+            yield chunk
+
+    async def collect():
+        return [line async for line in read_ndjson_lines(chunks())]
+
+    assert asyncio.run(collect()) == [(1, b'{"a": 1}'), (2, b'{"b": 2}'), (4, b'{"c": 3}')]
+
+
+def test_bulk_import_inserts_posts_in_chunks(api_client, categories, query_counter, db_session):
+    """Ensure posts are inserted in chunks with one category lookup per chunk."""
+    python, databases, _ = categories
+    body = ndjson(*(post_row(number, [python.id, databases.id]) for number in range(5)))
+
+    response = api_client.post(
+        "/posts/bulk", params={"chunk_size": 2}, content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {"inserted": 5, "failed": 0, "errors": []}
+    assert len([statement for statement in query_counter if statement.startswith("SELECT categories.id")]) == 3
+    posts = db_session.query(Post).order_by(Post.id).all()
+    assert [post.slug for post in posts] == [f"imported-{number}" for number in range(5)]
+    db_session.refresh(posts[0], ["categories"])
+    assert {category.name for category in posts[0].categories} == {"Python", "Databases"}
+
+
+def test_bulk_import_reports_row_errors(api_client, categories, db_session):
+    """Ensure invalid rows are reported by line while valid rows are kept."""
+    body = ndjson(
+        post_row(1),
+        "{not json",
+        post_row(1),
+        post_row(2, [999]),
+        {"title": "No slug"},
+        post_row(3, [categories[0].id]),
+    )
+
+    response = api_client.post("/posts/bulk", content=body)
+
+    result = response.json()
+    assert result["inserted"] == 2
+    assert result["failed"] == 4
+    assert [error["line"] for error in result["errors"]] == [2, 5, 3, 4]
+    assert "already exists" in result["errors"][2]["error"]
+    assert "unknown ids [999]" in result["errors"][3]["error"]
+    assert db_session.query(Post).count() == 2
+
+
+def test_bulk_imported_posts_are_searchable(api_client, categories):
+    """Ensure bulk imported posts reach the search index."""
+    api_client.get("/posts/search", params={"q": "warmup"})
+
+    api_client.post("/posts/bulk", content=ndjson(post_row(7)))
+
+    assert [item["slug"] for item in api_client.get("/posts/search", params={"q": "imported"}).json()["items"]] == ["imported-7"]
+
+
+def test_export_streams_ndjson(api_client, categories):
+    """Ensure the export round-trips what the bulk import accepts."""
+    python, databases, _ = categories
+    api_client.post("/posts/bulk", content=ndjson(post_row(1, [databases.id, python.id]), post_row(2)))
+
+    response = api_client.get("/posts/export")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["slug"] for row in rows] == ["imported-1", "imported-2"]
+    assert rows[0]["categories"] == sorted([python.id, databases.id])
+    assert rows[1]["categories"] == []
+
+
+def test_export_streams_json_array(api_client, categories):
+    """Ensure the export can also be streamed as one JSON array."""
+    api_client.post("/posts/bulk", content=ndjson(post_row(1), post_row(2)))
+
+    response = api_client.get("/posts/export", params={"stream": "json"})
+
+    assert [row["slug"] for row in response.json()] == ["imported-1", "imported-2"]
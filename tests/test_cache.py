@@ -0,0 +1,136 @@
+import asyncio
+from http import HTTPStatus
+
+from app.cache.backends import MemoryBackend, RedisBackend
+from app.cache.cache import ReadThroughCache, category_key, post_key
+
+
+def test_memory_backend_evicts_least_recently_used():
+    """Ensure the in-process backend keeps at most ``max_entries`` entries."""
+    backend = MemoryBackend(max_entries=2)
+
+    async def scenario():
+        await backend.set("a", b"1", 60)
+        await backend.set("b", b"2", 60)
+        await backend.get("a")
+        await backend.set("c", b"3", 60)
+        return [await backend.get(key) for key in ("a", "b", "c")]
+
+    assert asyncio.run(scenario()) == [b"1", None, b"3"]
+
+
+def test_memory_backend_expires_entries(clock):
+    """Ensure entries are dropped once their TTL has elapsed."""
+    backend = MemoryBackend(clock=clock)
+
+    async def scenario():
+        await backend.set("a", b"1", 10)
+        clock.now = 9
+        fresh = await backend.get("a")
+        clock.now = 10
+        return fresh, await backend.get("a")
+
+    assert asyncio.run(scenario()) == (b"1", None)
+    assert len(backend) == 0
+
+
+def test_redis_backend_prefixes_keys_and_sets_expiry(fake_redis):
+    """Ensure the redis backend namespaces keys and passes the TTL in seconds."""
+    backend = RedisBackend(fake_redis)
+
+    async def scenario():
+        await backend.set("post:id:1", b"{}", 2.5)
+        expirations = dict(fake_redis.expirations)
+        value = await backend.get("post:id:1")
+        await backend.delete("post:id:1")
+        return expirations, value, await backend.get("post:id:1")
+
+    assert asyncio.run(scenario()) == ({"weblog:post:id:1": 3}, b"{}", None)
+
+
+def test_read_through_cache_coalesces_concurrent_misses(fake_redis):
+    """Ensure concurrent misses on one key run the loader only once."""
+    cache = ReadThroughCache(RedisBackend(fake_redis), ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"id": 1}
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_or_load("post:id:1", loader) for _ in range(10)))
+
+    results = asyncio.run(scenario())
+
+    assert results == [{"id": 1}] * 10
+    assert len(calls) == 1
+    assert fake_redis.data == {"weblog:post:id:1": b'{"id": 1}'}
+
+
+def test_read_through_cache_does_not_store_stale_loads(cache):
+    """Ensure an invalidation during a load keeps the loaded value out of the cache."""
+    async def scenario():
+        async def loader():
+            await cache.invalidate("post:id:1")
+            return {"id": 1}
+
+        await cache.get_or_load("post:id:1", loader)
+        return await cache.backend.get("post:id:1")
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_get_post_is_served_from_cache(api_client, seeded_post, query_counter):
+    """Ensure a cached post does not hit the database again."""
+    first = api_client.get(f"/posts/{seeded_post.id}")
+    queries = len(query_counter)
+    second = api_client.get(f"/posts/{seeded_post.id}")
+
+    assert first.json() == second.json()
+    assert len(query_counter) == queries
+
+
+def test_update_post_invalidates_cached_post(api_client, seeded_post, cache):
+    """Ensure a post update is visible on the next read."""
+    api_client.get(f"/posts/{seeded_post.id}")
+
+    api_client.patch(f"/posts/{seeded_post.id}", json={"title": "Updated", "categories": []})
+
+    assert api_client.get(f"/posts/{seeded_post.id}").json()["title"] == "Updated"
+
+
+def test_delete_post_invalidates_cached_post(api_client, seeded_post, cache):
+    """Ensure a deleted post is no longer served from the cache."""
+    api_client.get(f"/posts/{seeded_post.id}")
+
+    api_client.delete(f"/posts/{seeded_post.id}")
+
+    assert api_client.get(f"/posts/{seeded_post.id}").status_code == HTTPStatus.NOT_FOUND
+    assert asyncio.run(cache.backend.get(post_key(seeded_post.id))) is None
+
+
+def test_category_writes_invalidate_listing_and_posts(api_client, seeded_post, cache):
+    """Ensure renaming a category refreshes the listing and the posts embedding it."""
+    category_id = seeded_post.categories[0].id
+    api_client.get("/categories/")
+    api_client.get(f"/categories/{category_id}")
+    api_client.get(f"/posts/{seeded_post.id}")
+
+    api_client.patch(f"/categories/{category_id}", json={"name": "Science"})
+
+    assert api_client.get("/categories/").json()[0]["name"] == "Science"
+    assert api_client.get(f"/categories/{category_id}").json()["name"] == "Science"
+    assert api_client.get(f"/posts/{seeded_post.id}").json()["categories"][0]["name"] == "Science"
+
+
+def test_delete_category_detaches_posts(api_client, seeded_post, cache):
+    """Ensure deleting a category removes it from cached posts."""
+    category_id = seeded_post.categories[0].id
+    api_client.get(f"/posts/{seeded_post.id}")
+
+    api_client.delete(f"/categories/{category_id}")
+
+    assert api_client.get(f"/posts/{seeded_post.id}").json()["categories"] == []
+    assert asyncio.run(cache.backend.get(category_key(category_id))) is None
+    assert api_client.get("/categories/").json() == []
@@ -0,0 +1,168 @@
+import asyncio
+import gzip
+import json
+from http import HTTPStatus
+
+import pytest
+
+from app.cache.cache import post_key, variant_key
+from app.compression import negotiate
+from app.posts.models import Post
+
+
+@pytest.fixture
+def long_post(db_session, author):
+    post = Post(
+        title="A long article",
+        summary="Summary",
+        content="Compressible paragraph. " * 400,
+        slug="long-article",
+        author=author,
+        categories=[],
+    )
+    db_session.add(post)
+    db_session.commit()
+    return post
+
+
+@pytest.fixture
+def compress_calls(monkeypatch):
+    calls = []
+    import app.posts.cache as post_cache
+    original = post_cache.compress
+
+    def counting_compress(body, encoding):
+        calls.append(encoding)
+        return original(body, encoding)
+
+    monkeypatch.setattr(post_cache, "compress", counting_compress)
+    return calls
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("gzip, deflate", "gzip"),
+    ("gzip;q=0, deflate", None),
+    ("identity", None),
+    ("*", "gzip"),
+    ("", None),
+])
+def test_negotiate(accept_encoding, expected):
+    """Ensure the encoding follows Accept-Encoding preferences."""
+    assert negotiate(accept_encoding) == expected
+
+
+def test_large_posts_are_served_precompressed(api_client, long_post, cache, compress_calls):
+    """Ensure a cached post is compressed once and then reused."""
+    first = api_client.get(f"/posts/{long_post.id}", headers={"Accept-Encoding": "gzip"})
+    second = api_client.get(f"/posts/{long_post.id}", headers={"Accept-Encoding": "gzip"})
+
+    assert first.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in first.headers["Vary"]
+    assert first.headers["ETag"] == f'"post-{long_post.id}-v1-gzip"'
+    assert first.json() == second.json()
+    assert first.json()["content"] == long_post.content
+    assert compress_calls == ["gzip"]
+    stored = asyncio.run(cache.get_variant(post_key(long_post.id), "gzip", f'"post-{long_post.id}-v1"'))
+    assert json.loads(gzip.decompress(stored)) == first.json()
+
+
+def test_each_encoding_has_its_own_etag(api_client, long_post):
+    """Ensure encoded bodies get distinct ETags, any of which validates, and 304s vary on encoding."""
+    url = f"/posts/{long_post.id}"
+    identity = api_client.get(url, headers={"Accept-Encoding": "identity"})
+    gzipped = api_client.get(url, headers={"Accept-Encoding": "gzip"})
+
+    assert identity.headers["ETag"] == f'"post-{long_post.id}-v1"'
+    assert gzipped.headers["ETag"] == f'"post-{long_post.id}-v1-gzip"'
+    assert "Accept-Encoding" in identity.headers["Vary"]
+
+    revalidated = api_client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["ETag"]})
+    assert revalidated.status_code == HTTPStatus.NOT_MODIFIED
+    assert revalidated.headers["ETag"] == gzipped.headers["ETag"]
+    assert "Accept-Encoding" in revalidated.headers["Vary"]
+
+    revalidated = api_client.get(url, headers={"Accept-Encoding": "identity", "If-None-Match": identity.headers["ETag"]})
+    assert revalidated.status_code == HTTPStatus.NOT_MODIFIED
+    assert revalidated.headers["ETag"] == identity.headers["ETag"]
+
+
+def test_middleware_tags_compressed_bodies(api_client, db_session, author):
+    """Ensure bodies compressed on the fly do not reuse the identity ETag."""
+    db_session.add_all(
+        Post(title=f"Post {number}", summary="Summary " * 20, content="", slug=f"post-{number}", author=author)
+        for number in range(20)
+    )
+    db_session.commit()
+    identity = api_client.get("/posts/", headers={"Accept-Encoding": "identity"})
+    gzipped = api_client.get("/posts/", headers={"Accept-Encoding": "gzip"})
+
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert gzipped.headers["ETag"] == identity.headers["ETag"][:-1] + '-gzip"'
+    revalidated = api_client.get("/posts/", headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["ETag"]})
+    assert revalidated.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_post_update_drops_compressed_variant(api_client, long_post, cache):
+    """Ensure a post update removes its pre-compressed variant."""
+    api_client.get(f"/posts/{long_post.id}", headers={"Accept-Encoding": "gzip"})
+
+    api_client.patch(f"/posts/{long_post.id}", json={"title": "Renamed", "categories": []})
+
+    assert asyncio.run(cache.backend.get(variant_key(post_key(long_post.id), "gzip"))) is None
+    response = api_client.get(f"/posts/{long_post.id}", headers={"Accept-Encoding": "gzip"})
+    assert response.json()["title"] == "Renamed"
+
+
+def test_small_responses_are_not_compressed(api_client, long_post):
+    """Ensure bodies below the threshold are sent as is."""
+    response = api_client.get("/healthcheck", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == HTTPStatus.OK
+    assert "Content-Encoding" not in response.headers
+
+
+def test_small_posts_are_measured_once(api_client, db_session, author, monkeypatch):
+    """Ensure a post below the threshold is not serialised again on every request to learn it is small."""
+    post = Post(title="Short", summary="Summary", content="Short", slug="short", author=author, categories=[])
+    db_session.add(post)
+    db_session.commit()
+    import app.posts.cache as post_cache
+    calls = []
+    original = post_cache.dump_json
+    monkeypatch.setattr(post_cache, "dump_json", lambda payload: calls.append(payload) or original(payload))
+
+    responses = [api_client.get(f"/posts/{post.id}", headers={"Accept-Encoding": "gzip"}) for _ in range(3)]
+
+    assert ["Content-Encoding" in response.headers for response in responses] == [False] * 3
+    assert len(calls) == 1
+
+
+def test_identity_clients_get_uncompressed_posts(api_client, long_post):
+    """Ensure clients not accepting gzip get the plain body."""
+    response = api_client.get(f"/posts/{long_post.id}", headers={"Accept-Encoding": "identity"})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.json()["content"] == long_post.content
+
+
+def test_streamed_responses_are_compressed_incrementally(api_client, long_post):
+    """Ensure the middleware compresses streamed bodies without a Content-Length."""
+    response = api_client.get("/posts/export", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert json.loads(response.text.splitlines()[0])["content"] == long_post.content
+
+
+def test_large_listings_are_compressed_by_middleware(api_client, long_post, db_session, author):
+    """Ensure non-cached JSON responses above the threshold are compressed on the fly."""
+    db_session.add_all(
+        Post(title=f"Post {number}", summary="Summary " * 20, content="", slug=f"post-{number}", author=author)
+        for number in range(20)
+    )
+    db_session.commit()
+
+    response = api_client.get("/posts/", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert len(response.json()["items"]) == 20
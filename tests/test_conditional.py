@@ -0,0 +1,71 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+
+from app.cache.cache import post_key
+
+
+def test_get_post_sends_validators(api_client, seeded_post):
+    """Ensure single posts carry a strong ETag and Last-Modified."""
+    response = api_client.get(f"/posts/{seeded_post.id}")
+
+    assert response.headers["ETag"] == f'"post-{seeded_post.id}-v1"'
+    assert response.headers["Last-Modified"].endswith("GMT")
+
+
+def test_get_post_answers_304_from_version_column(api_client, seeded_post, cache, query_counter):
+    """Ensure a matching If-None-Match on a cache miss only reads the version column."""
+    etag = api_client.get(f"/posts/{seeded_post.id}").headers["ETag"]
+    asyncio.run(cache.invalidate(post_key(seeded_post.id)))
+    query_counter.clear()
+
+    response = api_client.get(f"/posts/{seeded_post.id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert len(query_counter) == 1
+    assert query_counter[0].startswith("SELECT posts.id, posts.version, posts.updated_at")
+
+
+def test_get_post_honours_if_modified_since(api_client, seeded_post):
+    """Ensure If-Modified-Since returns 304 until the post changes."""
+    last_modified = api_client.get(f"/posts/{seeded_post.id}").headers["Last-Modified"]
+
+    response = api_client.get(f"/posts/{seeded_post.id}", headers={"If-Modified-Since": last_modified})
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_post_update_changes_etag(api_client, seeded_post):
+    """Ensure an update, even of categories only, invalidates the previous ETag."""
+    etag = api_client.get(f"/posts/{seeded_post.id}").headers["ETag"]
+
+    api_client.patch(f"/posts/{seeded_post.id}", json={"categories": {"remove": [seeded_post.categories[0].id]}})
+    response = api_client.get(f"/posts/{seeded_post.id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"] != etag
+
+
+def test_category_rename_changes_post_etag(api_client, seeded_post):
+    """Ensure posts embedding a renamed category get a new ETag."""
+    etag = api_client.get(f"/posts/{seeded_post.id}").headers["ETag"]
+
+    api_client.patch(f"/categories/{seeded_post.categories[0].id}", json={"name": "Tech"})
+    response = api_client.get(f"/posts/{seeded_post.id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["categories"][0]["name"] == "Tech"
+
+
+@pytest.mark.parametrize("path", ["/posts/", "/categories/", "/categories/{category_id}"])
+def test_read_endpoints_answer_304(api_client, seeded_post, path):
+    """Ensure listings and categories support conditional requests."""
+    url = path.format(category_id=seeded_post.categories[0].id)
+    etag = api_client.get(url).headers["ETag"]
+
+    response = api_client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
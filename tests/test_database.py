@@ -0,0 +1,132 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.settings.database import (MYSQL_SESSION_SETUP, DatabaseManager,
+                                   PoolMetrics, TimedQueuePool,
+                                   setup_mysql_session)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    database = tmp_path / "weblog.db"
+    manager = DatabaseManager(
+        urls={"sync": f"sqlite:///{database}", "async": f"sqlite+aiosqlite:///{database}"},
+        pool={"pool_size": 2, "max_overflow": 0, "pool_recycle": 60, "pool_pre_ping": True, "pool_timeout": 1},
+        echo=False,
+    )
+    yield manager
+    asyncio.run(manager.dispose())
+
+
+def test_engines_are_created_once(manager):
+    """Ensure every caller shares the same engines and session factory."""
+    assert manager.get_sync_engine() is manager.get_sync_engine()
+    assert manager.get_async_engine() is manager.get_async_engine()
+    assert manager.async_session_maker() is manager.async_session_maker()
+
+
+def test_pool_settings_are_applied(manager):
+    """Ensure the configured pool parameters reach the engine pool."""
+    pool = manager.get_sync_engine().pool
+
+    assert pool.size() == 2
+    assert pool._max_overflow == 0
+    assert pool._recycle == 60
+    assert pool._pre_ping is True
+    assert pool._timeout == 1
+
+
+def test_dispose_drops_engines(manager):
+    """Ensure dispose releases the engines so a new one is built afterwards."""
+    engine = manager.get_async_engine()
+    asyncio.run(manager.dispose())
+
+    assert manager.get_async_engine() is not engine
+
+
+def test_pool_metrics_count_checkouts(manager):
+    """Ensure pool checkouts and waits are recorded."""
+    async def run_queries():
+        async with manager.async_session_maker()() as session:
+            await session.execute(text("SELECT 1"))
+        async with manager.async_session_maker()() as session:
+            await session.execute(text("SELECT 1"))
+
+    asyncio.run(run_queries())
+    status = manager.pool_status()["async"]
+
+    assert status["checkouts"] == 2
+    assert status["checkins"] == 2
+    assert status["connects"] == 1
+    assert status["wait_count"] == 2
+    assert status["checked_out"] == 0
+    assert status["size"] == 2
+
+
+def test_pool_wait_excludes_connecting():
+    """Ensure opening a connection is not counted as waiting, while queueing for a busy one is."""
+    def slow_connect():
+        time.sleep(0.2)
+        return sqlite3.connect(":memory:")
+
+    pool = TimedQueuePool(slow_connect, pool_size=1, max_overflow=0, timeout=0.1)
+    pool.metrics = PoolMetrics()
+
+    held = pool.connect()
+    assert pool.metrics.wait_total < 0.1
+
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+    assert pool.metrics.wait_max >= 0.1
+    assert pool.metrics.timeouts == 1
+    held.close()
+    pool.dispose()
+
+
+def test_warm_up_fills_the_pool(manager):
+    """Ensure warmup leaves ``pool_size`` open connections checked in."""
+    asyncio.run(manager.warm_up())
+    status = manager.pool_status()["async"]
+
+    assert status["connects"] == 2
+    assert status["checked_in"] == 2
+    assert status["checked_out"] == 0
+
+
+def test_forked_worker_builds_its_own_engines(manager):
+    """Ensure startup in another process replaces the engines it inherited."""
+    engine = manager.get_async_engine()
+    manager._pid = -1
+
+    asyncio.run(manager.startup())
+
+    assert manager.get_async_engine() is not engine
+
+
+def test_mysql_connections_lift_the_group_concat_limit():
+    """Ensure MySQL connections raise group_concat_max_len so category id lists are not truncated."""
+    manager = DatabaseManager(urls={"sync": "mysql+pymysql://weblog@db/weblog", "async": "mysql+aiomysql://weblog@db/weblog"})
+    executed = []
+
+    class Cursor:
+        def execute(self, statement):
+            executed.append(statement)
+
+        def close(self):
+            pass
+
+    class Connection:
+        def cursor(self):
+            return Cursor()
+
+    setup_mysql_session(Connection(), None)
+
+    assert executed == [MYSQL_SESSION_SETUP]
+    assert event.contains(manager.get_async_engine().sync_engine, "connect", setup_mysql_session)
+    assert event.contains(manager.get_sync_engine(), "connect", setup_mysql_session)
+    asyncio.run(manager.dispose())
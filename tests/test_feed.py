@@ -0,0 +1,120 @@
+from http import HTTPStatus
+
+
+def feed_slugs(client, url="/feed/"):
+    return [entry["slug"] for entry in client.get(url).json()["items"]]
+
+
+def test_feed_lists_published_posts_newest_first(api_client, categories, create_post):
+    """Ensure drafts stay out of the feed and entries carry author and categories."""
+    create_post("first", categories[:2])
+    draft = create_post("draft", status="draft")
+    create_post("second")
+
+    response = api_client.get("/feed/")
+
+    assert response.status_code == HTTPStatus.OK
+    items = response.json()["items"]
+    assert [item["slug"] for item in items] == ["second", "first"]
+    assert items[1]["author"]["username"] == "author@gmail.com"
+    assert [category["name"] for category in items[1]["categories"]] == ["Python", "Databases"]
+    assert draft["status"] == "draft" and draft["published_at"] is None
+
+
+def test_feed_is_paginated_by_cursor(api_client, create_post):
+    """Ensure the next page continues after the last entry of the previous one."""
+    for number in range(5):
+        create_post(f"post-{number}")
+
+    first = api_client.get("/feed/", params={"limit": 2}).json()
+    second = api_client.get("/feed/", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+
+    assert [item["slug"] for item in first["items"]] == ["post-4", "post-3"]
+    assert [item["slug"] for item in second["items"]] == ["post-2", "post-1"]
+    assert api_client.get("/feed/", params={"cursor": "not-a-cursor"}).status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_category_feed_is_one_query(api_client, categories, query_counter, create_post):
+    """Ensure a category feed only holds that category's posts and is read in a single statement."""
+    create_post("python", categories[:1])
+    create_post("databases", categories[1:2])
+    query_counter.clear()
+
+    assert feed_slugs(api_client, f"/feed/categories/{categories[1].id}") == ["databases"]
+    assert len(query_counter) == 1
+
+
+def test_feed_follows_post_updates(api_client, categories, create_post):
+    """Ensure publishing, editing, unpublishing and deleting refresh the feed entry."""
+    draft = create_post("draft", status="draft")
+
+    published = api_client.patch(f"/posts/{draft['id']}", json={"status": "published", "title": "Now public"}).json()
+    assert published["published_at"] is not None
+    assert [item["title"] for item in api_client.get("/feed/").json()["items"]] == ["Now public"]
+
+    api_client.patch(f"/posts/{draft['id']}", json={"categories": {"add": [categories[0].id]}})
+    assert feed_slugs(api_client, f"/feed/categories/{categories[0].id}") == ["draft"]
+
+    api_client.patch(f"/posts/{draft['id']}", json={"status": "draft"})
+    assert feed_slugs(api_client) == []
+    assert feed_slugs(api_client, f"/feed/categories/{categories[0].id}") == []
+
+    kept = create_post("kept")
+    api_client.delete(f"/posts/{kept['id']}")
+    assert feed_slugs(api_client) == []
+
+
+def test_feed_follows_category_renames_and_deletes(api_client, categories, create_post):
+    """Ensure category changes are written through to the embedded category names."""
+    create_post("post", categories[:2])
+
+    api_client.patch(f"/categories/{categories[0].id}", json={"name": "Tech"})
+    assert [category["name"] for category in api_client.get("/feed/").json()["items"][0]["categories"]] == ["Tech", "Databases"]
+
+    api_client.delete(f"/categories/{categories[1].id}")
+    assert [category["name"] for category in api_client.get("/feed/").json()["items"][0]["categories"]] == ["Tech"]
+    assert feed_slugs(api_client, f"/feed/categories/{categories[1].id}") == []
+
+
+def test_drafts_are_hidden_from_public_reads(api_client, categories, create_post):
+    """Ensure a draft is not served by id, slug, listing or search until it is published."""
+    api_client.get("/posts/search", params={"q": "title"})
+    draft = create_post("draft", categories[:2], status="draft")
+
+    assert api_client.get(f"/posts/{draft['id']}").status_code == HTTPStatus.NOT_FOUND
+    assert api_client.get("/posts/by-slug/draft").status_code == HTTPStatus.NOT_FOUND
+    assert api_client.get("/posts/by-slug", params={"slug": ["draft"]}).json() == []
+    assert api_client.get("/posts/").json()["items"] == []
+    assert api_client.get("/posts/", params={"category": categories[0].id}).json()["items"] == []
+    assert api_client.get("/posts/search", params={"q": "title"}).json()["items"] == []
+
+    api_client.patch(f"/posts/{draft['id']}", json={"status": "published"})
+    assert api_client.get(f"/posts/{draft['id']}").status_code == HTTPStatus.OK
+    assert [item["slug"] for item in api_client.get("/posts/search", params={"q": "title"}).json()["items"]] == ["draft"]
+
+    api_client.patch(f"/posts/{draft['id']}", json={"status": "draft"})
+    assert api_client.get(f"/posts/{draft['id']}").status_code == HTTPStatus.NOT_FOUND
+    assert api_client.get("/posts/search", params={"q": "title"}).json()["items"] == []
+
+
+def test_bulk_import_publishes_to_feed(api_client, categories):
+    """Ensure imported posts get feed entries, except drafts."""
+    body = "\n".join([
+        f'{{"title": "A", "summary": "S", "content": "C", "slug": "a", "categories": [{categories[0].id}]}}',
+        '{"title": "B", "summary": "S", "content": "C", "slug": "b", "categories": [], "status": "draft"}',
+    ])
+
+    assert api_client.post("/posts/bulk", content=body).json()["inserted"] == 2
+    assert feed_slugs(api_client) == ["a"]
+    assert feed_slugs(api_client, f"/feed/categories/{categories[0].id}") == ["a"]
+
+
+def test_feed_answers_conditional_requests(api_client, create_post):
+    """Ensure an unchanged feed page is answered with 304."""
+    create_post("post")
+    etag = api_client.get("/feed/").headers["ETag"]
+
+    assert api_client.get("/feed/", headers={"If-None-Match": etag}).status_code == HTTPStatus.NOT_MODIFIED
+    create_post("newer")
+    assert api_client.get("/feed/", headers={"If-None-Match": etag}).status_code == HTTPStatus.OK
+
@@ -0,0 +1,102 @@
+import logging
+import re
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import text
+
+from app import metrics
+from app.instrumentation import RequestMetrics, RequestStats, request_metrics
+from app.posts.models import Category
+from app.settings.database import DatabaseManager
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    request_metrics.reset()
+    yield
+    request_metrics.reset()
+
+
+@pytest.fixture
+def metrics_token(monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "scraper-token")
+    return {"Authorization": "Bearer scraper-token"}
+
+
+@pytest.fixture
+def category(db_session):
+    category = Category(name="Technologie", description="Everything about tech world", is_active=True)
+    db_session.add(category)
+    db_session.commit()
+    return category
+
+
+def server_timing(response) -> dict:
+    return {
+        metric.split(";")[0]: float(re.search(r"dur=([\d.]+)", metric).group(1))
+        for metric in response.headers["Server-Timing"].split(", ")
+    }
+
+
+def test_response_carries_server_timing(api_client, category):
+    """Ensure each response reports its database, pool and serialisation time."""
+    response = api_client.get(f"/categories/{category.id}")
+
+    timing = server_timing(response)
+    assert set(timing) == {"db", "pool", "serialize", "total"}
+    assert timing["db"] > 0
+    assert timing["total"] >= timing["db"]
+    assert re.search(r'desc="[1-9]\d* queries"', response.headers["Server-Timing"])
+
+
+def test_metrics_are_labelled_by_route_template(api_client, category, metrics_token):
+    """Ensure requests are aggregated under their route template."""
+    api_client.get(f"/categories/{category.id}")
+    api_client.get("/categories/999")
+
+    body = api_client.get("/metrics", headers=metrics_token).text
+
+    assert 'weblog_http_requests_total{method="GET",route="/categories/{category_id}",status="200"} 1' in body
+    assert 'weblog_http_requests_total{method="GET",route="/categories/{category_id}",status="404"} 1' in body
+    assert "weblog_db_queries_total" in body
+    assert 'weblog_db_pool_checkouts_total{engine="async"}' in body
+
+
+def test_metrics_require_the_token(api_client, monkeypatch):
+    """Ensure /metrics is hidden without a configured token and refuses requests without it."""
+    assert api_client.get("/metrics").status_code == HTTPStatus.NOT_FOUND
+
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "scraper-token")
+    assert api_client.get("/metrics").status_code == HTTPStatus.UNAUTHORIZED
+    assert api_client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == HTTPStatus.UNAUTHORIZED
+    assert api_client.get("/metrics", headers={"Authorization": "Bearer scraper-token"}).status_code == HTTPStatus.OK
+
+
+def test_request_metrics_render_histogram():
+    """Ensure durations fall into the cumulative histogram buckets."""
+    metrics = RequestMetrics(buckets=(0.1, 1.0))
+    metrics.observe("GET", "/posts/", 200, RequestStats(), 0.5)
+
+    body = metrics.render()
+
+    assert 'weblog_http_request_duration_seconds_bucket{method="GET",route="/posts/",status="200",le="0.1"} 0' in body
+    assert 'weblog_http_request_duration_seconds_bucket{method="GET",route="/posts/",status="200",le="1.0"} 1' in body
+    assert 'weblog_http_request_duration_seconds_count{method="GET",route="/posts/",status="200"} 1' in body
+
+
+@pytest.mark.parametrize("rate, logged", [(0.0, False), (1.0, True)])
+def test_statement_logging_is_sampled(tmp_path, caplog, rate, logged):
+    """Ensure statements are only logged at the configured sample rate."""
+    database = tmp_path / "weblog.db"
+    manager = DatabaseManager(
+        urls={"sync": f"sqlite:///{database}", "async": f"sqlite+aiosqlite:///{database}"},
+        log_sample_rate=rate,
+    )
+
+    with caplog.at_level(logging.INFO, logger="app.sql"):
+        with manager.get_sync_engine().connect() as connection:
+            connection.execute(text("SELECT 1"))
+    manager.get_sync_engine().dispose()
+
+    assert any("SELECT 1" in record.getMessage() for record in caplog.records) is logged
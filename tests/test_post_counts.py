@@ -0,0 +1,97 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+from app.posts.services import recount_post_counts
+
+
+def counts(client, **params) -> dict:
+    return {category["name"]: category["post_count"] for category in client.get("/categories/", params=params).json()}
+
+
+def test_post_writes_maintain_counts(api_client, categories, create_post):
+    """Ensure creating, re-categorising and deleting posts keep the counts exact."""
+    python, databases, _ = categories
+    first = create_post("first", [python, databases])
+    create_post("second", [python])
+    assert counts(api_client) == {"Python": 2, "Databases": 1, "Archive": 0}
+
+    api_client.patch(f"/posts/{first['id']}", json={"categories": {"remove": [databases.id]}})
+    assert counts(api_client) == {"Python": 2, "Databases": 0, "Archive": 0}
+
+    api_client.delete(f"/posts/{first['id']}")
+    assert counts(api_client) == {"Python": 1, "Databases": 0, "Archive": 0}
+
+
+def test_drafts_are_not_counted(api_client, categories, create_post):
+    """Ensure only published posts count, following publishing, unpublishing and deletion."""
+    python, databases, _ = categories
+    draft = create_post("draft", [python], status="draft")
+    assert counts(api_client) == {"Python": 0, "Databases": 0, "Archive": 0}
+
+    api_client.patch(f"/posts/{draft['id']}", json={"categories": {"add": [databases.id]}})
+    assert counts(api_client) == {"Python": 0, "Databases": 0, "Archive": 0}
+
+    api_client.patch(f"/posts/{draft['id']}", json={"status": "published"})
+    assert counts(api_client) == {"Python": 1, "Databases": 1, "Archive": 0}
+
+    api_client.patch(f"/posts/{draft['id']}", json={"status": "draft", "categories": {"remove": [python.id]}})
+    assert counts(api_client) == {"Python": 0, "Databases": 0, "Archive": 0}
+
+    api_client.delete(f"/posts/{draft['id']}")
+    body = '{"title": "B", "summary": "S", "content": "C", "slug": "b", "categories": [%d], "status": "draft"}' % python.id
+    api_client.post("/posts/bulk", content=body)
+    assert counts(api_client) == {"Python": 0, "Databases": 0, "Archive": 0}
+
+
+def test_bulk_import_maintains_counts(api_client, categories):
+    """Ensure bulk imports add their association rows to the counts."""
+    python, databases, _ = categories
+    rows = [
+        {"title": f"Imported {number}", "summary": "S", "content": "C", "slug": f"imported-{number}",
+         "categories": [python.id] if number % 2 else [python.id, databases.id]}
+        for number in range(5)
+    ]
+
+    api_client.post("/posts/bulk", content="\n".join(json.dumps(row) for row in rows))
+
+    assert counts(api_client) == {"Python": 5, "Databases": 3, "Archive": 0}
+
+
+def test_category_list_filters_active_without_reading_posts(api_client, categories, query_counter, create_post):
+    """Ensure the listing reads counts from the categories table alone."""
+    create_post("first", categories[:1])
+    query_counter.clear()
+
+    response = api_client.get("/categories/", params={"active_only": True})
+
+    assert response.status_code == HTTPStatus.OK
+    assert [category["name"] for category in response.json()] == ["Python", "Databases"]
+    assert not [statement for statement in query_counter if "posts" in statement or "post_category" in statement]
+
+
+def test_count_changes_keep_category_version(api_client, categories, create_post):
+    """Ensure counts move without bumping category versions, yet change the listing ETag."""
+    etag = api_client.get("/categories/").headers["ETag"]
+    before = api_client.get(f"/categories/{categories[0].id}").json()
+
+    create_post("first", categories[:1])
+
+    after = api_client.get(f"/categories/{categories[0].id}").json()
+    assert (after["version"], after["updated_at"]) == (before["version"], before["updated_at"])
+    assert api_client.get("/categories/", headers={"If-None-Match": etag}).status_code == HTTPStatus.OK
+
+
+def test_recount_repairs_drift(api_client, database, db_session, categories, create_post):
+    """Ensure the recount command restores counts from the published posts' association rows."""
+    create_post("first", categories[:1])
+    create_post("draft", categories[:2], status="draft")
+    categories[1].post_count = 7
+    db_session.commit()
+
+    async def recount():
+        async with database.async_session_maker()() as session:
+            return await recount_post_counts(session)
+
+    assert asyncio.run(recount()) == {categories[1].id: (7, 0)}
+    assert asyncio.run(recount()) == {}
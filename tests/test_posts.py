@@ -12,6 +12,7 @@ def test_create_new_post(session, user, post):
     session.add(post)
     session.commit()
     session.refresh(post)
+    session.refresh(post, ["author", "categories"])
 
     assert post.id == 1
     assert post.author_id == 1
@@ -27,6 +28,7 @@ def test_create_new_category(session, category):
     session.add(category)
     session.commit()
     session.refresh(category)
+    session.refresh(category, ["posts"])
 
     assert category.id == 1
     assert isinstance(category.name, str)
@@ -49,6 +51,7 @@ def test_associate_category_to_post(session, user, category, post):
 
     session.add(post)
     session.commit()
+    session.refresh(post, ["categories"])
 
     assert len(post.categories) == 1
     assert isinstance(post.categories[0], Category)
@@ -59,6 +62,7 @@ def test_associate_post_to_user(session, user, post):
     user.posts = [post]
     session.add(user)
     session.commit()
+    session.refresh(user, ["posts"])
 
     assert len(user.posts) == 1
     assert isinstance(user.posts[0], Post)
@@ -0,0 +1,91 @@
+import pytest
+
+from app.posts.models import Category, Post
+
+
+@pytest.fixture
+def blog(db_session, author):
+    """Seed enough rows for a recursive relationship cascade to show up."""
+    categories = [
+        Category(name=f"Category {number}", description="Category", is_active=True)
+        for number in range(3)
+    ]
+    posts = [
+        Post(
+            title=f"Post {number}",
+            summary="Summary",
+            content="Content",
+            slug=f"post-{number}",
+            author=author,
+            categories=categories,
+        )
+        for number in range(10)
+    ]
+    db_session.add_all(posts)
+    db_session.commit()
+    return {"posts": posts, "categories": categories}
+
+
+def assert_within_budget(query_counter, budget):
+    assert len(query_counter) <= budget, "\n".join(query_counter)
+
+
+@pytest.mark.parametrize("path, budget", [
+    ("/posts/", 2),
+    ("/posts/{post_id}", 2),
+    ("/categories/", 2),
+    ("/categories/{category_id}", 2),
+])
+def test_read_endpoints_stay_within_query_budget(api_client, blog, query_counter, path, budget):
+    """Ensure read endpoints only load what their response schema needs."""
+    url = path.format(post_id=blog["posts"][0].id, category_id=blog["categories"][0].id)
+
+    response = api_client.get(url)
+
+    assert response.status_code == 200
+    assert_within_budget(query_counter, budget)
+
+
+def test_create_post_stays_within_query_budget(api_client, blog, query_counter):
+    """Ensure creating a post does not cascade into related rows."""
+    response = api_client.post("/posts/", json={
+        "title": "New post",
+        "summary": "Summary",
+        "content": "Content",
+        "slug": "new-post",
+        "categories": [category.id for category in blog["categories"]],
+    })
+
+    assert response.status_code == 200
+    assert [category["id"] for category in response.json()["categories"]] == [
+        category.id for category in blog["categories"]
+    ]
+    assert_within_budget(query_counter, 7)
+
+
+def test_update_post_stays_within_query_budget(api_client, blog, query_counter):
+    """Ensure updating a post does not cascade into related rows."""
+    response = api_client.patch(f"/posts/{blog['posts'][0].id}", json={
+        "title": "Updated title",
+        "categories": [],
+    })
+
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+    assert_within_budget(query_counter, 8)
+
+
+def test_delete_post_stays_within_query_budget(api_client, blog, query_counter):
+    """Ensure deleting a post only touches the post, its association rows, category counts and feed entry."""
+    response = api_client.delete(f"/posts/{blog['posts'][0].id}")
+
+    assert response.status_code == 200
+    assert_within_budget(query_counter, 8)
+
+
+def test_delete_category_stays_within_query_budget(api_client, blog, query_counter):
+    """Ensure deleting a category rewrites the feed entries of its posts in bulk, without loading the posts."""
+    response = api_client.delete(f"/categories/{blog['categories'][0].id}")
+
+    assert response.status_code == 200
+    assert_within_budget(query_counter, 13)
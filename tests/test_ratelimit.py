@@ -0,0 +1,151 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+
+from app.instrumentation import LatencyWindow, pool_wait
+from app.ratelimit import (AdmissionController, MemoryBucketStore,
+                           RedisBucketStore, admission_controller,
+                           parse_rules, rate_limiter)
+from app.users.models import User
+
+
+@pytest.fixture
+def rules(monkeypatch):
+    """Replaces the configured rules for a single test."""
+    def configure(spec):
+        monkeypatch.setattr(rate_limiter, "rules", parse_rules(spec))
+    return configure
+
+
+def post_payload(slug):
+    return {"title": "Title", "summary": "Summary", "content": "Content", "slug": slug, "categories": []}
+
+
+def test_parse_rules():
+    """Ensure rules are read from the ``METHOD path=COUNT/SECONDS:per`` format."""
+    login, create = parse_rules("POST /users/auth/jwt/login=10/60:ip; PATCH /posts/{post_id}=3/1")
+
+    assert (login.method, login.path, login.count, login.rate, login.per) == ("POST", "/users/auth/jwt/login", 10, 10 / 60, "ip")
+    assert create.per == "user"
+    assert create.matches("PATCH", "/posts/12") and not create.matches("PATCH", "/posts/12/extra")
+
+
+@pytest.mark.parametrize("spec", ["POST /posts/", "POST /posts/=ten/60", "POST /posts/=1/60:host"])
+def test_parse_rules_rejects_invalid_rules(spec):
+    """Ensure malformed rules fail at startup rather than being ignored."""
+    with pytest.raises(ValueError):
+        parse_rules(spec)
+
+
+def test_memory_bucket_allows_burst_then_refills(clock):
+    """Ensure a bucket grants its burst, then one token per ``1 / rate`` seconds."""
+    store = MemoryBucketStore(clock=clock)
+
+    granted = [asyncio.run(store.take("key", rate=1, burst=3)) for _ in range(3)]
+    assert granted == [0, 0, 0]
+    assert asyncio.run(store.take("key", rate=1, burst=3)) == pytest.approx(1)
+
+    clock.now = 1.0
+    assert asyncio.run(store.take("key", rate=1, burst=3)) == 0
+    assert asyncio.run(store.take("other", rate=1, burst=3)) == 0
+
+
+def test_memory_bucket_evicts_least_recently_used_keys():
+    """Ensure the store holds at most ``max_keys`` buckets."""
+    store = MemoryBucketStore(max_keys=2)
+    for key in ("a", "b", "c"):
+        asyncio.run(store.take(key, rate=1, burst=1))
+
+    assert list(store._buckets) == ["b", "c"]
+
+
+def test_redis_bucket_runs_script_on_prefixed_key():
+    """Ensure the shared store updates a bucket in one atomic script call."""
+    class Client:
+        async def eval(self, script, numkeys, *args):
+            self.call = (numkeys, args)
+            return b"0.5"
+
+    client = Client()
+    store = RedisBucketStore(client)
+
+    assert asyncio.run(store.take("POST /posts/:user:1", rate=2, burst=4)) == 0.5
+    assert client.call == (1, ("weblog:ratelimit:POST /posts/:user:1", 2, 4))
+
+
+def test_login_is_limited_per_ip(api_client, rules):
+    """Ensure failed logins beyond the limit are answered with 429 and ``Retry-After``."""
+    rules("POST /users/auth/jwt/login=2/60:ip")
+    credentials = {"username": "nobody@gmail.com", "password": "wrong"}
+
+    statuses = [api_client.post("/users/auth/jwt/login", data=credentials).status_code for _ in range(3)]
+
+    assert statuses[:2] == [HTTPStatus.BAD_REQUEST] * 2
+    assert statuses[2] == HTTPStatus.TOO_MANY_REQUESTS
+    response = api_client.post("/users/auth/jwt/login", data=credentials)
+    assert int(response.headers["Retry-After"]) == 30
+
+
+def test_post_creation_is_limited_per_user(api_client, rules, issue_token):
+    """Ensure each token user gets their own bucket and other routes are not limited."""
+    rules("POST /posts/=1/60:user")
+    users = User(id=1, email="one@example.com"), User(id=2, email="two@example.com")
+    first, second = (f"Bearer {issue_token(user)}" for user in users)
+
+    assert api_client.post("/posts/", json=post_payload("one"), headers={"Authorization": first}).status_code == HTTPStatus.OK
+    assert api_client.post("/posts/", json=post_payload("two"), headers={"Authorization": first}).status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert api_client.post("/posts/", json=post_payload("three"), headers={"Authorization": second}).status_code == HTTPStatus.OK
+    assert api_client.get("/posts/").status_code == HTTPStatus.OK
+
+
+def test_requests_are_shed_while_pool_waits_are_high(api_client):
+    """Ensure requests get 503 while pooled connections are slow to come, except health checks."""
+    for _ in range(10):
+        pool_wait.record(admission_controller.max_pool_wait * 2)
+
+    response = api_client.get("/categories/")
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert "Retry-After" in response.headers
+    assert api_client.get("/healthcheck/live").status_code == HTTPStatus.OK
+
+
+def test_admission_queues_then_sheds_beyond_concurrency():
+    """Ensure requests wait for a free slot and are shed when none frees up in time."""
+    controller = AdmissionController(max_concurrency=1, queue_timeout=0.05, max_pool_wait=1, waits=LatencyWindow())
+
+    async def scenario():
+        assert await controller.acquire()
+        assert not await controller.acquire()
+
+        waiting = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        controller.release()
+        assert await waiting
+        assert controller.in_flight == 1
+
+    asyncio.run(scenario())
+
+
+def test_congestion_is_checked_once_per_interval(clock):
+    """Ensure the pool wait percentile is reused between checks and refreshed after the interval."""
+    waits = LatencyWindow(clock=clock)
+    controller = AdmissionController(max_concurrency=0, max_pool_wait=0.5, window=5, waits=waits, check_interval=1)
+
+    assert not controller.congested()
+    waits.record(2.0)
+    assert not controller.congested()
+    clock.now = 1.0
+    assert controller.congested()
+
+
+def test_shedding_stops_once_slow_waits_age_out(clock):
+    """Ensure only pool waits from the last ``window`` seconds keep requests shed."""
+    waits = LatencyWindow(clock=clock)
+    controller = AdmissionController(max_concurrency=0, max_pool_wait=0.5, window=5, waits=waits)
+    waits.record(2.0)
+
+    assert not asyncio.run(controller.acquire())
+    clock.now = 6.0
+    assert asyncio.run(controller.acquire())
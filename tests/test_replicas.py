@@ -0,0 +1,132 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.cache.cache import post_key
+from app.main import app
+from app.posts.models import Post
+from app.settings.database import (Base, DatabaseManager, ReplicaSet,
+                                   get_database_manager)
+from app.users.models import User
+
+
+def seed(url: str, title: str):
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        author = session.get(User, 1) or User(
+            id=1, username="author@gmail.com", email="author@gmail.com", hashed_password="hashed_password",
+        )
+        session.add(Post(title=title, summary=title, content=title, slug=title, author=author))
+        session.commit()
+    engine.dispose()
+
+
+def replica_urls(tmp_path, count: int) -> list:
+    urls = []
+    for index in range(count):
+        path = tmp_path / f"replica-{index}.db"
+        seed(f"sqlite:///{path}", f"replica-{index}")
+        urls.append(f"sqlite+aiosqlite:///{path}")
+    return urls
+
+
+@pytest.fixture
+def replicated(database, author, tmp_path):
+    """Returns a manager over the test database and two seeded replicas."""
+    seed(database.urls["sync"], "primary")
+    manager = DatabaseManager(urls=database.urls, replica_urls=replica_urls(tmp_path, 2))
+    yield manager
+    asyncio.run(manager.dispose())
+
+
+@pytest.fixture
+def replica_client(api_client, replicated):
+    app.dependency_overrides[get_database_manager] = lambda: replicated
+    return api_client
+
+
+def served_by(client, **kwargs) -> str:
+    return client.get("/posts/", **kwargs).json()["items"][0]["title"]
+
+
+def test_reads_rotate_over_replicas(replica_client):
+    """Ensure reads are spread round-robin over the replicas."""
+    assert [served_by(replica_client) for _ in range(3)] == ["replica-0", "replica-1", "replica-0"]
+
+
+def test_down_replica_is_skipped(replica_client, replicated):
+    """Ensure a replica marked down is left out until it may be retried."""
+    replicated.replicas.mark_down(0)
+
+    assert [served_by(replica_client) for _ in range(2)] == ["replica-1", "replica-1"]
+
+
+def test_reads_fall_back_to_primary(replica_client, replicated):
+    """Ensure the primary serves reads when no replica is healthy."""
+    replicated.replicas.mark_down(0)
+    replicated.replicas.mark_down(1)
+
+    assert served_by(replica_client) == "primary"
+
+
+def test_failing_replica_is_marked_down(api_client, database, author, tmp_path):
+    """Ensure a read moves on from a replica that cannot be reached, which the next reads skip."""
+    seed(database.urls["sync"], "primary")
+    broken = f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}"
+    manager = DatabaseManager(urls=database.urls, replica_urls=[broken, *replica_urls(tmp_path, 1)])
+    app.dependency_overrides[get_database_manager] = lambda: manager
+
+    assert served_by(api_client) == "replica-0"
+    assert manager.replicas.is_up(0) is False
+    assert served_by(api_client) == "replica-0"
+    asyncio.run(manager.dispose())
+
+
+def test_reads_fall_back_to_primary_when_no_replica_connects(api_client, database, author, tmp_path):
+    """Ensure a read is served by the primary when every replica fails to connect."""
+    seed(database.urls["sync"], "primary")
+    manager = DatabaseManager(urls=database.urls, replica_urls=[
+        f"sqlite+aiosqlite:///{tmp_path / 'missing' / f'replica-{index}.db'}" for index in range(2)
+    ])
+    app.dependency_overrides[get_database_manager] = lambda: manager
+
+    assert served_by(api_client) == "primary"
+    assert [replica["up"] for replica in manager.replicas.status()] == [False, False]
+    asyncio.run(manager.dispose())
+
+
+def test_replica_reads_do_not_cache_right_after_a_write(replica_client, cache):
+    """Ensure a replica read of a just-invalidated entry is served but not cached."""
+    assert replica_client.get("/posts/1").json()["title"] == "replica-0"
+    assert asyncio.run(cache.peek(post_key(1)))["title"] == "replica-0"
+
+    replica_client.patch("/posts/1", json={"title": "Edited"})
+
+    assert replica_client.get("/posts/1").json()["title"] == "replica-1"
+    assert asyncio.run(cache.peek(post_key(1))) is None
+
+
+def test_writer_reads_own_writes(replica_client, author, issue_token):
+    """Ensure a user's reads go to the primary right after they write."""
+    headers = {"Authorization": f"Bearer {issue_token(author)}"}
+
+    created = replica_client.post("/categories/", json={"name": "Science", "description": "Science", "is_active": True})
+
+    assert created.status_code == HTTPStatus.OK
+    assert served_by(replica_client, headers=headers) == "primary"
+    assert served_by(replica_client) == "replica-0"
+
+
+def test_replica_set_retries_after_cooldown():
+    """Ensure a replica marked down is chosen again once its cooldown passed."""
+    now = [0.0]
+    replicas = ReplicaSet(2, retry_after=10, clock=lambda: now[0])
+    replicas.mark_down(0)
+
+    assert [replicas.choose() for _ in range(2)] == [1, 1]
+    now[0] = 11
+    assert replicas.choose() == 0
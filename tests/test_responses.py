@@ -0,0 +1,67 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from app.posts.models import Category, Post
+from app.responses import FastJSONResponse, dump_json
+
+
+@pytest.fixture
+def seeded_posts(db_session, author):
+    category = Category(name="Café & Thé", description="Unicode ✓", is_active=True)
+    posts = [
+        Post(title=f"Post {number} – “quoted”", summary="Résumé", content="Content\nwith lines",
+             slug=f"post-{number}", author=author, categories=[category])
+        for number in range(3)
+    ]
+    db_session.add_all(posts)
+    db_session.commit()
+    return posts
+
+
+@pytest.fixture
+def fast_json(monkeypatch):
+    def enable(enabled=True):
+        monkeypatch.setattr("app.responses.FAST_JSON_RESPONSES", enabled)
+    return enable
+
+
+def test_dump_json_matches_starlette_encoding():
+    """Ensure the compiled encoder produces the same bytes as JSONResponse."""
+    content = {"title": "Café “quoted”", "ids": [1, 2], "active": True, "missing": None}
+
+    assert dump_json(content) == FastJSONResponse(content).body
+    assert dump_json(content) == json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+@pytest.mark.parametrize("path", [
+    "/posts/?limit=2",
+    "/posts/{post_id}",
+    "/posts/by-slug/post-1",
+    "/posts/by-slug?slug=post-2&slug=post-0",
+    "/categories/",
+    "/categories/{category_id}",
+])
+def test_fast_path_output_is_identical(api_client, seeded_posts, fast_json, path):
+    """Ensure the fast path returns byte-identical bodies and the same headers."""
+    url = path.format(post_id=seeded_posts[0].id, category_id=seeded_posts[0].categories[0].id)
+
+    fast_json(False)
+    standard = api_client.get(url)
+    fast_json(True)
+    fast = api_client.get(url)
+
+    assert fast.status_code == standard.status_code == HTTPStatus.OK
+    assert fast.content == standard.content
+    assert fast.headers.get("ETag") == standard.headers.get("ETag")
+
+
+def test_fast_path_keeps_not_modified(api_client, seeded_posts, fast_json):
+    """Ensure conditional requests still answer 304 on the fast path."""
+    fast_json(True)
+    etag = api_client.get(f"/posts/{seeded_posts[0].id}").headers["ETag"]
+
+    response = api_client.get(f"/posts/{seeded_posts[0].id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
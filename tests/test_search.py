@@ -0,0 +1,82 @@
+from http import HTTPStatus
+
+import pytest
+
+from app.posts.models import Category, Post
+from app.search.text import highlight, tokenize
+
+
+@pytest.fixture
+def library(db_session, author):
+    python = Category(name="Python", description="Python", is_active=True)
+    databases = Category(name="Databases", description="Databases", is_active=True)
+    posts = [
+        Post(title="Indexing in MySQL", summary="How indexes work", content="B-trees and fulltext indexes.",
+             slug="indexing", author=author, categories=[databases]),
+        Post(title="Async Python", summary="Event loops explained", content="Python coroutines and indexing tricks.",
+             slug="async-python", author=author, categories=[python]),
+        Post(title="Gardening", summary="Tomatoes", content="Nothing to see here.",
+             slug="gardening", author=author, categories=[]),
+    ]
+    db_session.add_all(posts)
+    db_session.commit()
+    return {"posts": posts, "python": python, "databases": databases}
+
+
+def test_tokenize_drops_stopwords_and_case():
+    """Ensure queries and documents are normalised the same way."""
+    assert tokenize("The Python and the MySQL") == ["python", "mysql"]
+
+
+def test_highlight_marks_terms_and_escapes_html():
+    """Ensure snippets mark matching terms and never leak raw HTML."""
+    snippet = highlight("Use <b>Python</b> daily", ["python"])
+
+    assert snippet == "Use &lt;b&gt;<mark>Python</mark>&lt;/b&gt; daily"
+
+
+def test_search_ranks_title_matches_first(api_client, library):
+    """Ensure a title match outranks a content-only match."""
+    response = api_client.get("/posts/search", params={"q": "indexing"})
+
+    assert response.status_code == HTTPStatus.OK
+    items = response.json()["items"]
+    assert [item["slug"] for item in items] == ["indexing", "async-python"]
+    assert items[0]["score"] > items[1]["score"]
+    assert "<mark>indexing</mark>" in items[1]["snippet"]
+    assert "content" not in items[0]
+
+
+def test_search_filters_by_category(api_client, library):
+    """Ensure hits can be restricted to some categories."""
+    response = api_client.get("/posts/search", params={"q": "indexing", "category": [library["python"].id]})
+
+    assert [item["slug"] for item in response.json()["items"]] == ["async-python"]
+
+
+def test_search_paginates_with_cursor(api_client, library):
+    """Ensure ranked results are paginated with a keyset cursor."""
+    first_page = api_client.get("/posts/search", params={"q": "indexing", "limit": 1}).json()
+    second_page = api_client.get(first_page["next"]).json()
+
+    assert [item["slug"] for item in first_page["items"]] == ["indexing"]
+    assert [item["slug"] for item in second_page["items"]] == ["async-python"]
+    assert second_page["next"] is None
+
+
+def test_search_index_follows_post_writes(api_client, library):
+    """Ensure created, updated and deleted posts are reflected incrementally."""
+    api_client.get("/posts/search", params={"q": "warmup"})
+
+    created = api_client.post("/posts/", json={
+        "title": "Kubernetes basics", "summary": "Pods", "content": "Deployments",
+        "slug": "kubernetes", "categories": [],
+    }).json()
+    assert [item["slug"] for item in api_client.get("/posts/search", params={"q": "kubernetes"}).json()["items"]] == ["kubernetes"]
+
+    api_client.patch(f"/posts/{created['id']}", json={"title": "Docker basics", "categories": []})
+    assert api_client.get("/posts/search", params={"q": "kubernetes"}).json()["items"] == []
+    assert len(api_client.get("/posts/search", params={"q": "docker"}).json()["items"]) == 1
+
+    api_client.delete(f"/posts/{created['id']}")
+    assert api_client.get("/posts/search", params={"q": "docker"}).json()["items"] == []
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from app import server
+from app.posts.cache import category_list_key
+from app.posts.syndication import RSS_KEY
+
+
+def test_server_options_fall_back_without_accelerators(monkeypatch):
+    """Ensure uvloop and httptools are replaced by asyncio and h11 when they are not installed."""
+    monkeypatch.setattr(server, "installed", lambda module: False)
+
+    options = server.server_options()
+
+    assert options["loop"] == "asyncio"
+    assert options["http"] == "h11"
+    assert options["workers"] == server.SERVER_WORKERS
+    assert options["backlog"] == server.SERVER_BACKLOG
+
+
+def test_server_options_keep_installed_accelerators(monkeypatch):
+    """Ensure the configured loop and parser are used when installed."""
+    monkeypatch.setattr(server, "installed", lambda module: True)
+
+    assert server.server_options()["loop"] == "uvloop"
+    assert server.server_options()["http"] == "httptools"
+
+
+@pytest.mark.parametrize("backend, workers, refused", [
+    ("sqlite", 1, False),
+    ("sqlite", 4, True),
+    ("mysql", 4, False),
+])
+def test_several_workers_need_the_shared_search_index(monkeypatch, backend, workers, refused):
+    """Ensure several workers are only started where search does not use the in-process index."""
+    monkeypatch.setattr(server, "database_backend", lambda: backend)
+    monkeypatch.setattr(server, "SERVER_WORKERS", workers)
+
+    if refused:
+        with pytest.raises(SystemExit, match="search index"):
+            server.check_workers()
+    else:
+        server.check_workers()
+
+
+def test_startup_primes_hot_caches(api_client, cache, database):
+    """Ensure the application starts with warm pools and cached category listings and feeds."""
+    assert asyncio.run(cache.peek(category_list_key())) == []
+    assert asyncio.run(cache.peek(category_list_key(active_only=True))) == []
+    assert asyncio.run(cache.backend.get(RSS_KEY)) is not None
+    assert database.pool_status()["async"]["checked_in"] == database.pool["pool_size"]
@@ -0,0 +1,120 @@
+import asyncio
+from http import HTTPStatus
+from xml.etree import ElementTree
+
+import pytest
+
+from app.posts import syndication
+
+SITEMAP = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def parse(response):
+    assert response.status_code == HTTPStatus.OK
+    return ElementTree.fromstring(response.content)
+
+
+def test_rss_feed_lists_published_posts(api_client, create_post):
+    """Ensure the RSS feed links the published posts by slug, newest first, and escapes their text."""
+    create_post("first", title="Fish & chips")
+    create_post("draft", status="draft")
+    create_post("second")
+
+    response = api_client.get("/feed.xml")
+
+    assert response.headers["content-type"] == "application/rss+xml"
+    items = parse(response).findall("channel/item")
+    assert [item.findtext("link") for item in items] == [
+        f"{syndication.SITE_URL}/posts/by-slug/second", f"{syndication.SITE_URL}/posts/by-slug/first",
+    ]
+    assert items[1].findtext("title") == "Fish & chips"
+    assert items[1].findtext("description") == "Summary of first"
+
+
+def test_atom_feed_lists_published_posts(api_client, create_post):
+    """Ensure the Atom feed carries an entry with its author for each published post."""
+    create_post("post")
+
+    feed = parse(api_client.get("/atom.xml"))
+
+    entries = feed.findall(f"{ATOM}entry")
+    assert [entry.findtext(f"{ATOM}summary") for entry in entries] == ["Summary of post"]
+    assert entries[0].findtext(f"{ATOM}author/{ATOM}name") == "author@gmail.com"
+    assert feed.findtext(f"{ATOM}updated") == entries[0].findtext(f"{ATOM}updated")
+
+
+def test_sitemap_is_split_into_pages(api_client, monkeypatch, create_post):
+    """Ensure the sitemap index lists one page per block of post ids and each page its posts."""
+    monkeypatch.setattr(syndication, "SITEMAP_PAGE_SIZE", 2)
+    for number in range(5):
+        create_post(f"post-{number}")
+
+    index = parse(api_client.get("/sitemap.xml"))
+    pages = [sitemap.findtext(f"{SITEMAP}loc") for sitemap in index.findall(f"{SITEMAP}sitemap")]
+    assert pages == [f"{syndication.SITE_URL}/sitemap-{page}.xml" for page in (1, 2, 3)]
+
+    urls = parse(api_client.get("/sitemap-2.xml")).findall(f"{SITEMAP}url")
+    assert [url.findtext(f"{SITEMAP}loc").rsplit("/", 1)[1] for url in urls] == ["post-2", "post-3"]
+    assert api_client.get("/sitemap-4.xml").status_code == HTTPStatus.NOT_FOUND
+
+
+def test_documents_are_served_from_cache(api_client, query_counter, create_post):
+    """Ensure a rendered document is served again without querying the database."""
+    create_post("post")
+    first = api_client.get("/feed.xml")
+    query_counter.clear()
+
+    second = api_client.get("/feed.xml")
+
+    assert second.content == first.content
+    assert len(query_counter) == 0
+
+
+@pytest.mark.parametrize("url", ["/feed.xml", "/atom.xml", "/sitemap-1.xml"])
+def test_documents_follow_post_writes(api_client, url, create_post):
+    """Ensure creating, updating and deleting a post re-render the cached document."""
+    post = create_post("post")
+    etag = api_client.get(url).headers["ETag"]
+    assert api_client.get(url, headers={"If-None-Match": etag}).status_code == HTTPStatus.NOT_MODIFIED
+
+    api_client.patch(f"/posts/{post['id']}", json={"title": "Renamed", "slug": "renamed"})
+    updated = api_client.get(url)
+    assert updated.status_code == HTTPStatus.OK and updated.headers["ETag"] != etag
+    assert b"renamed" in updated.content
+
+    create_post("other")
+    api_client.delete(f"/posts/{post['id']}")
+    assert b"renamed" not in api_client.get(url).content
+
+
+def test_bulk_import_refreshes_documents(api_client):
+    """Ensure imported posts appear in an already cached feed."""
+    api_client.get("/feed.xml")
+    body = '{"title": "A", "summary": "S", "content": "C", "slug": "imported", "categories": []}'
+
+    assert api_client.post("/posts/bulk", content=body).json()["inserted"] == 1
+    assert b"imported" in api_client.get("/feed.xml").content
+
+
+@pytest.mark.parametrize("change", ["rename", "delete"])
+def test_documents_follow_category_writes(api_client, cache, change, create_post):
+    """Ensure renaming or deleting a category drops the cached documents listing its posts."""
+    category = api_client.post("/categories/", json={"name": "Tech", "description": "Tech", "is_active": True}).json()
+    post = create_post("post")
+    api_client.patch(f"/posts/{post['id']}", json={"categories": [category["id"]]})
+    keys = [syndication.RSS_KEY, syndication.ATOM_KEY, syndication.SITEMAP_INDEX_KEY, syndication.sitemap_page_key(1)]
+    for url in ("/feed.xml", "/atom.xml", "/sitemap.xml", "/sitemap-1.xml"):
+        api_client.get(url)
+
+    if change == "rename":
+        api_client.patch(f"/categories/{category['id']}", json={"name": "Technology"})
+    else:
+        api_client.delete(f"/categories/{category['id']}")
+
+    assert [asyncio.run(cache.backend.get(key)) for key in keys] == [None] * len(keys)
+
+
+def test_post_urls_quote_the_slug():
+    """Ensure a slug is escaped as a single path segment."""
+    assert syndication.post_url("fish & chips/2") == f"{syndication.SITE_URL}/posts/by-slug/fish%20%26%20chips%2F2"
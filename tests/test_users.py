@@ -9,6 +9,7 @@ def test_create_new_user(session, user):
     session.add(user)
     session.commit()
     session.refresh(user)
+    session.refresh(user, ["posts"])
 
     assert user.id == 1
     assert isinstance(user.username, str)